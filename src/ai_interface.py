@@ -1,8 +1,10 @@
-from typing import Dict, Optional, Union, List, Any
+from typing import Callable, Dict, Optional, Union, List, Any
 from langchain.schema import HumanMessage
 from langchain.schema.output import LLMResult
 import os
 import logging
+import threading
+from llm_cache import LLMCache
 # Import only the necessary Ollama model class
 from langchain_ollama import OllamaLLM
 
@@ -18,11 +20,22 @@ class AIInterface:
     def __init__(self, 
                  model_provider: str, 
                  model_name: str,
+                 cache: Optional[LLMCache] = None,
                  **kwargs: Optional[str] 
                  ) -> None:
         
         logger.info(f"Initializing AIInterface with provider: {model_provider}, model: {model_name}")
         
+        self.model_provider = model_provider
+        self.model_name = model_name
+        # Generation parameters identify the model output; transport settings do not
+        self.model_params = {k: v for k, v in kwargs.items() if k != 'client_kwargs'}
+        # Optional response cache; only worth enabling for deterministic (temperature=0) models
+        self.cache = cache
+        # Copies of the model with another context size; they share the HTTP clients
+        self._ctx_models = {}
+        self._ctx_lock = threading.Lock()
+        
         if model_provider.lower() == 'ollama':
             try:
                 # Initialize Ollama with only the basic parameters
@@ -51,24 +64,8 @@ class AIInterface:
             logger.error(f"Unsupported model provider: {model_provider}")
             raise ValueError(f"Currently only 'ollama' provider is supported")
     
-    def get_completion(self, prompt: str) -> str:
-        """Get completion from the AI model for a simple prompt"""
-        logger.debug(f"Getting completion for prompt: {len(prompt)} characters")
-        
-        try:
-            # For Ollama, just pass the prompt directly
-            response = self.model.invoke(prompt)
-            logger.debug(f"Received response: {len(response)} characters")
-            logger.debug(f"Response preview: {response[:100]}...")
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error getting completion from AI model: {e}")
-            raise
-    
-    def get_completion(self, messages: List[Dict[str, str]] = None, prompt: str = None) -> str:
-        """Get completion from the AI model - supports both messages and prompt formats"""
-        
+    def _build_prompt(self, messages: List[Dict[str, str]] = None, prompt: str = None) -> str:
+        """Turn messages or a prompt into the single prompt string sent to the model"""
         if messages:
             logger.debug(f"Getting completion for {len(messages)} messages")
             # Convert messages to a single prompt for Ollama
@@ -86,17 +83,161 @@ class AIInterface:
         else:
             logger.error("Neither messages nor prompt provided")
             raise ValueError("Either messages or prompt must be provided")
+        return prompt_text
+
+    def _model_for(self, num_ctx: Optional[int]):
+        """The model configured with the given context size (Ollama num_ctx)."""
+        if not num_ctx or num_ctx == getattr(self.model, 'num_ctx', None):
+            return self.model
+        with self._ctx_lock:
+            model = self._ctx_models.get(num_ctx)
+            if model is None:
+                logger.info(f"Using context size {num_ctx} for {self.model_name}")
+                model = self.model.model_copy(update={"num_ctx": num_ctx})
+                self._ctx_models[num_ctx] = model
+            return model
+
+    def _cache_key(self, prompt_text: str, num_ctx: Optional[int] = None) -> str:
+        params = dict(self.model_params, num_ctx=num_ctx) if num_ctx else self.model_params
+        return LLMCache.make_key(f"{self.model_provider}/{self.model_name}", params, prompt_text)
+
+    def _lookup_cache(self, prompt_text: str, use_cache: bool, refresh_cache: bool, num_ctx: Optional[int] = None,
+                      validate: Optional[Callable[[str], Any]] = None):
+        """Return (cache_key, cached_response); cache_key is None when the cache is bypassed"""
+        if self.cache is None or not use_cache:
+            return None, None
+        cache_key = self._cache_key(prompt_text, num_ctx)
+        if refresh_cache:
+            return cache_key, None
+        cached = self.cache.get(cache_key, validate)
+        if cached is not None:
+            logger.info(f"LLM cache hit for {self.model_name} ({len(cached)} characters)")
+        return cache_key, cached
+
+    def _store_cache(self, cache_key: Optional[str], response: str, validate: Optional[Callable[[str], Any]] = None):
+        """Cache a response, unless the cache is bypassed or the response fails validation"""
+        if cache_key is None:
+            return
+        if validate is not None:
+            try:
+                validate(response)
+            except Exception as e:
+                logger.warning(f"Not caching response for {self.model_name} that fails validation: {e}")
+                return
+        self.cache.set(cache_key, response)
+
+    def get_completion(self, messages: List[Dict[str, str]] = None, prompt: str = None,
+                       use_cache: bool = True, refresh_cache: bool = False,
+                       num_ctx: Optional[int] = None, validate: Optional[Callable[[str], Any]] = None) -> str:
+        """Get completion from the AI model - supports both messages and prompt formats
+
+        use_cache=False bypasses the response cache entirely for this call,
+        refresh_cache=True skips the lookup but stores the fresh response.
+        num_ctx sets the model's context window for this call.
+        validate is called with the response text and raises when it is unusable (e.g. malformed
+        JSON); such responses are never cached, and a cached one is discarded and requested again.
+        """
+        prompt_text = self._build_prompt(messages, prompt)
+        
+        cache_key, cached = self._lookup_cache(prompt_text, use_cache, refresh_cache, num_ctx, validate)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = self._model_for(num_ctx).invoke(prompt_text)
+            logger.debug(f"Received response: {len(response)} characters")
+            logger.debug(f"Response preview: {response[:100]}...")
+            
+        except Exception as e:
+            logger.error(f"Error getting completion from AI model: {e}")
+            logger.debug(f"Failed prompt: {prompt_text[:200]}...")
+            raise
+        
+        self._store_cache(cache_key, response, validate)
+        return response
+
+    async def aget_completion(self, messages: List[Dict[str, str]] = None, prompt: str = None,
+                              use_cache: bool = True, refresh_cache: bool = False,
+                              num_ctx: Optional[int] = None, validate: Optional[Callable[[str], Any]] = None) -> str:
+        """Async variant of get_completion; awaits the model without blocking a thread"""
+        prompt_text = self._build_prompt(messages, prompt)
+        
+        cache_key, cached = self._lookup_cache(prompt_text, use_cache, refresh_cache, num_ctx, validate)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.model.invoke(prompt_text)
+            response = await self._model_for(num_ctx).ainvoke(prompt_text)
             logger.debug(f"Received response: {len(response)} characters")
             logger.debug(f"Response preview: {response[:100]}...")
-            return response
             
         except Exception as e:
             logger.error(f"Error getting completion from AI model: {e}")
             logger.debug(f"Failed prompt: {prompt_text[:200]}...")
             raise
+        
+        self._store_cache(cache_key, response, validate)
+        return response
+
+    def stream_completion(self, messages: List[Dict[str, str]] = None, prompt: str = None,
+                          use_cache: bool = True, refresh_cache: bool = False,
+                          num_ctx: Optional[int] = None, validate: Optional[Callable[[str], Any]] = None):
+        """Yield the completion in chunks as the model generates it.
+
+        Closing the generator early stops the generation. Only fully consumed
+        streams that pass validate are stored in the response cache.
+        """
+        prompt_text = self._build_prompt(messages, prompt)
+
+        cache_key, cached = self._lookup_cache(prompt_text, use_cache, refresh_cache, num_ctx, validate)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        try:
+            for chunk in self._model_for(num_ctx).stream(prompt_text):
+                chunks.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            logger.info(f"Streaming completion stopped by caller after {len(''.join(chunks))} characters")
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming completion from AI model: {e}")
+            logger.debug(f"Failed prompt: {prompt_text[:200]}...")
+            raise
+
+        response = "".join(chunks)
+        logger.debug(f"Streamed response: {len(response)} characters")
+        self._store_cache(cache_key, response, validate)
+
+    async def astream_completion(self, messages: List[Dict[str, str]] = None, prompt: str = None,
+                                 use_cache: bool = True, refresh_cache: bool = False,
+                                 num_ctx: Optional[int] = None, validate: Optional[Callable[[str], Any]] = None):
+        """Async variant of stream_completion"""
+        prompt_text = self._build_prompt(messages, prompt)
+
+        cache_key, cached = self._lookup_cache(prompt_text, use_cache, refresh_cache, num_ctx, validate)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        try:
+            async for chunk in self._model_for(num_ctx).astream(prompt_text):
+                chunks.append(chunk)
+                yield chunk
+        except GeneratorExit:
+            logger.info(f"Streaming completion stopped by caller after {len(''.join(chunks))} characters")
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming completion from AI model: {e}")
+            logger.debug(f"Failed prompt: {prompt_text[:200]}...")
+            raise
+
+        response = "".join(chunks)
+        logger.debug(f"Streamed response: {len(response)} characters")
+        self._store_cache(cache_key, response, validate)
 
 # Main execution section
 if __name__ == "__main__":
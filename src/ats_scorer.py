@@ -0,0 +1,151 @@
+import re
+import logging
+from typing import NamedTuple
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Relative importance of a required skill by category; unknown categories weigh 1.0
+CATEGORY_WEIGHTS = {
+    "programming languages": 1.5,
+    "frameworks": 1.3,
+    "cloud services": 1.2,
+    "databases": 1.2,
+    "tools": 1.0,
+    "methodologies": 0.8,
+    "languages": 0.8,
+    "soft skills": 0.5,
+}
+
+# Skill levels on one scale; the required level also scales the weight of a skill
+LEVEL_RANKS = {
+    "basic": 1, "beginner": 1, "elementary": 1, "grundkenntnisse": 1,
+    "intermediate": 2, "proficient": 2, "good": 2, "gut": 2,
+    "advanced": 3, "sehr gut": 3, "fluent": 3, "fließend": 3,
+    "expert": 4, "native": 4, "muttersprache": 4,
+}
+DEFAULT_LEVEL_RANK = 2
+LEVEL_WEIGHTS = {1: 0.6, 2: 1.0, 3: 1.3, 4: 1.5}
+
+# Spellings that name the same skill
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "node": "nodejs",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "golang": "go",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ms azure": "azure",
+    "microsoft azure": "azure",
+    "ci cd": "cicd",
+    "scrum master": "scrum",
+    "ml": "machine learning",
+}
+
+# Skills written with a slash that are one skill, not alternatives
+SLASH_COMPOUNDS = {
+    "ci/cd": "ci cd",
+    "pl/sql": "plsql",
+    "tcp/ip": "tcp ip",
+    "ui/ux": "ui ux",
+}
+
+_VERSION = re.compile(r"\b(v?\d+(\.\d+)*x?)\b")
+_SEPARATORS = re.compile(r"[^\w+#]+")
+_ALTERNATIVES = re.compile(r"\s*(?:/|,|\(|\)|\bor\b|\boder\b)\s*")
+_SLASH_COMPOUND = re.compile(
+    r"\b(?:" + "|".join(re.escape(compound).replace("/", r"\s*/\s*") for compound in SLASH_COMPOUNDS) + r")\b",
+    re.IGNORECASE)
+
+
+def normalize_skill(name) -> str:
+    """Lower-case, drop versions and punctuation (keeping C++/C#) and resolve aliases."""
+    text = str(name).lower().replace(".js", "js")
+    text = _VERSION.sub(" ", text)
+    text = " ".join(_SEPARATORS.sub(" ", text).split())
+    return SKILL_ALIASES.get(text, text)
+
+
+def split_alternatives(name) -> list:
+    """Split "Python / Go, Rust" into its alternatives, keeping slash compounds such as CI/CD whole."""
+    text = _SLASH_COMPOUND.sub(lambda match: SLASH_COMPOUNDS["/".join(re.split(r"\s*/\s*", match.group(0).lower()))],
+                               str(name))
+    return _ALTERNATIVES.split(text)
+
+
+def level_rank(level) -> int:
+    return LEVEL_RANKS.get(str(level or "").strip().lower(), DEFAULT_LEVEL_RANK)
+
+
+class ATSScore(NamedTuple):
+    ats_score: int
+    matched_skills: list
+    missing_skills: list
+
+
+class LocalATSScorer:
+    """
+    Deterministic ATS scoring from extracted job skills and the resume's own skill lists.
+
+    Every required skill is weighted by category and required level. A skill found in the
+    resume's skills, experience skills_acquired or project skills earns credit, reduced when
+    the resume states a lower level than required. The score is the weighted share of credit.
+    """
+
+    def __init__(self, category_weights=None):
+        self.category_weights = category_weights or CATEGORY_WEIGHTS
+
+    @staticmethod
+    def resume_skills(resume_data: dict) -> dict:
+        """Return {normalized skill: level rank} from skills, skills_acquired and project skills."""
+        found = {}
+
+        def add(name, rank=DEFAULT_LEVEL_RANK):
+            for part in split_alternatives(name):
+                key = normalize_skill(part)
+                if key:
+                    found[key] = max(found.get(key, 0), rank)
+
+        for skill in resume_data.get("skills") or []:
+            if isinstance(skill, dict):
+                add(skill.get("name", ""), level_rank(skill.get("level")))
+            else:
+                add(skill)
+        for experience in resume_data.get("experiences") or []:
+            for skill in experience.get("skills_acquired") or []:
+                add(skill)
+        for project in resume_data.get("projects") or []:
+            for skill in project.get("skills") or []:
+                add(skill)
+        return found
+
+    def _weight(self, skill: dict) -> float:
+        category = str(skill.get("category", "")).strip().lower()
+        return self.category_weights.get(category, 1.0) * LEVEL_WEIGHTS[level_rank(skill.get("level"))]
+
+    @staticmethod
+    def _credit(skill: dict, available: dict) -> float:
+        candidates = [normalize_skill(part) for part in split_alternatives(skill.get("name", ""))]
+        ranks = [available[key] for key in candidates if key in available]
+        if not ranks:
+            return 0.0
+        return min(1.0, max(ranks) / level_rank(skill.get("level")))
+
+    def score(self, required_skills: list, resume_data: dict) -> ATSScore:
+        available = self.resume_skills(resume_data)
+        total = earned = 0.0
+        matched, missing = [], []
+        for skill in required_skills:
+            weight = self._weight(skill)
+            credit = self._credit(skill, available)
+            total += weight
+            earned += weight * credit
+            (matched if credit else missing).append(skill)
+
+        ats_score = round(100 * earned / total) if total else 0
+        logger.debug(f"Local ATS score {ats_score}: {len(matched)} matched, {len(missing)} missing "
+                     f"of {len(required_skills)} required skills")
+        return ATSScore(ats_score, matched, missing)
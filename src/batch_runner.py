@@ -0,0 +1,152 @@
+import sys
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from job_data import JobData
+from resume_parser import ResumeParser
+from event_loop_service import run_sync
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+JOB_FIELDS = ('job_id', 'job_title', 'job_description', 'company_name')
+
+
+def read_job_records(lines):
+    """
+    Yield (line_number, JobData or error message) for each non-empty JSONL line.
+
+    Lines are consumed lazily, so arbitrarily large campaigns are never held in memory.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("record is not a JSON object")
+            missing = [field for field in JOB_FIELDS if not record.get(field)]
+            if missing:
+                raise ValueError(f"missing fields: {', '.join(missing)}")
+            yield line_number, JobData(*(record[field] for field in JOB_FIELDS))
+        except ValueError as e:
+            yield line_number, f"invalid job record: {e}"
+
+
+class BatchRunner:
+    """
+    Runs the resume pipeline for a stream of jobs with bounded concurrency.
+
+    The base resume is parsed once and every job shares the pipeline's model clients,
+    translation memory and browser pool. One result line is written per job as soon as
+    it finishes, so results stream out in completion order.
+    """
+
+    def __init__(self, pipeline, resume_path, concurrency=2, language="auto"):
+        self.pipeline = pipeline
+        self.resume_path = Path(resume_path)
+        self.concurrency = max(1, concurrency)
+        self.language = language
+        self.resume_parser = ResumeParser(self.resume_path)
+
+    def run(self, lines, output) -> dict:
+        """Synchronous entry point, runs on the process-wide event loop service."""
+        return run_sync(self.run_async(lines, output))
+
+    async def run_async(self, lines, output) -> dict:
+        summary = {"jobs": 0, "ok": 0, "error": 0}
+        pending = set()
+        start = time.perf_counter()
+
+        def write(result):
+            summary["jobs"] += 1
+            summary[result["status"]] += 1
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+
+        async def drain(return_when):
+            nonlocal pending
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            for task in done:
+                write(task.result())
+
+        records = read_job_records(lines)
+        loop = asyncio.get_running_loop()
+        while True:
+            # Reading may block (e.g. a producer piping into stdin), so it runs off the loop
+            record = await loop.run_in_executor(None, next, records, None)
+            if record is None:
+                break
+            line_number, job = record
+            if isinstance(job, str):
+                logger.warning(f"Skipping line {line_number}: {job}")
+                write({"line": line_number, "status": "error", "error": job})
+                continue
+            read_at = time.perf_counter()
+            # Wait for a free slot before reading further, keeping memory bounded
+            while len(pending) >= self.concurrency:
+                await drain(asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.create_task(self._run_job(line_number, job, read_at)))
+
+        if pending:
+            await drain(asyncio.ALL_COMPLETED)
+
+        summary["duration_s"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Batch finished: {summary}")
+        return summary
+
+    async def _run_job(self, line_number, job: JobData, queued_at) -> dict:
+        job_id, job_title, job_description, company_name = job.get_job_data()
+        started_at = time.perf_counter()
+        result = {
+            "line": line_number,
+            "job_id": job_id,
+            "job_title": job_title,
+            "company_name": company_name,
+        }
+        logger.info(f"[batch] Starting job {job_id} ({job_title} at {company_name})")
+        stage_timings = {}
+        try:
+            pipeline_result = await self.pipeline.run_async(
+                self.resume_path,
+                job_description=job_description,
+                company_name=company_name,
+                job_title=job_title,
+                language=self.language,
+                resume_parser=self.resume_parser,
+                job_id=job_id,
+            )
+            result.update({
+                "status": "ok",
+                "pdf_path": str(pipeline_result.pdf_path),
+                "language": pipeline_result.language,
+                "ats_score": pipeline_result.ats_result.ats_score if pipeline_result.ats_result else None,
+            })
+            stage_timings = {key: value for key, value in pipeline_result.timings.items() if key != "total_s"}
+        except Exception as e:
+            logger.error(f"[batch] Job {job_id} failed: {e}")
+            result.update({"status": "error", "error": str(e)})
+
+        finished_at = time.perf_counter()
+        result["timings"] = {
+            "queued_s": round(started_at - queued_at, 3),
+            **stage_timings,
+            "total_s": round(finished_at - started_at, 3),
+        }
+        return result
+
+
+def open_jobs_input(path):
+    """Open the jobs JSONL file, '-' reads from stdin."""
+    return sys.stdin if str(path) == "-" else open(path, "r", encoding="utf-8")
+
+
+def open_results_output(path):
+    """Open the results JSONL file for appending, '-' writes to stdout."""
+    if str(path) == "-":
+        return sys.stdout
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return open(path, "a", encoding="utf-8")
@@ -0,0 +1,452 @@
+import os
+import json
+import atexit
+import signal
+import asyncio
+import threading
+import logging
+import urllib.request
+from contextlib import asynccontextmanager
+from pyppeteer import launch, connect
+from event_loop_service import EventLoopService, get_event_loop_service
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+def browser_launch_options(**overrides):
+    """Build the pyppeteer launch options for the current environment (container or local)."""
+    options = {
+        "headless": True,
+        # Signal handlers can only be installed from the main thread
+        "handleSIGINT": False,
+        "handleSIGTERM": False,
+        "handleSIGHUP": False,
+    }
+    if os.environ.get('CONTAINER'):
+        logger.debug("Running in container mode - using Chromium")
+        options["executablePath"] = "/usr/bin/chromium"
+        options["args"] = ['--no-sandbox', '--disable-setuid-sandbox']
+    else:
+        logger.debug("Running in local mode - using default browser")
+    options.update(overrides)
+    return options
+
+
+def _child_pids(pid):
+    """Direct children of a process, read from /proc (Linux only)."""
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _start_time(pid):
+    """Process start time in clock ticks, used to detect reused PIDs."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def browser_process_tree(process):
+    """(pid, start time) of a launched browser and all its descendants (renderer, GPU, zygote)."""
+    if process is None:
+        return []
+    processes, pending = [], [process.pid]
+    while pending:
+        pid = pending.pop()
+        processes.append((pid, _start_time(pid)))
+        pending.extend(_child_pids(pid))
+    return processes
+
+
+def kill_browser_processes(process, processes=None):
+    """
+    Kill a browser we launched and the helper processes it started.
+
+    Only the given process tree is touched, never other Chromium instances on the host.
+    Collect pids before closing the browser: orphaned helpers are re-parented and
+    cannot be found from the browser process afterwards.
+    """
+    if process is None:
+        return
+    processes = processes if processes is not None else browser_process_tree(process)
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    for pid, start_time in processes:
+        if pid == process.pid or start_time is None or _start_time(pid) != start_time:
+            continue
+        try:
+            os.kill(pid, signal.SIGKILL)
+            logger.debug(f"Killed leftover browser process {pid}")
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def supervisor_endpoints(supervisor_url, timeout=5):
+    """DevTools websocket endpoints of the live browsers published by browser_supervisor.py."""
+    with urllib.request.urlopen(f"{supervisor_url.rstrip('/')}/endpoints", timeout=timeout) as response:
+        data = json.load(response)
+    return [browser["ws_endpoint"] for browser in data.get("browsers", [])]
+
+
+async def open_browser(launch_options, supervisor_url=None, index=0):
+    """Launch a browser, or connect to one of the supervisor's browsers when supervisor_url is set."""
+    if not supervisor_url:
+        return await launch(**launch_options)
+    loop = asyncio.get_running_loop()
+    endpoints = await loop.run_in_executor(None, supervisor_endpoints, supervisor_url)
+    if not endpoints:
+        raise RuntimeError(f"Browser supervisor at {supervisor_url} has no live browsers")
+    endpoint = endpoints[index % len(endpoints)]
+    logger.info(f"Connecting to supervised browser at {endpoint}")
+    return await connect(browserWSEndpoint=endpoint)
+
+
+async def release_browser(browser, pages=()):
+    """
+    Close a browser we launched and kill its processes.
+
+    A browser we only connected to (no process of ours) belongs to the supervisor and
+    other workers: only our pages are closed and the connection is dropped.
+    """
+    process = getattr(browser, 'process', None)
+    if process is None:
+        for page in pages:
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Error while closing page: {e}")
+        await browser.disconnect()
+        return
+    processes = browser_process_tree(process)
+    try:
+        await browser.close()
+    finally:
+        kill_browser_processes(process, processes)
+
+
+class PooledBrowser:
+    """A launched browser together with its idle pages and render counter."""
+
+    def __init__(self, browser, index):
+        self.browser = browser
+        self.index = index
+        self.idle_pages = []
+        self.active_pages = 0
+        self.renders = 0
+        self.crashed = False
+        self.retiring = False
+        browser.on('disconnected', self._on_disconnected)
+
+    def _on_disconnected(self):
+        if not self.retiring:
+            logger.warning(f"Browser #{self.index} disconnected unexpectedly")
+        self.crashed = True
+
+    def is_process_alive(self):
+        process = getattr(self.browser, 'process', None)
+        return process is None or process.poll() is None
+
+    @property
+    def usable(self):
+        return not self.crashed and not self.retiring
+
+    @property
+    def page_count(self):
+        return self.active_pages + len(self.idle_pages)
+
+
+class BrowserPool:
+    """
+    A long-lived, size-bounded pool of warm Chromium browsers and pages.
+
+    The pool lives on the process-wide event loop service, because pyppeteer browsers
+    are bound to the loop they were launched on. Sync callers use run(), async callers
+    on any loop use run_async() or render_pdf().
+    """
+
+    def __init__(self, max_browsers=2, pages_per_browser=2, max_renders_per_browser=50, launch_options=None,
+                 supervisor_url=None, loop_service: EventLoopService = None):
+        logger.info(f"Initializing BrowserPool - browsers: {max_browsers}, pages per browser: {pages_per_browser}, "
+                    f"max renders per browser: {max_renders_per_browser}, supervisor: {supervisor_url or 'none'}")
+        if max_browsers < 1 or pages_per_browser < 1:
+            raise ValueError("BrowserPool needs at least one browser and one page per browser")
+
+        self.max_browsers = max_browsers
+        self.pages_per_browser = pages_per_browser
+        self.max_renders_per_browser = max_renders_per_browser
+        self.launch_options = launch_options or browser_launch_options()
+        # With a supervisor, "browsers" are connections to its shared Chromium instances
+        self.supervisor_url = supervisor_url
+        self.loop_service = loop_service or get_event_loop_service()
+
+        self._lock = asyncio.Lock()
+        # Waiters for page capacity; shares the pool lock
+        self._capacity = asyncio.Condition(self._lock)
+        self._slots = asyncio.Semaphore(max_browsers * pages_per_browser)
+        self._browsers = []
+        # Browsers being launched outside the lock; they count against max_browsers
+        self._launching = 0
+        self._launched = 0
+        self._closed = False
+        self.stats = {"launches": 0, "renders": 0, "recycled": 0, "crashed": 0}
+
+    # ------------------------------------------------------------------
+    # Event loop management
+    # ------------------------------------------------------------------
+    @property
+    def loop(self):
+        if self._closed:
+            raise RuntimeError("BrowserPool has been shut down")
+        return self.loop_service.loop
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the pool's event loop and block until it finishes."""
+        return self.loop_service.run(coro, timeout)
+
+    async def run_async(self, coro):
+        """Await a coroutine on the pool's event loop from any event loop."""
+        return await self.loop_service.run_async(coro)
+
+    # ------------------------------------------------------------------
+    # Page checkout / checkin
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def page(self):
+        """Check out a warm page. Must be used from the pool's event loop."""
+        if asyncio.get_running_loop() is not self.loop_service.loop:
+            raise RuntimeError("BrowserPool.page() must be used on the pool's event loop; use run() or run_async()")
+        if self._closed:
+            raise RuntimeError("BrowserPool has been shut down")
+
+        async with self._slots:
+            pooled, page = await self._checkout()
+            succeeded = False
+            try:
+                yield page
+                succeeded = True
+            finally:
+                await self._checkin(pooled, page, succeeded)
+
+    async def render_pdf(self, url, pdf_options):
+        """Load a URL on a pooled page and print it to PDF bytes. Safe to await from any event loop."""
+        return await self.run_async(self._render_pdf(url, pdf_options))
+
+    async def _render_pdf(self, url, pdf_options):
+        async with self.page() as page:
+            logger.debug(f"Loading {url} on pooled page")
+            await page.goto(url)
+            return await page.pdf(pdf_options)
+
+    async def render_pdf_content(self, html, pdf_options):
+        """Print an HTML string to PDF bytes on a pooled page. Safe to await from any event loop."""
+        return await self.run_async(self._render_pdf_content(html, pdf_options))
+
+    async def _render_pdf_content(self, html, pdf_options):
+        async with self.page() as page:
+            logger.debug(f"Setting {len(html)} characters of HTML on pooled page")
+            await page.setContent(html)
+            return await page.pdf(pdf_options)
+
+    async def _checkout(self):
+        # Slots are reserved under the lock; launching, opening pages and closing browsers happen outside it
+        launch = False
+        detached = []
+        try:
+            async with self._capacity:
+                while True:
+                    detached.extend(self._detach_browsers())
+
+                    # Prefer an idle warm page, then a browser with spare page capacity
+                    usable = [b for b in self._browsers if b.usable]
+                    for pooled in usable:
+                        if pooled.idle_pages:
+                            pooled.active_pages += 1
+                            return pooled, pooled.idle_pages.pop()
+
+                    candidates = [b for b in usable if b.page_count < self.pages_per_browser]
+                    if candidates:
+                        pooled = min(candidates, key=lambda b: b.page_count)
+                        pooled.active_pages += 1
+                        break
+                    if len(usable) + self._launching < self.max_browsers:
+                        self._launching += 1
+                        launch = True
+                        break
+                    # Every browser is full: wait for a checkin instead of exceeding pages_per_browser
+                    logger.debug("All pooled browsers are at page capacity - waiting for a page")
+                    await self._capacity.wait()
+        finally:
+            await self._close_browsers(detached)
+
+        if launch:
+            try:
+                pooled = await self._launch_browser()
+            except BaseException:
+                async with self._capacity:
+                    self._launching -= 1
+                    self._capacity.notify_all()
+                raise
+            async with self._capacity:
+                self._launching -= 1
+                pooled.active_pages += 1
+                self._browsers.append(pooled)
+
+        try:
+            page = await pooled.browser.newPage()
+        except BaseException:
+            async with self._capacity:
+                pooled.active_pages -= 1
+                self._capacity.notify_all()
+            raise
+        logger.debug(f"Opened new page on browser #{pooled.index} ({pooled.page_count} pages)")
+        return pooled, page
+
+    async def _checkin(self, pooled, page, succeeded):
+        if not succeeded and not pooled.is_process_alive():
+            pooled.crashed = True
+        # The page still counts as active while it is reset, so it cannot be handed out twice
+        keep = pooled.usable and await self._reset_page(page)
+
+        async with self._capacity:
+            pooled.active_pages -= 1
+            pooled.renders += 1
+            self.stats["renders"] += 1
+
+            if pooled.renders >= self.max_renders_per_browser and not pooled.retiring:
+                logger.info(f"Browser #{pooled.index} reached {pooled.renders} renders - recycling")
+                pooled.retiring = True
+                self.stats["recycled"] += 1
+
+            if keep and pooled.usable:
+                pooled.idle_pages.append(page)
+                page = None
+            detached = self._detach_browsers()
+            self._capacity.notify_all()
+
+        if page is not None:
+            await self._close_page(page)
+        await self._close_browsers(detached)
+
+    async def _reset_page(self, page):
+        """Bring a page back to a blank state so the next job starts clean."""
+        try:
+            await page.goto('about:blank')
+            cookies = await page.cookies()
+            if cookies:
+                await page.deleteCookie(*cookies)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset pooled page, discarding it: {e}")
+            return False
+
+    async def _close_page(self, page):
+        try:
+            await page.close()
+        except Exception as e:
+            logger.debug(f"Error while closing page: {e}")
+
+    # ------------------------------------------------------------------
+    # Browser lifecycle
+    # ------------------------------------------------------------------
+    async def _launch_browser(self):
+        self._launched += 1
+        logger.info(f"Launching pooled browser #{self._launched}")
+        browser = await open_browser(self.launch_options, self.supervisor_url, self._launched - 1)
+        self.stats["launches"] += 1
+        return PooledBrowser(browser, self._launched)
+
+    def _detach_browsers(self):
+        """Take crashed or retired browsers out of the pool once no page is checked out from them."""
+        detached = []
+        for pooled in list(self._browsers):
+            if pooled.usable and not pooled.is_process_alive():
+                pooled.crashed = True
+            if pooled.usable or pooled.active_pages > 0:
+                continue
+            if pooled.crashed:
+                logger.warning(f"Removing crashed browser #{pooled.index} from pool")
+                self.stats["crashed"] += 1
+            # Mark it before closing so the disconnect is not reported as a crash
+            pooled.retiring = True
+            self._browsers.remove(pooled)
+            detached.append(pooled)
+        return detached
+
+    async def _close_browsers(self, browsers):
+        for pooled in browsers:
+            await self._close_browser(pooled)
+
+    async def _close_browser(self, pooled):
+        pooled.retiring = True
+        pages, pooled.idle_pages = pooled.idle_pages, []
+        try:
+            await release_browser(pooled.browser, pages)
+            logger.debug(f"Browser #{pooled.index} closed")
+        except Exception as e:
+            logger.warning(f"Error while closing browser #{pooled.index}: {e}")
+
+    async def _close_all(self):
+        async with self._lock:
+            for pooled in list(self._browsers):
+                await self._close_browser(pooled)
+            self._browsers.clear()
+
+    def shutdown(self, timeout=30):
+        """Close every browser; the shared event loop keeps running."""
+        if self._closed:
+            return
+        self._closed = True
+        if not (self._browsers and self.loop_service.running):
+            return
+
+        logger.info("Shutting down BrowserPool")
+        try:
+            self.loop_service.run(self._close_all(), timeout)
+        except Exception as e:
+            logger.warning(f"Error while closing pooled browsers: {e}")
+        logger.info(f"BrowserPool shut down - stats: {self.stats}")
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool, creating it on first use."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(
+                max_browsers=int(os.environ.get('BROWSER_POOL_SIZE', 2)),
+                pages_per_browser=int(os.environ.get('BROWSER_POOL_PAGES', 2)),
+                max_renders_per_browser=int(os.environ.get('BROWSER_POOL_MAX_RENDERS', 50)),
+                supervisor_url=os.environ.get('BROWSER_SUPERVISOR_URL') or None,
+            )
+            atexit.register(shutdown_browser_pool)
+        return _shared_pool
+
+
+def shutdown_browser_pool():
+    """Shut down the process-wide browser pool if it was created."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    pool = get_browser_pool()
+    pdf = pool.run(pool.render_pdf("about:blank", {"format": "A4"}))
+    print(f"Rendered {len(pdf)} bytes")
+    shutdown_browser_pool()
@@ -0,0 +1,229 @@
+"""
+Standalone process owning a fixed set of Chromium instances for all server workers.
+
+Workers set BROWSER_SUPERVISOR_URL and connect to the instances' DevTools websocket
+endpoints instead of launching their own browsers.
+
+Usage:
+    python src/browser_supervisor.py --instances 2 --max-memory-mb 2048 --port 9322
+"""
+import os
+import json
+import time
+import signal
+import asyncio
+import argparse
+import threading
+import logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pyppeteer import launch
+from browser_pool import browser_launch_options, browser_process_tree, release_browser
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9322
+
+
+def process_tree_rss(process) -> int:
+    """Resident memory of a browser and its helper processes in bytes (Linux only, else 0)."""
+    total = 0
+    for pid, _ in browser_process_tree(process):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            pass
+    return total
+
+
+class SupervisedBrowser:
+    """One Chromium instance owned by the supervisor."""
+
+    def __init__(self, index, browser):
+        self.index = index
+        self.browser = browser
+        self.process = getattr(browser, 'process', None)
+        self.ws_endpoint = browser.wsEndpoint
+        self.started_at = time.time()
+        self.restarts = 0
+        self.disconnected = False
+        browser.on('disconnected', self._on_disconnected)
+
+    def _on_disconnected(self):
+        self.disconnected = True
+
+    @property
+    def alive(self):
+        return not self.disconnected and (self.process is None or self.process.poll() is None)
+
+    def describe(self, rss=0) -> dict:
+        return {
+            "index": self.index,
+            "ws_endpoint": self.ws_endpoint,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive,
+            "rss_mb": round(rss / 1024 / 1024, 1),
+            "restarts": self.restarts,
+            "uptime_s": round(time.time() - self.started_at, 1),
+        }
+
+
+class BrowserSupervisor:
+    """
+    Keeps `instances` Chromium browsers running and publishes their endpoints.
+
+    Crashed instances are relaunched. When the browsers together use more than
+    max_memory_mb, the largest one is restarted; connected workers see the disconnect
+    and reconnect on their next render.
+    """
+
+    def __init__(self, instances=2, max_memory_mb=None, check_interval=5.0, launch_options=None):
+        if instances < 1:
+            raise ValueError("BrowserSupervisor needs at least one instance")
+        logger.info(f"Initializing BrowserSupervisor - instances: {instances}, max memory: {max_memory_mb} MB")
+        self.instances = instances
+        self.max_memory = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+        self.check_interval = check_interval
+        self.launch_options = launch_options or browser_launch_options()
+        self.browsers = []
+        self._snapshot = []
+        self._snapshot_lock = threading.Lock()
+        self.stats = {"launches": 0, "crash_restarts": 0, "memory_restarts": 0}
+
+    async def _launch_browser(self):
+        return await launch(**self.launch_options)
+
+    async def _start_instance(self, index, restarts=0) -> SupervisedBrowser:
+        instance = SupervisedBrowser(index, await self._launch_browser())
+        instance.restarts = restarts
+        self.stats["launches"] += 1
+        logger.info(f"Browser #{index} running at {instance.ws_endpoint}")
+        return instance
+
+    async def _stop_instance(self, instance):
+        try:
+            await release_browser(instance.browser)
+        except Exception as e:
+            logger.debug(f"Error while closing browser #{instance.index}: {e}")
+
+    async def _restart(self, instance, reason):
+        logger.warning(f"Restarting browser #{instance.index}: {reason}")
+        await self._stop_instance(instance)
+        position = self.browsers.index(instance)
+        self.browsers[position] = await self._start_instance(instance.index, instance.restarts + 1)
+
+    async def start(self):
+        self.browsers = [await self._start_instance(index) for index in range(self.instances)]
+        self._publish()
+
+    async def check(self):
+        """Restart crashed browsers and enforce the memory cap; called periodically."""
+        for instance in list(self.browsers):
+            if not instance.alive:
+                self.stats["crash_restarts"] += 1
+                await self._restart(instance, "process exited or disconnected")
+
+        usage = {instance: process_tree_rss(instance.process) for instance in self.browsers}
+        if self.max_memory and sum(usage.values()) > self.max_memory:
+            largest = max(usage, key=usage.get)
+            self.stats["memory_restarts"] += 1
+            await self._restart(largest, f"total browser memory {sum(usage.values()) // 2 ** 20} MB "
+                                         f"exceeds {self.max_memory // 2 ** 20} MB")
+            usage = {instance: process_tree_rss(instance.process) for instance in self.browsers}
+        self._publish(usage)
+
+    def _publish(self, usage=None):
+        usage = usage or {}
+        snapshot = [instance.describe(usage.get(instance, 0)) for instance in self.browsers]
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+
+    def endpoints(self) -> list:
+        """Thread-safe snapshot of the instances, served to workers."""
+        with self._snapshot_lock:
+            return list(self._snapshot)
+
+    async def run(self, stopping: asyncio.Event):
+        await self.start()
+        while not stopping.is_set():
+            try:
+                await asyncio.wait_for(stopping.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            if not stopping.is_set():
+                try:
+                    await self.check()
+                except Exception as e:
+                    logger.error(f"Browser supervisor check failed: {e}")
+
+    async def close(self):
+        for instance in self.browsers:
+            await self._stop_instance(instance)
+        self.browsers = []
+        self._publish()
+        logger.info(f"BrowserSupervisor stopped - stats: {self.stats}")
+
+
+def make_handler(supervisor: BrowserSupervisor):
+    class SupervisorHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            browsers = supervisor.endpoints()
+            if self.path == "/endpoints":
+                status, body = 200, {"browsers": [b for b in browsers if b["alive"]], "stats": supervisor.stats}
+            elif self.path == "/health":
+                healthy = bool(browsers) and all(b["alive"] for b in browsers)
+                status, body = (200 if healthy else 503), {"healthy": healthy, "browsers": browsers}
+            else:
+                status, body = 404, {"error": "not found"}
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return SupervisorHandler
+
+
+async def serve(supervisor: BrowserSupervisor, host="127.0.0.1", port=DEFAULT_PORT):
+    """Run the supervisor and its HTTP endpoint until SIGINT/SIGTERM."""
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    server = ThreadingHTTPServer((host, port), make_handler(supervisor))
+    threading.Thread(target=server.serve_forever, name="BrowserSupervisor-http", daemon=True).start()
+    logger.info(f"Browser supervisor listening on http://{host}:{server.server_address[1]}")
+    try:
+        await supervisor.run(stopping)
+    finally:
+        server.shutdown()
+        await supervisor.close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Chromium supervisor shared by server workers')
+    parser.add_argument('--instances', type=int, default=int(os.environ.get('BROWSER_SUPERVISOR_INSTANCES', 2)))
+    parser.add_argument('--max-memory-mb', type=int, default=int(os.environ.get('BROWSER_SUPERVISOR_MAX_MEMORY_MB', 0)),
+                        help='Restart the largest browser when all together exceed this (0: no cap)')
+    parser.add_argument('--check-interval', type=float, default=5.0)
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('BROWSER_SUPERVISOR_PORT', DEFAULT_PORT)))
+    args = parser.parse_args()
+
+    supervisor = BrowserSupervisor(instances=args.instances, max_memory_mb=args.max_memory_mb or None,
+                                   check_interval=args.check_interval)
+    asyncio.run(serve(supervisor, args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import atexit
+import asyncio
+import threading
+import logging
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+class EventLoopService:
+    """
+    One long-lived asyncio event loop running in a dedicated daemon thread.
+
+    Async resources that are bound to the loop they were created on (pyppeteer browsers,
+    HTTP clients, translators) live on this loop and survive between requests. Sync callers
+    submit coroutines with run(); async callers on another loop await run_async().
+    """
+
+    def __init__(self, name="EventLoopService"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} has been shut down")
+            if self._thread and self._thread.is_alive():
+                return self
+
+            ready = threading.Event()
+
+            def run_loop():
+                self._loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self._loop)
+                ready.set()
+                try:
+                    self._loop.run_forever()
+                finally:
+                    self._loop.close()
+
+            self._thread = threading.Thread(target=run_loop, name=f"{self.name}-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(f"{self.name} event loop started")
+            return self
+
+    @property
+    def loop(self):
+        self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return not self._closed and self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block until it finishes."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(f"{self.name}.run() would block its own event loop; await the coroutine instead")
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro):
+        """Await a coroutine on the loop from any event loop."""
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    async def _cancel_pending(self):
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self, timeout=30):
+        """Cancel what is still running on the loop and stop its thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if not (self._thread and self._thread.is_alive()):
+                return
+
+        logger.info(f"Shutting down {self.name}")
+        try:
+            asyncio.run_coroutine_threadsafe(self._cancel_pending(), self._loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error while cancelling pending tasks: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_event_loop_service():
+    """Return the process-wide event loop service, starting it on first use."""
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = EventLoopService()
+            # Registered before any pool or session using it, so it is shut down after them
+            atexit.register(shutdown_event_loop_service)
+        return _shared_service.start()
+
+
+def run_sync(coro, timeout=None):
+    """Run a coroutine on the process-wide event loop from sync code."""
+    return get_event_loop_service().run(coro, timeout)
+
+
+def shutdown_event_loop_service():
+    """Stop the process-wide event loop if it was started."""
+    global _shared_service
+    with _shared_service_lock:
+        service, _shared_service = _shared_service, None
+    if service is not None:
+        service.shutdown()
@@ -0,0 +1,225 @@
+"""
+Fetch many job postings concurrently and write them as JSONL for main.py --jobs-jsonl.
+
+Usage:
+    python src/fetch_jobs.py --urls urls.txt --output jobs.jsonl --concurrency 4
+    cat urls.txt | python src/fetch_jobs.py --urls - --output - | python src/main.py --jobs-jsonl -
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+from urllib.parse import urlparse
+from job_description_interface import JobDescriptionInterface, FETCH_ERRORS
+from job_data import JobData
+from job_store import JobStore, get_job_store
+from scraper_session import ScraperSession, get_scraper_session
+from job_page_fetcher import HttpJobFetcher, get_http_fetcher
+from batch_runner import open_jobs_input, open_results_output
+from event_loop_service import run_sync, shutdown_event_loop_service
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+class FetchError(Exception):
+    """A posting could not be fetched (after the browser fallback)."""
+
+
+class JobFetcher:
+    """
+    Fetches job postings for many URLs concurrently.
+
+    At most `concurrency` postings are fetched at once. Requests to the same host start
+    at least `host_delay` seconds apart, failed fetches are retried with exponential
+    backoff, and results are yielded in completion order. Postings go through the job
+    store, the HTTP fast path and the shared scraper session like single fetches.
+    """
+
+    def __init__(self, concurrency=4, host_delay=1.0, retries=2, retry_delay=2.0,
+                 session: ScraperSession = None, http_fetcher: HttpJobFetcher = None, store: JobStore = None):
+        self.concurrency = max(1, concurrency)
+        self.host_delay = host_delay
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self.session = session or get_scraper_session()
+        self.http_fetcher = http_fetcher or get_http_fetcher()
+        self.store = store if store is not None else get_job_store()
+        self._slots = None
+        self._host_locks = {}
+        self._host_next = {}
+
+    async def _wait_for_host(self, url):
+        """Space out request starts per host; requests to different hosts do not wait."""
+        host = urlparse(url).hostname or ""
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            delay = self._host_next.get(host, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._host_next[host] = time.monotonic() + self.host_delay
+
+    async def _fetch_posting(self, interface: JobDescriptionInterface, platform):
+        """Return (job_description, company_name, job_title, source) for one attempt."""
+        loop = asyncio.get_running_loop()
+        await self._wait_for_host(interface.job_description_url)
+        # requests is blocking, so the HTTP fast path runs in a worker thread
+        result = await loop.run_in_executor(None, platform.get_job_description_via_http)
+        source = "http"
+        if result is None:
+            result = await platform.get_job_description_via_pyppeteer()
+            source = "browser"
+        job_description, company_name = result
+        if not job_description or job_description.startswith(FETCH_ERRORS):
+            raise FetchError(job_description or "empty job description")
+        return job_description, company_name, platform.job_title, source
+
+    async def fetch_one(self, url: str) -> dict:
+        """Fetch one posting with retries; never raises, errors are reported in the result."""
+        started_at = time.perf_counter()
+        result = {"url": url}
+        interface = JobDescriptionInterface(url, store=self.store)
+        platform = interface.detect_the_platform()
+        if platform is None:
+            result.update({"status": "error", "error": "unsupported job URL", "attempts": 0, "elapsed_s": 0.0})
+            return result
+        platform.session = self.session
+        platform.http_fetcher = self.http_fetcher
+        result["job_id"] = interface.job_id
+
+        stored = self.store.get(interface.job_id) if self.store is not None else None
+        if stored is not None:
+            result.update(self._record(stored, "store", 0))
+            result["elapsed_s"] = round(time.perf_counter() - started_at, 3)
+            return result
+
+        for attempt in range(1, self.retries + 2):
+            try:
+                # A slot is held per attempt only, so a retry waiting out its backoff does not block other fetches
+                async with self._slots:
+                    job_description, company_name, job_title, source = await self._fetch_posting(interface, platform)
+            except Exception as e:
+                logger.warning(f"Fetching {url} failed (attempt {attempt}/{self.retries + 1}): {e}")
+                result.update({"status": "error", "error": str(e), "attempts": attempt})
+                if attempt <= self.retries:
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                continue
+            job = JobData(interface.job_id, job_title, job_description, company_name)
+            if self.store is not None:
+                try:
+                    self.store.put(job, source_url=url)
+                except Exception as e:
+                    logger.warning(f"Failed to store job {interface.job_id}: {e}")
+            result.pop("error", None)
+            result.update(self._record(job, source, attempt))
+            break
+        result["elapsed_s"] = round(time.perf_counter() - started_at, 3)
+        return result
+
+    @staticmethod
+    def _record(job: JobData, source: str, attempts: int) -> dict:
+        job_id, job_title, job_description, company_name = job.get_job_data()
+        return {
+            "status": "ok",
+            "job_id": job_id,
+            # main.py --jobs-jsonl requires every field
+            "job_title": job_title or "Unknown Position",
+            "job_description": job_description,
+            "company_name": company_name or "Unknown Company",
+            "source": source,
+            "attempts": attempts,
+        }
+
+    async def fetch_all(self, urls):
+        """Async generator yielding one result dict per URL as soon as it is fetched."""
+        self._slots = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.ensure_future(self.fetch_one(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def write_jsonl(self, urls, output, failures=None) -> dict:
+        """Write fetched postings to output as JSONL; failed URLs go to failures if given."""
+        summary = {"urls": 0, "ok": 0, "error": 0}
+        start = time.perf_counter()
+        async for result in self.fetch_all(urls):
+            summary["urls"] += 1
+            summary[result["status"]] += 1
+            if result["status"] == "ok":
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                logger.info(f"Fetched {result['url']} ({result['source']}, {result['elapsed_s']}s)")
+            else:
+                logger.error(f"Giving up on {result['url']}: {result['error']}")
+                if failures is not None:
+                    failures.write(result["url"] + "\n")
+                    failures.flush()
+        summary["duration_s"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Fetch finished: {summary}")
+        return summary
+
+
+def read_urls(lines):
+    """Yield the non-empty, non-comment lines of a URL list."""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Fetch job postings concurrently into JSONL')
+    parser.add_argument('urls', nargs='*', help='Job posting URLs')
+    parser.add_argument('--urls', dest='urls_file', type=str, default=None, help='File with one URL per line, - for stdin')
+    parser.add_argument('--output', type=str, default='-', help='JSONL output (appended), - for stdout')
+    parser.add_argument('--failed', type=str, default=None, help='File to append URLs that could not be fetched')
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('FETCH_CONCURRENCY', 4)))
+    parser.add_argument('--host-delay', type=float, default=float(os.environ.get('FETCH_HOST_DELAY', 1.0)),
+                        help='Minimum seconds between requests to the same host')
+    parser.add_argument('--retries', type=int, default=int(os.environ.get('FETCH_RETRIES', 2)))
+    args = parser.parse_args()
+    if not args.urls and not args.urls_file:
+        parser.error("give URLs as arguments or with --urls")
+    return args
+
+
+def main():
+    # Logs go to stderr, so --output - can be piped into main.py --jobs-jsonl -
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+                        stream=sys.stderr)
+    args = parse_arguments()
+    urls = list(args.urls)
+    if args.urls_file:
+        urls_input = open_jobs_input(args.urls_file)
+        try:
+            urls.extend(read_urls(urls_input))
+        finally:
+            if urls_input is not sys.stdin:
+                urls_input.close()
+
+    output = open_results_output(args.output)
+    failures = open_results_output(args.failed) if args.failed else None
+    # One browser with a page per concurrent fetch, used only when the HTTP fast path fails
+    session = ScraperSession(intercept=os.environ.get('SCRAPER_INTERCEPT', 'document').lower(), pages=args.concurrency,
+                             supervisor_url=os.environ.get('BROWSER_SUPERVISOR_URL') or None)
+    fetcher = JobFetcher(concurrency=args.concurrency, host_delay=args.host_delay, retries=args.retries, session=session)
+    try:
+        # Same loop as the scraper session's pages, so browser fallbacks need no hand-off
+        summary = run_sync(fetcher.write_jsonl(urls, output, failures))
+    finally:
+        for stream in (output, failures):
+            if stream is not None and stream is not sys.stdout:
+                stream.close()
+        session.shutdown()
+        shutdown_event_loop_service()
+    sys.exit(0 if summary["error"] == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,43 @@
 # interface to get the correct job description based on url
 import asyncio
+import warnings
 from linkedin_job_description import LinkedinJobDescription
-import os
+from job_data import JobData
+from job_store import JobStore, get_job_store
 from pathlib import Path
 import logging
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+# Cache location used before the job store existed
+LEGACY_JOB_DIR = Path(__file__).parent.parent / "output" / "jobs"
+# Placeholders returned by the scraper on failure; never stored
+FETCH_ERRORS = ("Error fetching job description", "No job description found")
+
 class JobDescriptionInterface:
-    def __init__(self, job_description_url):
+    def __init__(self, job_description_url, store: JobStore = None):
         logger.info(f"Initializing JobDescriptionInterface with URL: {job_description_url}")
         self.job_description_url = job_description_url
         self.job_id = None
         self.job_description = None
+        # Fetched postings are kept in the shared job store (None disables it)
+        self.store = store if store is not None else get_job_store()
+
+    def get_job_description(self, load_from_store=False, save_to_store=False, load_from_file=None,
+                            save_to_file=None, job_dir=None):
+        """Return (job_description, company_name), from the job store when allowed or from the platform.
 
-    def get_job_description(self, load_from_file=False, save_to_file=False, job_dir="../output/jobs"):
-        logger.info(f"Getting job description - load_from_file: {load_from_file}, save_to_file: {save_to_file}")
+        load_from_file, save_to_file and job_dir are the deprecated names from before the job store;
+        job_dir is now only searched for legacy <job_id>.txt files to import.
+        """
+        if load_from_file is not None or save_to_file is not None or job_dir is not None:
+            warnings.warn("load_from_file, save_to_file and job_dir are deprecated; "
+                          "use load_from_store and save_to_store", DeprecationWarning, stacklevel=2)
+            load_from_store = load_from_store or bool(load_from_file)
+            save_to_store = save_to_store or bool(save_to_file)
+        legacy_dir = Path(__file__).parent / job_dir if job_dir is not None else LEGACY_JOB_DIR
+        logger.info(f"Getting job description - load_from_store: {load_from_store}, save_to_store: {save_to_store}")
         
         # return the coroutine 
         platform = self.detect_the_platform()
@@ -24,28 +45,17 @@ class JobDescriptionInterface:
             logger.error("No supported platform detected for the provided URL")
             raise ValueError("Unsupported job description URL platform")
         
-        # full path to the job dir
-        job_dir = Path(__file__).parent / job_dir
-        job_file = Path(f"{job_dir}/{self.job_id}.txt")
-        logger.debug(f"Job file path: {job_file}")
-        
-        if load_from_file:
-            logger.debug("Attempting to load job description from file")
+        if load_from_store and self.store is not None:
+            logger.debug(f"Looking up job {self.job_id} in the job store")
             try:
-                # check if job_file exists
-                if os.path.exists(job_file):
-                    logger.info(f"Loading job description from existing file: {job_file}")
-                    with open(job_file, "r") as f:
-                        company_name = f.readline().strip()
-                        job_description = f.read()
-                        logger.info(f"Successfully loaded job description from file - Company: {company_name}, Length: {len(job_description)} characters")
-                        return job_description, company_name
-                else:
-                    logger.debug(f"Job file does not exist: {job_file}")
-            except FileNotFoundError:
-                logger.warning(f"Job file not found: {job_file}")
+                job_data = self.store.get(self.job_id) or self._import_legacy_file(legacy_dir)
+                if job_data is not None:
+                    _, _, job_description, company_name = job_data.get_job_data()
+                    logger.info(f"Loaded job description from store - Company: {company_name}, Length: {len(job_description)} characters")
+                    self.job_description = job_description
+                    return job_description, company_name
             except Exception as e:
-                logger.error(f"Error reading job file {job_file}: {e}")
+                logger.error(f"Error reading job {self.job_id} from the job store: {e}")
         
         logger.info("Fetching job description from platform")
         try:
@@ -54,26 +64,37 @@ class JobDescriptionInterface:
         except Exception as e:
             logger.error(f"Failed to fetch job description from platform: {e}")
             raise
+        self.job_description = job_description
         
-        if save_to_file:
-            logger.info(f"Saving job description to file: {job_file}")
+        if save_to_store and self.store is not None and not job_description.startswith(FETCH_ERRORS):
+            logger.info(f"Saving job {self.job_id} to the job store")
             try:
-                # Ensure directory exists
-                job_dir.mkdir(parents=True, exist_ok=True)
-                
-                with open(job_file, "w") as f:
-                    f.write(company_name + "\n" + job_description)
-                logger.info(f"Successfully saved job description to file: {job_file}")
+                self.store.put(JobData(self.job_id, platform.job_title, job_description, company_name),
+                               source_url=self.job_description_url)
             except Exception as e:
-                logger.error(f"Failed to save job description to file {job_file}: {e}")
+                logger.error(f"Failed to save job {self.job_id} to the job store: {e}")
         
         return job_description, company_name
+
+    def _import_legacy_file(self, job_dir=LEGACY_JOB_DIR):
+        """Move a posting cached by older versions as output/jobs/<job_id>.txt into the store."""
+        job_file = Path(job_dir) / f"{self.job_id}.txt"
+        if not job_file.exists():
+            return None
+        with open(job_file, "r", encoding="utf-8") as f:
+            company_name = f.readline().strip()
+            job_description = f.read()
+        fetched_at = job_file.stat().st_mtime
+        self.store.put(JobData(self.job_id, None, job_description, company_name),
+                       source_url=self.job_description_url, fetched_at=fetched_at)
+        logger.info(f"Imported legacy job file {job_file} into the job store")
+        return self.store.get(self.job_id)
     
     def detect_the_platform(self):
         logger.debug(f"Detecting platform for URL: {self.job_description_url}")
         
         if self.job_description_url.startswith("https://www.linkedin.com/jobs"):
-            self.job_id = self.job_description_url.split("/")[-1]
+            self.job_id = self.job_description_url.split("?")[0].rstrip("/").split("/")[-1]
             logger.info(f"Detected LinkedIn platform - Job ID: {self.job_id}")
             return LinkedinJobDescription(self.job_description_url)
         else:
@@ -83,5 +104,5 @@ class JobDescriptionInterface:
 if __name__ == '__main__':
     job_url_1 = "https://www.linkedin.com/jobs/view/4114686525"
     job_description_obj = JobDescriptionInterface(job_url_1)
-    jd= job_description_obj.get_job_description(load_from_file=True, save_to_file=True)
+    jd= job_description_obj.get_job_description(load_from_store=True, save_to_store=True)
     print("job description: ",jd)
\ No newline at end of file
@@ -0,0 +1,190 @@
+import re
+import logging
+from typing import NamedTuple, Optional
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+TASKS = "tasks"
+REQUIREMENTS = "requirements"
+BENEFITS = "benefits"
+COMPANY = "company"
+LEGAL = "legal"  # equal opportunity, privacy, contact and application instructions
+OTHER = "other"  # title, location and text under unrecognized headings
+
+# Sections passed to the LLM; everything else is boilerplate for skill extraction
+RELEVANT_SECTIONS = (TASKS, REQUIREMENTS, OTHER)
+
+# Heading patterns per section, English and German; the first matching section wins
+HEADING_PATTERNS = {
+    TASKS: (
+        r"(key |main |your )?(responsibilities|duties|tasks)",
+        r"what you('ll| will)( be)? do(ing)?",
+        r"(the|your) (role|job|position|mission)",
+        r"about the (role|job|position)",
+        r"job description",
+        r"(das sind |ihre |deine |unsere )?aufgaben(gebiet|bereich)?",
+        r"(ihr |dein )?aufgabengebiet",
+        r"(was sind unsere |unsere |ihre |deine )?tätigkeit(en|sfelder|sbereich)?",
+        r"was (dich|sie) erwartet",
+        r"(ihre|deine) rolle",
+        r"die (stelle|position)",
+    ),
+    REQUIREMENTS: (
+        r"(requirements|qualifications|prerequisites)",
+        r"(must|nice) to have",
+        r"what (you|you'll|you will) (bring|need)",
+        r"what we('re| are) looking for",
+        r"(about you|who you are|your profile|your skills|you have|you bring)",
+        r"(required|preferred|desired) (skills|experience|qualifications)",
+        r"(ihr |dein )?profil",
+        r"das (bringen sie|bringst du) mit",
+        r"was (sie|du) mitbring(en|st)",
+        r"(anforderungen|voraussetzungen|qualifikationen?)",
+        r"(ihre|deine) (kenntnisse|qualifikation(en)?|skills)",
+    ),
+    BENEFITS: (
+        r"(benefits|perks)",
+        r"what we offer|we offer|our offer",
+        r"why (join us|work (with|for) us)",
+        r"(compensation|salary)",
+        r"(das |was )?(bieten wir|wir bieten)( (ihnen|dir))?",
+        r"unser angebot",
+        r"(ihre |deine )?vorteile",
+        r"vergütung",
+    ),
+    COMPANY: (
+        r"about us|who we are|about the company|our company",
+        r"our (values|mission|culture|story)",
+        r"company description",
+        r"über uns|das sind wir|wer wir sind",
+        r"unsere (werte|mission|kultur)",
+        r"(über das|das) unternehmen",
+    ),
+    LEGAL: (
+        r"equal (employment )?opportunit(y|ies)",
+        r"(diversity|inclusion)( statement)?",
+        r"(privacy|data protection)( notice| policy)?",
+        r"(contact|how to apply|application( process)?)",
+        r"(ihre |deine )?ansprechpartner(in)?",
+        r"(kontakt|bewerbung(sprozess|sform)?|bevorzugte bewerbungsform)",
+        r"chancengleichheit|datenschutz|gleichstellung|vielfalt",
+    ),
+}
+
+# Legal sentences that appear without a heading of their own
+LEGAL_LINE_PATTERNS = (
+    r"equal (employment )?opportunity employer",
+    r"without regard to|regardless of (race|gender|sex|age|religion|disability|sexual|national)",
+    r"unabhängig von (geschlecht|herkunft|alter|religion|behinderung|sexueller)",
+    r"(privacy|data protection) (notice|policy)",
+    r"datenschutz(erklärung|hinweise)",
+)
+
+_HEADING_MAX_WORDS = 8
+_HEADING_MAX_CHARS = 80
+# Below this, stripping likely misclassified the posting and the original is used
+_MIN_KEPT_CHARS = 200
+
+_COMPILED_HEADINGS = {section: [re.compile(pattern) for pattern in patterns]
+                      for section, patterns in HEADING_PATTERNS.items()}
+_LEGAL_LINE = re.compile("|".join(LEGAL_LINE_PATTERNS), re.IGNORECASE)
+# A heading at the end of a line of text: "... Funktionsbausteinen. Was sind unsere Tätigkeitsfelder:"
+_TRAILING_HEADING = re.compile(r"(?<=[.!?])\s+(?=[^.!?:\n]{3,80}:\s*$)")
+_HEADING_DECORATION = re.compile(r"^[\s#*_•\-–]+|[\s#*_]+$")
+
+
+class Section(NamedTuple):
+    category: str
+    heading: str
+    text: str
+
+
+class StrippedJobDescription(NamedTuple):
+    text: str
+    sections: list
+    original_chars: int
+    removed: dict  # category -> removed characters
+
+    @property
+    def kept_chars(self) -> int:
+        return len(self.text)
+
+    @property
+    def cut_ratio(self) -> float:
+        return 1 - self.kept_chars / self.original_chars if self.original_chars else 0.0
+
+
+def classify_heading(line: str, company_name: str = None) -> Optional[str]:
+    """Return the section a heading line starts, or None if the line is not a heading."""
+    heading = _HEADING_DECORATION.sub("", line)
+    if not heading or len(heading) > _HEADING_MAX_CHARS or len(heading.split()) > _HEADING_MAX_WORDS:
+        return None
+    has_colon = heading.endswith(":")
+    normalized = " ".join(heading.rstrip(":").lower().split())
+    if not has_colon and normalized[-1:] in ".!?,;":
+        return None
+    if company_name and normalized in (f"about {company_name.lower()}", f"über {company_name.lower()}"):
+        return COMPANY
+    for section, patterns in _COMPILED_HEADINGS.items():
+        for pattern in patterns:
+            # A line ending in ':' only needs to mention the topic; a bare line must be the heading itself
+            if (pattern.search(normalized) if has_colon else pattern.fullmatch(normalized)):
+                return section
+    return OTHER if has_colon and len(heading.split()) <= 4 and not re.search(r"\d", heading) else None
+
+
+def _lines(text: str):
+    for line in text.splitlines():
+        parts = _TRAILING_HEADING.split(line.rstrip())
+        yield from parts
+
+
+def split_sections(text: str, company_name: str = None) -> list:
+    """Split a job description into Sections, keeping the original line breaks."""
+    sections = []
+    category, heading, body = OTHER, "", []
+
+    def close():
+        if heading or any(line.strip() for line in body):
+            sections.append(Section(category, heading, "\n".join(body).strip()))
+
+    for line in _lines(text):
+        section = classify_heading(line, company_name) if line.strip() else None
+        if section is None:
+            body.append(line)
+            continue
+        close()
+        category, heading, body = section, line.strip(), []
+    close()
+    return sections
+
+
+def strip_boilerplate(text: str, company_name: str = None) -> StrippedJobDescription:
+    """
+    Keep the tasks, requirements and unclassified parts of a job description.
+
+    Benefits, company descriptions and legal text are dropped, as are equal opportunity
+    and privacy sentences inside kept sections. If too little would remain, the
+    original text is returned unchanged.
+    """
+    sections = split_sections(text, company_name)
+    removed = {}
+    kept = []
+    for section in sections:
+        if section.category not in RELEVANT_SECTIONS:
+            removed[section.category] = removed.get(section.category, 0) + len(section.heading) + len(section.text)
+            continue
+        lines = []
+        for line in section.text.splitlines():
+            if _LEGAL_LINE.search(line):
+                removed[LEGAL] = removed.get(LEGAL, 0) + len(line)
+            else:
+                lines.append(line)
+        body = "\n".join(lines).strip()
+        kept.append("\n".join(part for part in (section.heading, body) if part))
+
+    stripped = "\n\n".join(part for part in kept if part)
+    if not removed or len(stripped) < _MIN_KEPT_CHARS:
+        return StrippedJobDescription(text, sections, len(text), {})
+    return StrippedJobDescription(stripped, sections, len(text), removed)
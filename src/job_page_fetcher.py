@@ -0,0 +1,184 @@
+import os
+import re
+import threading
+import logging
+from typing import NamedTuple
+from html.parser import HTMLParser
+import requests
+from requests.adapters import HTTPAdapter
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+DESCRIPTION_CLASS = "show-more-less-html__markup"
+COMPANY_CLASS = "topcard__org-name-link"
+TITLE_CLASS = "top-card-layout__title"
+# LinkedIn serves the full public job page to browser-like clients only
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,de;q=0.8",
+}
+
+_BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "section", "tr"}
+_VOID_TAGS = {"br", "img", "hr", "input", "meta", "link", "source", "wbr"}
+_SKIPPED_TAGS = {"script", "style", "template"}
+# Block boundaries collapse into one line break; <br> is always a line break of its own
+_SOFT_BREAK = "\x00"
+
+
+class JobPageParseError(ValueError):
+    """The page does not contain the expected job posting markup (e.g. a login wall)."""
+
+
+class JobPage(NamedTuple):
+    job_description: str
+    company_name: str
+    job_title: str
+
+
+class JobPageParser(HTMLParser):
+    """
+    Extracts the job description, company name and title from a server-rendered LinkedIn job page.
+
+    The description text approximates the browser's innerText: block elements start
+    new lines and whitespace inside lines is collapsed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._description_depth = 0  # element depth inside the description markup, 0 = outside
+        self._skip_depth = 0
+        self._description = []
+        self.found_description = False
+        # Plain-text fields: class name, element depth and collected text
+        self._fields = {"company_name": [COMPANY_CLASS, 0, []], "job_title": [TITLE_CLASS, 0, []]}
+
+    @staticmethod
+    def _classes(attrs):
+        return (dict(attrs).get("class") or "").split()
+
+    def _break(self, tag):
+        if tag == "br":
+            self._description.append("\n")
+        elif tag in _BLOCK_TAGS:
+            self._description.append(_SOFT_BREAK)
+
+    def handle_starttag(self, tag, attrs):
+        void = tag in _VOID_TAGS
+        if self._description_depth:
+            self._break(tag)
+            if tag in _SKIPPED_TAGS:
+                self._skip_depth += 1
+            if not void:
+                self._description_depth += 1
+        elif not self.found_description and DESCRIPTION_CLASS in self._classes(attrs) and not void:
+            self._description_depth = 1
+            self.found_description = True
+
+        if void:
+            return
+        for field in self._fields.values():
+            if field[1]:
+                field[1] += 1
+            elif not field[2] and field[0] in self._classes(attrs):
+                field[1] = 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> and friends never open an element
+        if self._description_depth:
+            self._break(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        if self._description_depth:
+            self._description_depth -= 1
+            if tag in _SKIPPED_TAGS and self._skip_depth:
+                self._skip_depth -= 1
+            self._break(tag)
+        for field in self._fields.values():
+            if field[1]:
+                field[1] -= 1
+
+    def handle_data(self, data):
+        if self._description_depth and not self._skip_depth:
+            # Source line breaks are plain whitespace in HTML
+            self._description.append(re.sub(r"\s+", " ", data))
+        for field in self._fields.values():
+            if field[1]:
+                field[2].append(data)
+
+    @property
+    def job_description(self) -> str:
+        text = re.sub(f"[ {_SOFT_BREAK}]*{_SOFT_BREAK}[ {_SOFT_BREAK}]*", _SOFT_BREAK, "".join(self._description))
+        text = re.sub(f"{_SOFT_BREAK}(?=\n)|(?<=\n){_SOFT_BREAK}", "", text).replace(_SOFT_BREAK, "\n")
+        lines = (" ".join(line.split()) for line in text.split("\n"))
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+    def _text(self, name) -> str:
+        return " ".join("".join(self._fields[name][2]).split())
+
+    @property
+    def company_name(self) -> str:
+        return self._text("company_name")
+
+    @property
+    def job_title(self) -> str:
+        return self._text("job_title")
+
+
+def parse_job_page(html: str) -> JobPage:
+    """Return the JobPage parsed from a job page's HTML, or raise JobPageParseError."""
+    parser = JobPageParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.found_description or not parser.job_description:
+        raise JobPageParseError(f"no .{DESCRIPTION_CLASS} element in the page")
+    return JobPage(parser.job_description, parser.company_name or "Unknown Company", parser.job_title)
+
+
+class HttpJobFetcher:
+    """Fetches job pages over plain HTTP with a pooled, keep-alive requests session."""
+
+    def __init__(self, timeout=10.0, pool_size=10, session: requests.Session = None):
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+
+    def fetch_html(self, url: str) -> str:
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = "utf-8"  # requests would assume ISO-8859-1 for text/html
+        return response.text
+
+    def fetch(self, url: str) -> JobPage:
+        """Fetch and parse a job page; raises requests or JobPageParseError exceptions."""
+        logger.info(f"Fetching job page over HTTP: {url}")
+        page = parse_job_page(self.fetch_html(url))
+        logger.info(f"Job page parsed over HTTP - Company: {page.company_name}, "
+                    f"Length: {len(page.job_description)} characters")
+        return page
+
+    def close(self):
+        self.session.close()
+
+
+_shared_fetcher = None
+_shared_fetcher_lock = threading.Lock()
+
+
+def get_http_fetcher():
+    """Return the process-wide HTTP fetcher, or None when JOB_FETCH_HTTP=false."""
+    global _shared_fetcher
+    if os.environ.get('JOB_FETCH_HTTP', 'true').lower() in ('0', 'false', 'no'):
+        return None
+    with _shared_fetcher_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = HttpJobFetcher(timeout=float(os.environ.get('JOB_FETCH_TIMEOUT', 10)))
+        return _shared_fetcher
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+import logging
+from sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = DEFAULT_CACHE_DIR.parent / "job_queue.sqlite3"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue(SQLiteStore):
+    """
+    Persistent FIFO queue of resume generation jobs.
+
+    Jobs are claimed inside a write transaction, so several worker threads and server
+    processes can share one queue file. A claim records the owning process and a lease
+    that its workers keep renewing; only jobs whose lease ran out (their process stopped
+    or crashed) are put back in the queue. A job whose lease ran out max_attempts times
+    is failed instead, so a job that crashes or hangs its worker is not retried forever.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            params TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            owner TEXT,
+            lease_until REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+    """
+    # Columns added after the first release, for queue files created before them
+    MIGRATIONS = {"owner": "TEXT", "lease_until": "REAL"}
+
+    def __init__(self, db_path=DEFAULT_QUEUE_PATH, lease_seconds=60.0, max_attempts=3):
+        logger.info(f"Initializing JobQueue at {db_path}")
+        super().__init__(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row[1] for row in self._query("PRAGMA table_info(jobs)")}
+        missing = {column: column_type for column, column_type in self.MIGRATIONS.items() if column not in columns}
+        if not missing:
+            return
+        with self._transaction() as conn:
+            for column, column_type in missing.items():
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def submit(self, params: dict) -> str:
+        job_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute("INSERT INTO jobs (id, status, params, created_at) VALUES (?, ?, ?, ?)",
+                         (job_id, QUEUED, json.dumps(params), time.time()))
+        logger.info(f"Job {job_id} queued")
+        return job_id
+
+    def claim(self, owner: str = None):
+        """Mark the oldest queued job as running under a fresh lease and return (job_id, params), or None."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT id, params FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                               (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, owner = ?, "
+                         "lease_until = ? WHERE id = ?",
+                         (RUNNING, now, owner or process_owner(), now + self.lease_seconds, row[0]))
+        return row[0], json.loads(row[1])
+
+    def renew(self, job_ids, owner: str = None) -> int:
+        """Extend the leases of jobs this owner is still running."""
+        if not job_ids:
+            return 0
+        placeholders = ", ".join("?" * len(job_ids))
+        with self._transaction() as conn:
+            return conn.execute(f"UPDATE jobs SET lease_until = ? WHERE status = ? AND owner = ? "
+                                f"AND id IN ({placeholders})",
+                                (time.time() + self.lease_seconds, RUNNING, owner or process_owner(),
+                                 *job_ids)).rowcount
+
+    def complete(self, job_id: str, result: dict):
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET status = ?, result = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                         (DONE, json.dumps(result), time.time(), job_id))
+
+    def fail(self, job_id: str, error: str):
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                         (FAILED, error, time.time(), job_id))
+
+    def requeue_stale(self) -> int:
+        """Put running jobs whose lease expired back in the queue; jobs of live workers are left alone.
+        Jobs that already used max_attempts are failed. Returns the number of re-queued jobs."""
+        now = time.time()
+        stale = "status = ? AND (lease_until IS NULL OR lease_until < ?)"
+        with self._transaction() as conn:
+            failed = conn.execute(f"UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+                                  f"WHERE {stale} AND attempts >= ?",
+                                  (FAILED, f"Job was interrupted {self.max_attempts} times (worker crashed or hung)",
+                                   now, RUNNING, now, self.max_attempts)).rowcount
+            count = conn.execute(f"UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_until = NULL "
+                                 f"WHERE {stale}", (QUEUED, RUNNING, now)).rowcount
+        if failed:
+            logger.warning(f"Failed {failed} jobs that were interrupted {self.max_attempts} times")
+        if count:
+            logger.info(f"Re-queued {count} interrupted jobs")
+        return count
+
+    def get(self, job_id: str):
+        """Return the job as a dict, or None if unknown."""
+        rows = self._query("SELECT id, status, result, error, attempts, created_at, started_at, finished_at, owner "
+                           "FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job_id, status, result, error, attempts, created_at, started_at, finished_at, owner = rows[0]
+        return {
+            "job_id": job_id,
+            "status": status,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "attempts": attempts,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "owner": owner,
+        }
+
+    def counts(self) -> dict:
+        return dict(self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+
+def process_owner() -> str:
+    """Identifies the claiming process in the queue: host and pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkerPool:
+    """
+    Bounded pool of worker threads running queued jobs through a handler(params) -> result dict.
+
+    A heartbeat thread renews the leases of the jobs being run and re-queues jobs whose
+    lease expired, so jobs of a stopped or crashed process resume on a live one.
+    """
+
+    def __init__(self, queue: JobQueue, handler, workers=2, poll_interval=1.0, heartbeat_interval=None):
+        self.queue = queue
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or queue.lease_seconds / 3
+        self.owner = process_owner()
+        self.pid = os.getpid()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._running = set()
+        self._running_lock = threading.Lock()
+
+    def start(self):
+        if self._threads:
+            return
+        self.queue.requeue_stale()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"JobWorker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="JobHeartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"Started {self.workers} job workers as {self.owner}")
+
+    def _heartbeat(self):
+        while not self._stopping.wait(self.heartbeat_interval):
+            with self._running_lock:
+                running = list(self._running)
+            try:
+                self.queue.renew(running, self.owner)
+                if self.queue.requeue_stale():
+                    self.notify()
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}")
+
+    def notify(self):
+        """Wake idle workers after a submit instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                claimed = self.queue.claim(self.owner)
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}")
+                claimed = None
+            if claimed is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            job_id, params = claimed
+            logger.info(f"[{job_id}] Job started on {threading.current_thread().name}")
+            with self._running_lock:
+                self._running.add(job_id)
+            try:
+                result = self.handler(params)
+            except Exception as e:
+                logger.error(f"[{job_id}] Job failed: {e}")
+                self.queue.fail(job_id, str(e))
+            else:
+                self.queue.complete(job_id, result)
+                logger.info(f"[{job_id}] Job completed")
+            finally:
+                with self._running_lock:
+                    self._running.discard(job_id)
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+_shared_queue = None
+_shared_queue_pid = None
+_shared_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Return the process-wide job queue, creating it on first use (again after a fork)."""
+    global _shared_queue, _shared_queue_pid
+    with _shared_queue_lock:
+        if _shared_queue is None or _shared_queue_pid != os.getpid():
+            _shared_queue_pid = os.getpid()
+            _shared_queue = JobQueue(db_path=os.environ.get('JOB_QUEUE_PATH', DEFAULT_QUEUE_PATH),
+                                     lease_seconds=float(os.environ.get('JOB_LEASE_SECONDS', 60)),
+                                     max_attempts=int(os.environ.get('JOB_MAX_ATTEMPTS', 3)))
+        return _shared_queue
@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+class JobSkillsStore(SQLiteStore):
+    """
+    Disk-backed store of skills extracted from job descriptions.
+
+    Entries are keyed by the hash of the normalized job description text and the model
+    that extracted them (including its parameters and prompt version), and indexed by
+    job id and company for lookups and housekeeping.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS job_skills (
+            content_hash TEXT NOT NULL,
+            model TEXT NOT NULL,
+            job_id TEXT,
+            company_name TEXT,
+            skills TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (content_hash, model)
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_skills_job_id ON job_skills (job_id);
+        CREATE INDEX IF NOT EXISTS idx_job_skills_company ON job_skills (company_name);
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_DIR / "job_skills.sqlite3"):
+        logger.info(f"Initializing JobSkillsStore at {db_path}")
+        super().__init__(db_path)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(job_description_text: str) -> str:
+        """Hash of the job description after the analyzer's whitespace collapsing."""
+        return hashlib.sha256(job_description_text.encode("utf-8")).hexdigest()
+
+    def get(self, job_description_text: str, model: str):
+        """Return the stored extraction (parsed JSON) or None."""
+        rows = self._query("SELECT skills FROM job_skills WHERE content_hash = ? AND model = ?",
+                           (self.make_key(job_description_text), model))
+        if not rows:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(rows[0][0])
+
+    def put(self, job_description_text: str, model: str, skills: dict, job_id=None, company_name=None):
+        """Store an extraction; job_id and company_name are kept when a later put omits them."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO job_skills (content_hash, model, job_id, company_name, skills, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (content_hash, model) DO UPDATE SET skills = excluded.skills, "
+                "job_id = COALESCE(excluded.job_id, job_id), "
+                "company_name = COALESCE(excluded.company_name, company_name), "
+                "created_at = excluded.created_at",
+                (self.make_key(job_description_text), model, job_id, company_name,
+                 json.dumps(skills), time.time()))
+
+    def find_by_job_id(self, job_id):
+        """Return the stored extractions for a job id, newest first."""
+        rows = self._query("SELECT skills FROM job_skills WHERE job_id = ? ORDER BY created_at DESC", (job_id,))
+        return [json.loads(skills) for skills, in rows]
+
+    def find_by_company(self, company_name):
+        """Return (job_id, extraction) pairs for a company, newest first."""
+        rows = self._query("SELECT job_id, skills FROM job_skills WHERE company_name = ? ORDER BY created_at DESC",
+                           (company_name,))
+        return [(job_id, json.loads(skills)) for job_id, skills in rows]
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM job_skills")[0][0]
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_job_skills_store():
+    """Return the process-wide job skills store, or None when JOB_SKILLS_STORE_PATH=none."""
+    global _shared_store
+    path = os.environ.get('JOB_SKILLS_STORE_PATH', DEFAULT_CACHE_DIR / "job_skills.sqlite3")
+    if str(path).lower() == 'none':
+        return None
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = JobSkillsStore(db_path=path)
+        return _shared_store
@@ -0,0 +1,131 @@
+import os
+import time
+import hashlib
+import threading
+import logging
+from job_data import JobData
+from sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_STORE_PATH = DEFAULT_CACHE_DIR.parent / "jobs.sqlite3"
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+class JobStore(SQLiteStore):
+    """
+    Local store of fetched job postings (JobData records).
+
+    Postings are keyed by job id and indexed by company and content hash. Entries older
+    than the TTL are treated as missing so the posting is fetched again. Every write is a
+    single upsert in its own transaction, so several server workers can share the file.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            job_title TEXT,
+            company_name TEXT,
+            job_description TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            source_url TEXT,
+            fetched_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company_name);
+        CREATE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs (content_hash);
+        CREATE INDEX IF NOT EXISTS idx_jobs_fetched_at ON jobs (fetched_at);
+    """
+
+    def __init__(self, db_path=DEFAULT_JOB_STORE_PATH, ttl=DEFAULT_TTL):
+        logger.info(f"Initializing JobStore at {db_path} (ttl: {ttl}s)")
+        super().__init__(db_path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(job_description: str) -> str:
+        return hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+
+    def _is_fresh(self, fetched_at, max_age):
+        max_age = self.ttl if max_age is None else max_age
+        return not max_age or time.time() - fetched_at <= max_age
+
+    @staticmethod
+    def _job_data(row) -> JobData:
+        job_id, job_title, company_name, job_description = row
+        return JobData(job_id, job_title, job_description, company_name)
+
+    def get(self, job_id, max_age=None):
+        """Return the stored JobData, or None if unknown or older than max_age (default: the TTL)."""
+        rows = self._query("SELECT job_id, job_title, company_name, job_description, fetched_at "
+                           "FROM jobs WHERE job_id = ?", (str(job_id),))
+        if not rows or not self._is_fresh(rows[0][4], max_age):
+            if rows:
+                logger.info(f"Stored job {job_id} is older than the TTL - refreshing")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._job_data(rows[0][:4])
+
+    def put(self, job_data: JobData, source_url=None, fetched_at=None):
+        """Insert or replace a posting; a title or URL missing from a later put is kept."""
+        job_id, job_title, job_description, company_name = job_data.get_job_data()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, job_title, company_name, job_description, content_hash, source_url, "
+                "fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET job_title = COALESCE(excluded.job_title, job_title), "
+                "company_name = excluded.company_name, job_description = excluded.job_description, "
+                "content_hash = excluded.content_hash, source_url = COALESCE(excluded.source_url, source_url), "
+                "fetched_at = excluded.fetched_at",
+                (str(job_id), job_title or None, company_name, job_description, self.make_key(job_description),
+                 source_url, fetched_at or time.time()))
+
+    def find_by_company(self, company_name):
+        """Return the company's postings, newest first."""
+        rows = self._query("SELECT job_id, job_title, company_name, job_description FROM jobs "
+                           "WHERE company_name = ? ORDER BY fetched_at DESC", (company_name,))
+        return [self._job_data(row) for row in rows]
+
+    def find_by_content(self, job_description: str):
+        """Return postings with exactly this description (e.g. the same job posted twice)."""
+        rows = self._query("SELECT job_id, job_title, company_name, job_description FROM jobs "
+                           "WHERE content_hash = ? ORDER BY fetched_at DESC", (self.make_key(job_description),))
+        return [self._job_data(row) for row in rows]
+
+    def purge_expired(self, max_age=None) -> int:
+        """Delete postings older than max_age (default: the TTL); returns the number deleted."""
+        max_age = self.ttl if max_age is None else max_age
+        if not max_age:
+            return 0
+        with self._transaction() as conn:
+            count = conn.execute("DELETE FROM jobs WHERE fetched_at < ?", (time.time() - max_age,)).rowcount
+        if count:
+            logger.info(f"Purged {count} expired job postings")
+        return count
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM jobs")[0][0]
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def get_job_store():
+    """Return the process-wide job store, or None when JOB_STORE_PATH=none."""
+    global _shared_store
+    path = os.environ.get('JOB_STORE_PATH', DEFAULT_JOB_STORE_PATH)
+    if str(path).lower() == 'none':
+        return None
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = JobStore(db_path=path,
+                                     ttl=float(os.environ.get('JOB_STORE_TTL_HOURS', DEFAULT_TTL / 3600)) * 3600)
+        return _shared_store
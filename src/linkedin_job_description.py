@@ -1,22 +1,67 @@
-import os
-import asyncio
-from pyppeteer import launch
 import logging
+import requests
+from scraper_session import ScraperSession, get_scraper_session
+from job_page_fetcher import HttpJobFetcher, JobPageParseError, get_http_fetcher
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
 class LinkedinJobDescription:
-    def __init__(self, job_description_url):
+    def __init__(self, job_description_url, session: ScraperSession = None, http_fetcher: HttpJobFetcher = None):
         logger.info(f"Initializing LinkedinJobDescription with URL: {job_description_url}")
         self.job_description_url = job_description_url
         self.job_description = None
         self.company_name = None
+        self.job_title = None
+        # Shared browser and page, reused across postings; both are looked up on first fetch,
+        # so postings answered from the job store never touch them
+        self._session = session
+        # The public job page is server-rendered, so plain HTTP usually suffices
+        self._http_fetcher = http_fetcher
+        self._http_fetcher_set = http_fetcher is not None
+
+    @property
+    def session(self) -> ScraperSession:
+        if self._session is None:
+            self._session = get_scraper_session()
+        return self._session
+
+    @session.setter
+    def session(self, session: ScraperSession):
+        self._session = session
+
+    @property
+    def http_fetcher(self):
+        """The HTTP fetcher, or None when JOB_FETCH_HTTP disables it."""
+        if not self._http_fetcher_set:
+            self._http_fetcher = get_http_fetcher()
+            self._http_fetcher_set = True
+        return self._http_fetcher
+
+    @http_fetcher.setter
+    def http_fetcher(self, http_fetcher: HttpJobFetcher):
+        self._http_fetcher = http_fetcher
+        self._http_fetcher_set = True
+
+    def get_job_description_via_http(self):
+        """Fetch and parse the posting without a browser; returns None if that is not possible."""
+        if self.http_fetcher is None:
+            return None
+        try:
+            page = self.http_fetcher.fetch(self.job_description_url)
+            self.job_description, self.company_name, self.job_title = page
+            return self.job_description, self.company_name
+        except (requests.RequestException, JobPageParseError) as e:
+            logger.warning(f"HTTP fetch failed, falling back to the browser: {e}")
+            return None
 
     def get_job_description(self):
         logger.info("Starting synchronous job description extraction")
+        result = self.get_job_description_via_http()
+        if result is not None:
+            return result
         try:
-            result = asyncio.run(self.get_job_description_via_pyppeteer())
+            result = self.session.run(self.get_job_description_via_pyppeteer())
             logger.info("Synchronous job description extraction completed successfully")
             return result
         except Exception as e:
@@ -24,62 +69,39 @@ class LinkedinJobDescription:
             raise
 
     async def get_job_description_via_pyppeteer(self):
+        """Scrape the posting on the session's page. Safe to await from any event loop."""
+        return await self.session.run_async(self._scrape())
+
+    async def _scrape(self):
         logger.info(f"Starting async job description extraction from: {self.job_description_url}")
-        browser = None
-        
         try:
-            # Browser configuration
-            headless = os.getenv('CONTAINER', 'false').lower() == 'true'
-            args = ['--no-sandbox', '--disable-setuid-sandbox']
-
-            if headless:
-                args.append('--headless')
-                executable_path = '/usr/bin/chromium'
-                logger.debug("Running in container mode with Chromium")
-            else:
-                executable_path = None
-                logger.debug("Running in local mode with default browser")
-
-            logger.info(f'Launching browser... Headless: {headless}')
-            browser = await launch(headless=headless, args=args, executablePath=executable_path)
-            logger.debug("Browser launched successfully")
-
-            page = await browser.newPage()
-            logger.debug("New browser page created")
-
-            logger.info(f'Navigating to job description URL: {self.job_description_url}')
-            await page.goto(self.job_description_url, {'waitUntil': 'domcontentloaded'})
-            logger.debug('Page loaded successfully')
-
-            # Close modal popup if exists
-            try:
-                logger.debug("Checking for modal popup")
-                await page.waitForSelector('.modal__dismiss', timeout=5000)
-                await page.click('.modal__dismiss')
-                logger.info('Modal popup closed successfully')
-            except Exception:
-                logger.debug('No modal dismiss button found or timeout reached')
-
-            # Extract company name
-            logger.debug("Extracting company name")
-            self.company_name = await self._get_company_name(page)
-            logger.info(f'Company name extracted: {self.company_name}')
-            
-            # Expand full job description if "Show More" button exists
-            try:
-                logger.debug("Looking for 'Show More' button")
-                await page.waitForSelector('.show-more-less-html__button--more', timeout=5000)
-                await page.click('.show-more-less-html__button--more')
-                logger.info('Job description expanded successfully')
-            except Exception:
-                logger.debug('No "Show More" button found or timeout reached')
-
-            # Extract job description
-            logger.debug("Extracting job description content")
-            job_description = await page.evaluate('''() => {
-                let desc = document.querySelector('.show-more-less-html__markup');
-                return desc ? desc.innerText.trim() : null;
-            }''')
+            async with self.session.page() as page:
+                logger.info(f'Navigating to job description URL: {self.job_description_url}')
+                await page.goto(self.job_description_url, {'waitUntil': 'domcontentloaded'})
+                logger.debug('Page loaded successfully')
+
+                # Without scripts there is no modal and the full description is already in the markup
+                if self.session.scripts_enabled:
+                    await self._dismiss_modal(page)
+
+                # Extract company name
+                logger.debug("Extracting company name")
+                self.company_name = await self._get_company_name(page)
+                logger.info(f'Company name extracted: {self.company_name}')
+                self.job_title = await page.evaluate('''() => {
+                    let title = document.querySelector('.top-card-layout__title');
+                    return title ? title.textContent.trim() : null;
+                }''')
+
+                if self.session.scripts_enabled:
+                    await self._expand_description(page)
+
+                # Extract job description
+                logger.debug("Extracting job description content")
+                job_description = await page.evaluate('''() => {
+                    let desc = document.querySelector('.show-more-less-html__markup');
+                    return desc ? desc.innerText.trim() : null;
+                }''')
 
             if job_description:
                 self.job_description = job_description
@@ -93,24 +115,29 @@ class LinkedinJobDescription:
             self.job_description = 'Error fetching job description.'
             self.company_name = 'Error fetching company name'
 
-        finally:
-            if browser:
-                logger.debug("Closing browser and cleaning up processes")
-                try:
-                    await browser.close()
-                    logger.debug("Browser closed successfully")
-                except Exception as e:
-                    logger.warning(f"Error while closing browser: {e}")
-
-                # Manually kill Chrome processes if necessary
-                logger.debug("Killing any remaining browser processes")
-                os.system("pkill -f chromium")
-                os.system("pkill -f chrome")
-                logger.debug("Browser cleanup completed")
-
         logger.info(f"Job description extraction completed - Company: {self.company_name}, Content: {len(str(self.job_description))} characters")
         return self.job_description, self.company_name
 
+    async def _dismiss_modal(self, page):
+        """Close the sign-in modal popup if it appears."""
+        try:
+            logger.debug("Checking for modal popup")
+            await page.waitForSelector('.modal__dismiss', timeout=5000)
+            await page.click('.modal__dismiss')
+            logger.info('Modal popup closed successfully')
+        except Exception:
+            logger.debug('No modal dismiss button found or timeout reached')
+
+    async def _expand_description(self, page):
+        """Expand the full job description if a "Show More" button exists."""
+        try:
+            logger.debug("Looking for 'Show More' button")
+            await page.waitForSelector('.show-more-less-html__button--more', timeout=5000)
+            await page.click('.show-more-less-html__button--more')
+            logger.info('Job description expanded successfully')
+        except Exception:
+            logger.debug('No "Show More" button found or timeout reached')
+
     async def _get_company_name(self, page) -> str | None:
         """Extracts the company name from a LinkedIn job posting."""
         logger.debug("Starting company name extraction")
@@ -118,7 +145,7 @@ class LinkedinJobDescription:
         try:
             # Wait for the company name element to load
             logger.debug("Waiting for company name element")
-            await page.waitForSelector("span.topcard__flavor a.topcard__org-name-link")
+            await page.waitForSelector("span.topcard__flavor a.topcard__org-name-link", timeout=10000)
 
             # Extract the text content of the company name
             company_name = await page.evaluate('''
@@ -0,0 +1,220 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import sqlite3
+import logging
+from collections import OrderedDict
+from sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize indentation and blank lines so cosmetic prompt changes share a cache entry."""
+    lines = [line.strip() for line in prompt.strip().splitlines()]
+    return re.sub(r'\n{3,}', '\n\n', "\n".join(lines))
+
+
+class InMemoryLRUBackend:
+    """Process-local LRU cache with optional TTL."""
+
+    def __init__(self, max_entries=1000, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskBackend(SQLiteStore):
+    """
+    SQLite-backed cache shared across processes, with TTL and LRU size eviction.
+
+    Lookups are plain reads. Their last_used updates are batched and written with the next
+    set(), or once touch_batch of them piled up if the write lock is free right away.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used);
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_DIR / "llm_cache.sqlite3", max_entries=1000, ttl=None, touch_batch=32):
+        super().__init__(db_path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.touch_batch = touch_batch
+        self._touched = {}
+        self._touched_lock = threading.Lock()
+
+    def get(self, key):
+        rows = self._query("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,))
+        if not rows:
+            return None
+        response, created_at = rows[0]
+        now = time.time()
+        if self.ttl is not None and now - created_at > self.ttl:
+            # Expired rows are deleted by the next set()
+            return None
+        with self._touched_lock:
+            self._touched[key] = now
+            flush = len(self._touched) >= self.touch_batch
+        if flush:
+            self._try_flush_touches()
+        return response
+
+    def _take_touches(self):
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+        return touched
+
+    def _write_touches(self, conn, touched):
+        conn.executemany("UPDATE llm_responses SET last_used = MAX(last_used, ?) WHERE key = ?",
+                         [(used, key) for key, used in touched.items()])
+
+    def _try_flush_touches(self):
+        """Write the batched last_used updates unless another writer holds the lock; never waits."""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            touched = self._take_touches()
+            self._conn.execute("PRAGMA busy_timeout = 0")
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                # Locked by another process: keep the updates for the next set()
+                with self._touched_lock:
+                    self._touched = {**touched, **self._touched}
+                return
+            finally:
+                self._conn.execute(f"PRAGMA busy_timeout = {int(self.BUSY_TIMEOUT * 1000)}")
+            try:
+                self._write_touches(self._conn, touched)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.debug(f"Dropped {len(touched)} LLM cache last_used updates: {e}")
+        finally:
+            self._lock.release()
+
+    def set(self, key, value):
+        now = time.time()
+        with self._transaction() as conn:
+            # Pending lookups count for the LRU order before anything is evicted
+            self._write_touches(conn, self._take_touches())
+            conn.execute(
+                "INSERT INTO llm_responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET response = excluded.response, "
+                "created_at = excluded.created_at, last_used = excluded.last_used",
+                (key, value, now, now))
+            if self.ttl is not None:
+                conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl,))
+            count = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute("DELETE FROM llm_responses WHERE key IN "
+                             "(SELECT key FROM llm_responses ORDER BY last_used LIMIT ?)",
+                             (count - self.max_entries,))
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM llm_responses")[0][0]
+
+
+class LLMCache:
+    """Content-addressed cache of LLM responses on top of a pluggable backend."""
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else InMemoryLRUBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, params: dict, prompt: str) -> str:
+        """Hash of the model name, the generation parameters and the normalized prompt."""
+        payload = json.dumps({
+            "model": model_name,
+            "params": params,
+            "prompt": normalize_prompt(prompt),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key, validate=None):
+        """Return the cached value, or None. A value that fails validate(value) is a miss."""
+        value = self.backend.get(key)
+        if value is not None and validate is not None:
+            try:
+                validate(value)
+            except Exception as e:
+                logger.warning(f"Discarding cached response that fails validation: {e}")
+                value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.backend)}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Return the process-wide LLM cache configured from the environment, or None when disabled.
+
+    LLM_CACHE_BACKEND: disk (default), memory or none
+    LLM_CACHE_TTL: entry lifetime in seconds (default 7 days)
+    LLM_CACHE_SIZE: maximum number of entries (default 1000)
+    """
+    global _shared_cache
+    backend_name = os.environ.get('LLM_CACHE_BACKEND', 'disk').lower()
+    if backend_name == 'none':
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            ttl = float(os.environ.get('LLM_CACHE_TTL', 7 * 24 * 3600))
+            max_entries = int(os.environ.get('LLM_CACHE_SIZE', 1000))
+            if backend_name == 'memory':
+                backend = InMemoryLRUBackend(max_entries=max_entries, ttl=ttl)
+            else:
+                backend = DiskBackend(max_entries=max_entries, ttl=ttl)
+            logger.info(f"LLM response cache enabled - backend: {backend_name}, ttl: {ttl}s, size: {max_entries}")
+            _shared_cache = LLMCache(backend)
+        return _shared_cache
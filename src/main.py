@@ -1,14 +1,18 @@
+import os
+import sys
 import argparse
 import logging
 from pathlib import Path
-from resume_parser import ResumeParser
-from resume_generator import ResumeGenerator
-from resume_enhancer import ResumeEnhancer 
+from resume_pipeline import ResumePipeline
+from browser_pool import get_browser_pool, shutdown_browser_pool
+from scraper_session import shutdown_scraper_session
+from translator_client import shutdown_translator_client
+from event_loop_service import shutdown_event_loop_service
 from job_description_interface import JobDescriptionInterface
-from resume_analyzer import ResumeAnalyzer
+from model_registry import get_default_model
 from job_description_file import JobDescriptionFile
+from batch_runner import BatchRunner, open_jobs_input, open_results_output
 import yaml
-from langdetect import detect
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -31,7 +35,11 @@ def parse_arguments():
     parser.add_argument('--output', type=str, default='output/', help='Output directory for generated files')
     parser.add_argument('--job_description_url', type=str, default=None, help='Job description Url')
     parser.add_argument('--language', type=str, default='auto', help='Language for the resume ')
+    parser.add_argument('--languages', type=str, default=None, help='Comma-separated languages rendered in one pass, e.g. en,de,fr')
     parser.add_argument('--job_description_file', type=str, default=None, help='Path to the job description file')
+    parser.add_argument('--jobs-jsonl', type=str, default=None, help='JSONL file of jobs (job_id, job_title, job_description, company_name), - for stdin')
+    parser.add_argument('--results-jsonl', type=str, default=None, help='JSONL file for per-job results, - for stdout (default: <output>/batch_results.jsonl)')
+    parser.add_argument('--concurrency', type=int, default=int(os.environ.get('BATCH_CONCURRENCY', 2)), help='Jobs processed concurrently in batch mode')
     args = parser.parse_args()
     
     logger.info(f"Arguments parsed:")
@@ -40,9 +48,34 @@ def parse_arguments():
     logger.info(f"  - Job URL: {args.job_description_url}")
     logger.info(f"  - Job File: {args.job_description_file}")
     logger.info(f"  - Language: {args.language}")
+    if args.languages:
+        logger.info(f"  - Languages: {args.languages}")
+    if args.jobs_jsonl:
+        logger.info(f"  - Jobs JSONL: {args.jobs_jsonl} (concurrency: {args.concurrency})")
     
     return args
 
+def run_batch(args, resume_path, output_dir, example_dir):
+    """Process every job of the JSONL input in this process, writing one result line per job."""
+    results_path = args.results_jsonl or output_dir / 'batch_results.jsonl'
+    logger.info(f"Batch mode - jobs: {args.jobs_jsonl}, results: {results_path}")
+    
+    pipeline = ResumePipeline(output_dir, example_dir, model=get_default_model(), browser_pool=get_browser_pool())
+    runner = BatchRunner(pipeline, resume_path, concurrency=args.concurrency, language=args.language)
+    
+    jobs = open_jobs_input(args.jobs_jsonl)
+    results = open_results_output(results_path)
+    try:
+        summary = runner.run(jobs, results)
+    finally:
+        if jobs is not sys.stdin:
+            jobs.close()
+        if results is not sys.stdout:
+            results.close()
+    
+    logger.info(f"Batch completed: {summary['ok']} succeeded, {summary['error']} failed in {summary['duration_s']}s")
+    return summary
+
 def main():
     try:
         logger.info('Starting AI Resume Creator...')
@@ -69,6 +102,12 @@ def main():
         
         logger.info(f"Using resume file: {resume_path}")
         
+        example_dir = Path(__file__).parent.parent / "example"
+        
+        if args.jobs_jsonl:
+            run_batch(args, resume_path, output_dir, example_dir)
+            return
+        
         # Load secrets (commented out but keeping structure)
         secrets_path = Path('input/secrets.yaml')
         if secrets_path.exists():
@@ -78,15 +117,10 @@ def main():
         else:
             logger.warning(f"Secrets file not found: {secrets_path}")
         
-        # Load resume
-        logger.info("Loading and parsing resume")
-        resume_parser = ResumeParser(resume_path)
-        resume_lang = args.language 
-        logger.info(f"Resume loaded successfully, language set to: {resume_lang}")
-        
         # Process job description if provided
         job_description = None
         company_name = "Unknown Company"
+        job_id = None
         
         if args.job_description_url or args.job_description_file:
             logger.info("Job description provided - starting enhancement process")
@@ -96,51 +130,49 @@ def main():
                 job_description, company_name = JobDescriptionFile(args.job_description_file).get_job_description_from_file()
             else:   
                 logger.info(f"Fetching job description from URL: {args.job_description_url}")
-                job_description, company_name = JobDescriptionInterface(args.job_description_url).get_job_description(load_from_file=True, save_to_file=True)
+                job_interface = JobDescriptionInterface(args.job_description_url)
+                job_description, company_name = job_interface.get_job_description(load_from_store=True, save_to_store=True)
+                job_id = job_interface.job_id
             
             logger.info(f"Job description obtained for company: {company_name}")
-            
-            # Analyze resume against job description
-            logger.info("Starting ATS analysis")
-            ra = ResumeAnalyzer(job_description, resume_parser)
-            ats_result = ra.compare()
-            logger.info(f"ATS analysis completed - Score: {ats_result.ats_score}")
-            
-            # Enhance resume
-            logger.info("Starting resume enhancement process")
-            resume_enhancer = ResumeEnhancer(resume_path, company_name, job_title)
-            enhanced_resume_path = resume_enhancer.enhance_resume(ats_result)
-            
-            # Use enhanced resume for generation
-            resume_path = Path(enhanced_resume_path)
-            resume_parser = ResumeParser(resume_path)
-            
-            # Auto-detect language if needed
-            if resume_lang == 'auto':
-                logger.info("Auto-detecting language from job description")
-                resume_lang = detect(job_description)
-                logger.info(f"Language detected: {resume_lang}")
         else:
             logger.info("No job description provided - proceeding with basic resume generation")
         
-        # Generate resume
-        logger.info("Starting resume generation")
-        example_dir = Path(__file__).parent.parent / "example"
+        # Analysis, enhancement, translation and rendering run on one event loop
         logger.debug(f"Using template directory: {example_dir}")
         
-        resume_generator = ResumeGenerator(resume_path, output_dir, example_dir, resume_lang)
-        
-        logger.info("Generating HTML resume")
-        resume_html = resume_generator.generate_html(resume_parser.data)
+        pipeline = ResumePipeline(output_dir, example_dir, model=get_default_model(), browser_pool=get_browser_pool())
+        if args.languages:
+            languages = [language.strip() for language in args.languages.split(',') if language.strip()]
+            results = pipeline.run_languages(
+                resume_path,
+                languages,
+                job_description=job_description,
+                company_name=company_name,
+                job_id=job_id
+            )
+            for language, result in results.items():
+                logger.info(f'Resume generated successfully! {language} PDF saved at: {result.pdf_path}')
+            return
         
-        logger.info("Converting HTML to PDF")
-        pdf_path = resume_generator.html_to_pdf(resume_html)
+        result = pipeline.run(
+            resume_path,
+            job_description=job_description,
+            company_name=company_name,
+            language=args.language,
+            job_id=job_id
+        )
         
-        logger.info(f'Resume generated successfully! PDF saved at: {pdf_path}')
+        logger.info(f'Resume generated successfully! PDF saved at: {result.pdf_path}')
         
     except Exception as e:
         logger.error(f'An error occurred during resume generation: {e}', exc_info=True)
         raise
+    finally:
+        shutdown_scraper_session()
+        shutdown_browser_pool()
+        shutdown_translator_client()
+        shutdown_event_loop_service()
 
 
 if __name__ == '__main__':
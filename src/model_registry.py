@@ -0,0 +1,92 @@
+import os
+import json
+import threading
+import logging
+import httpx
+from ai_interface import AIInterface
+from llm_cache import get_llm_cache
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Model used by the analyzer and the enhancer unless a client is injected
+DEFAULT_MODEL = {
+    "model_provider": "ollama",
+    "model_name": os.environ.get('OLLAMA_MODEL', "qwen2.5:3b"),
+    "temperature": 0,
+    "format": "json",
+}
+
+
+def pooled_http_client_kwargs():
+    """httpx settings for a keep-alive connection pool shared by all calls to one model."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', 16)),
+            max_keepalive_connections=int(os.environ.get('LLM_HTTP_MAX_KEEPALIVE', 8)),
+            keepalive_expiry=60.0,
+        ),
+        "timeout": httpx.Timeout(float(os.environ.get('LLM_HTTP_TIMEOUT', 300)), connect=10.0),
+    }
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of shared AIInterface clients keyed by (provider, model, params).
+
+    Each client owns one pooled HTTP transport, so keep-alive connections survive
+    across requests. AIInterface holds no per-call state and is safe to share between threads.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_deterministic(params) -> bool:
+        """Only temperature=0 models give repeatable answers; a missing temperature means the model's default."""
+        temperature = params.get("temperature")
+        return temperature is not None and float(temperature) == 0
+
+    @staticmethod
+    def _key(model_provider, model_name, params):
+        return (model_provider.lower(), model_name, json.dumps(params, sort_keys=True, default=str))
+
+    def get(self, model_provider: str, model_name: str, **params) -> AIInterface:
+        """Return the shared client for this model configuration, creating it on first use."""
+        key = self._key(model_provider, model_name, params)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                logger.info(f"Creating shared model client: {model_provider}/{model_name} {params}")
+                # Caching a sampling model would freeze its first answer
+                cache = get_llm_cache() if self._is_deterministic(params) else None
+                model = AIInterface(
+                    model_provider=model_provider,
+                    model_name=model_name,
+                    cache=cache,
+                    client_kwargs=pooled_http_client_kwargs(),
+                    **params
+                )
+                self._models[key] = model
+            return model
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self):
+        return len(self._models)
+
+
+registry = ModelRegistry()
+
+
+def get_model(model_provider: str, model_name: str, **params) -> AIInterface:
+    """Return a shared client from the process-wide registry."""
+    return registry.get(model_provider, model_name, **params)
+
+
+def get_default_model() -> AIInterface:
+    """Return the shared client for DEFAULT_MODEL."""
+    return get_model(**DEFAULT_MODEL)
@@ -0,0 +1,208 @@
+import os
+import math
+import threading
+import logging
+from typing import NamedTuple, Union
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# Prompt token budget per LLM stage (override with PROMPT_BUDGET_<STAGE>)
+STAGE_BUDGETS = {
+    "job_skills": 3000,
+    "ats_compare": 3000,
+    "ats_suggestions": 2000,
+    "summary": 1500,
+}
+# Tokens kept free for the model's answer
+OUTPUT_RESERVE = {
+    "job_skills": 1024,
+    "ats_compare": 1024,
+    "ats_suggestions": 768,
+    "summary": 512,
+}
+# Ollama reloads a model whenever num_ctx changes, so only a few sizes are used
+CONTEXT_BUCKETS = (2048, 4096, 8192, 16384, 32768, 65536, 131072)
+
+# Rough characters per token when no tokenizer is available; errs towards overcounting
+_CHARS_PER_TOKEN = 3.0
+
+
+class TokenCounter:
+    """
+    Counts tokens with tiktoken. The encoding only approximates the served model's
+    tokenizer, so budgets keep a margin. Without tiktoken or its encoding file
+    (e.g. offline), a conservative character-based estimate is used.
+    """
+
+    def __init__(self, encoding_name=DEFAULT_ENCODING):
+        self.encoding_name = encoding_name
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self):
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                try:
+                    import tiktoken
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                    logger.info(f"Token counting with tiktoken encoding {self.encoding_name}")
+                except Exception as e:
+                    logger.warning(f"tiktoken encoding {self.encoding_name} unavailable ({e}) - estimating tokens")
+            return self._encoding
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens, at a word boundary when estimating."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode(text, disallowed_special=())[:max_tokens])
+        cut = text[:int(max_tokens * _CHARS_PER_TOKEN)]
+        return cut.rsplit(" ", 1)[0] if " " in cut else cut
+
+
+_shared_counter = None
+_shared_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    global _shared_counter
+    with _shared_counter_lock:
+        if _shared_counter is None:
+            _shared_counter = TokenCounter(os.environ.get('TIKTOKEN_ENCODING', DEFAULT_ENCODING))
+        return _shared_counter
+
+
+def stage_budget(stage: str) -> int:
+    return int(os.environ.get(f"PROMPT_BUDGET_{stage.upper()}", STAGE_BUDGETS[stage]))
+
+
+def context_size(prompt_tokens: int, output_tokens: int) -> int:
+    """Smallest context bucket that fits the prompt and the answer."""
+    max_ctx = int(os.environ.get('OLLAMA_MAX_CTX', 32768))
+    min_ctx = int(os.environ.get('OLLAMA_MIN_CTX', 4096))
+    needed = prompt_tokens + output_tokens
+    for bucket in CONTEXT_BUCKETS:
+        if bucket >= min_ctx and bucket >= needed:
+            if bucket > max_ctx:
+                break
+            return bucket
+    logger.warning(f"Prompt needs {needed} tokens of context, more than OLLAMA_MAX_CTX={max_ctx}")
+    return max_ctx
+
+
+# ----------------------------------------------------------------------
+# Compact serialization of resume and job data
+# ----------------------------------------------------------------------
+def _item_text(item: dict) -> str:
+    """'English (Native)' for {'language': 'English', 'proficiency': 'Native'}."""
+    values = [compact(value) for value in item.values() if value not in (None, "")]
+    primary = item.get("name") or item.get("language")
+    if primary:
+        rest = [compact(value) for key, value in item.items() if key not in ("name", "language", "category")
+                and value not in (None, "")]
+        return f"{primary} ({', '.join(rest)})" if rest else str(primary)
+    if not values:
+        return ""
+    return f"{values[0]} ({', '.join(values[1:])})" if len(values) > 1 else values[0]
+
+
+def compact_skills(skills: list) -> str:
+    """One line per category: 'Programming Languages: Python (Expert), Go (Advanced)'."""
+    categories = {}
+    for skill in skills:
+        if isinstance(skill, dict):
+            categories.setdefault(skill.get("category") or "Other", []).append(_item_text(skill))
+        else:
+            categories.setdefault("Other", []).append(str(skill))
+    return "\n".join(f"{category}: {', '.join(names)}" for category, names in categories.items())
+
+
+def compact(value) -> str:
+    """Render YAML/JSON-like data without Python repr noise (quotes, brackets, key names)."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return _item_text(value)
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) and "category" in item for item in value):
+            return compact_skills(value)
+        parts = [compact(item) for item in value]
+        return ", ".join(part for part in dict.fromkeys(parts) if part)
+    return str(value)
+
+
+# ----------------------------------------------------------------------
+# Budgeted prompts
+# ----------------------------------------------------------------------
+class BuiltPrompt(NamedTuple):
+    content: Union[str, list]  # prompt string or chat messages
+    tokens: int
+    num_ctx: int
+
+
+def _flatten(content) -> str:
+    if isinstance(content, str):
+        return content
+    return "\n".join(f"{message.get('role', 'user')}: {message.get('content', '')}" for message in content)
+
+
+class PromptBuilder:
+    """
+    Builds the prompt of one LLM stage within its token budget.
+
+    render(**sections) returns the prompt string or messages. The fixed part of the
+    prompt is always kept; when the variable sections do not fit, the largest ones are
+    truncated first and the cut is logged. num_ctx is sized to the final prompt.
+    """
+
+    def __init__(self, stage: str, budget: int = None, counter: TokenCounter = None):
+        self.stage = stage
+        self.budget = budget or stage_budget(stage)
+        self.output_tokens = OUTPUT_RESERVE.get(stage, 1024)
+        self.counter = counter or get_token_counter()
+
+    def _fit(self, available: int, sections: dict) -> dict:
+        counts = {name: self.counter.count(text) for name, text in sections.items()}
+        if sum(counts.values()) <= available:
+            return sections
+
+        fitted = {}
+        remaining = max(available, 0)
+        ordered = sorted(sections, key=counts.get)
+        for index, name in enumerate(ordered):
+            share = remaining // (len(ordered) - index)
+            if counts[name] <= share:
+                fitted[name] = sections[name]
+                remaining -= counts[name]
+            else:
+                fitted[name] = self.counter.truncate(sections[name], share)
+                remaining -= share
+                logger.warning(f"Prompt stage '{self.stage}': truncated '{name}' from {counts[name]} "
+                               f"to {share} tokens to fit the budget of {self.budget}")
+        return fitted
+
+    def build(self, render, **sections) -> BuiltPrompt:
+        fixed_tokens = self.counter.count(_flatten(render(**{name: "" for name in sections})))
+        fitted = self._fit(self.budget - fixed_tokens, sections)
+        content = render(**fitted)
+        tokens = self.counter.count(_flatten(content))
+        num_ctx = context_size(tokens, self.output_tokens)
+        logger.debug(f"Prompt stage '{self.stage}': {tokens} tokens (budget {self.budget}), num_ctx {num_ctx}")
+        return BuiltPrompt(content, tokens, num_ctx)
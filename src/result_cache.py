@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def file_fingerprint(*paths) -> str:
+    """Hash of the contents of the given files; re-read only when size or mtime change."""
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path).resolve()
+        stat = path.stat()
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        with _fingerprints_lock:
+            cached = _fingerprints.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, hashlib.sha256(path.read_bytes()).hexdigest())
+            with _fingerprints_lock:
+                _fingerprints[path] = cached
+        digest.update(f"{path.name}:{cached[1]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache(SQLiteStore):
+    """
+    Content-addressed cache of generated PDFs.
+
+    The key hashes every input that determines the PDF, so a key doubles as a strong ETag.
+    The total size of the stored PDFs is bounded; least recently used entries are evicted.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            pdf BLOB NOT NULL,
+            metadata TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_used INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used);
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_DIR / "result_cache.sqlite3", max_bytes=200 * 1024 * 1024):
+        logger.info(f"Initializing ResultCache at {db_path} (max size: {max_bytes} bytes)")
+        super().__init__(db_path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(resume_bytes: bytes, job_description, company_name, job_title, language,
+                 template_version: str, model_id: str, job_id=None) -> str:
+        digest = hashlib.sha256(resume_bytes)
+        digest.update(b"\0")
+        digest.update(json.dumps({
+            "job_description": job_description,
+            "company_name": company_name,
+            "job_title": job_title,
+            # The job id is part of the generated file names
+            "job_id": job_id,
+            "language": language,
+            "template": template_version,
+            "model": model_id,
+        }, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return (pdf_bytes, metadata) or None."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT pdf, metadata FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time_ns(), key))
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bytes(row[0]), json.loads(row[1])
+
+    def set(self, key, pdf_bytes: bytes, metadata: dict):
+        if len(pdf_bytes) > self.max_bytes:
+            logger.warning(f"PDF of {len(pdf_bytes)} bytes exceeds the result cache size - not cached")
+            return
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO results (key, pdf, metadata, size, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET pdf = excluded.pdf, metadata = excluded.metadata, "
+                "size = excluded.size, last_used = excluded.last_used",
+                (key, pdf_bytes, json.dumps(metadata), len(pdf_bytes), time.time_ns()))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        evicted = 0
+        while total > self.max_bytes:
+            key, size = conn.execute("SELECT key, size FROM results ORDER BY last_used LIMIT 1").fetchone()
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        if evicted:
+            logger.info(f"Result cache evicted {evicted} least recently used PDFs")
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM results")[0][0]
+
+    @property
+    def size(self):
+        return self._query("SELECT COALESCE(SUM(size), 0) FROM results")[0][0]
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self), "bytes": self.size}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide result cache, or None when RESULT_CACHE_PATH=none."""
+    global _shared_cache
+    path = os.environ.get('RESULT_CACHE_PATH', DEFAULT_CACHE_DIR / "result_cache.sqlite3")
+    if str(path).lower() == 'none':
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache(
+                db_path=path,
+                max_bytes=int(float(os.environ.get('RESULT_CACHE_MAX_MB', 200)) * 1024 * 1024),
+            )
+        return _shared_cache
@@ -1,6 +1,8 @@
+import os
 import openai
 import json 
 import yaml
+import hashlib
 from pathlib import Path
 from pydantic import BaseModel
 from resume_parser import ResumeParser
@@ -8,6 +10,13 @@ from job_description_interface import JobDescriptionInterface
 from resume_parser import ResumeParser
 import re
 from ai_interface import AIInterface
+from model_registry import get_default_model
+from streaming_json import parse_stream, aparse_stream
+from job_skills_store import JobSkillsStore, get_job_skills_store
+from ats_scorer import LocalATSScorer, ATSScore
+from prompt_builder import PromptBuilder, BuiltPrompt, compact_skills
+from job_description_sections import strip_boilerplate as strip_job_boilerplate
+from stage_timing import stage, SKILL_EXTRACTION, COMPARE
 import logging
 
 # Set up logger for this module
@@ -22,20 +31,34 @@ class ATSResult(BaseModel):
 class JobSkills(BaseModel):
     required_skills: list[dict]  # Renaming 'skills' to match the model's response
 
+class ATSSuggestions(BaseModel):
+    suggested_improvements: str
+
+# llm: the model scores the resume; local: deterministic scoring only;
+# hybrid: local score and missing skills, the model only writes the suggestions
+ATS_MODES = ("llm", "local", "hybrid")
+
+
+def _json_model(model):
+    """Validator for AIInterface: the response must be JSON matching the model (checked before caching)."""
+    return lambda response: model(**json.loads(response))
+
+
+def _streamed_model(model):
+    """Validator for streamed responses, parsed the same way as parse_stream parses the chunks."""
+    return lambda response: parse_stream([response], model)
+
 class ResumeAnalyzer:
-    def __init__(self,  job_description:str, resume:ResumeParser):
+    def __init__(self,  job_description:str, resume:ResumeParser, model: AIInterface = None, extract_skills: bool = True,
+                 stream: bool = False, on_partial=None, skills_store: JobSkillsStore = None,
+                 job_id: str = None, company_name: str = None, ats_mode: str = None,
+                 strip_boilerplate: bool = None):
         #openai.api_key = api_key
         logger.info("Initializing ResumeAnalyzer")
         
         try:
-            # Create the AI interface
-            self.model = AIInterface(
-                    model_provider="ollama",
-                    model_name= "qwen2.5:3b", #"llama3.2:latest",              
-                    temperature=0,
-                    #max_tokens=100,
-                    format="json"
-                )
+            # Use the injected client or the shared one from the model registry
+            self.model = model or get_default_model()
             logger.info("AI interface initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize AI interface: {e}")
@@ -44,26 +67,73 @@ class ResumeAnalyzer:
         self.matched_skills = []
         self.missing_skills = []
         self.suggested_improvements = ""
+        # Benefits, company and legal sections are cut before the line structure is collapsed
+        if strip_boilerplate is None:
+            strip_boilerplate = os.environ.get('JOB_DESCRIPTION_STRIP', 'true').lower() not in ('0', 'false', 'no')
+        self.job_description_report = None
+        if strip_boilerplate:
+            self.job_description_report = strip_job_boilerplate(job_description, company_name)
+            job_description = self.job_description_report.text
+            self._log_job_description_report()
         self.job_description_text = re.sub(r'\s+', ' ', job_description).strip()
         self.resume_text = resume.get_required_fields_for_ats()
+        self.resume_data = resume.data
+        self.ats_mode = (ats_mode or os.environ.get('ATS_MODE', 'llm')).lower()
+        if self.ats_mode not in ATS_MODES:
+            raise ValueError(f"Unsupported ATS mode '{self.ats_mode}', expected one of {ATS_MODES}")
+        self.job_required_skills = None
+        # Streaming validates the JSON while it is generated and aborts off-schema output early;
+        # on_partial(field, value) receives each top-level field (e.g. ats_score) as soon as it is complete
+        self.stream = stream
+        self.on_partial = on_partial
+        # Extracted skills are persisted per job description, so re-analysis skips the LLM call
+        self.skills_store = skills_store if skills_store is not None else get_job_skills_store()
+        self.job_id = job_id
+        self.company_name = company_name
         logger.info(f"Job description processed: {len(self.job_description_text)} characters")
         logger.info(f"Resume text extracted: {len(self.resume_text)} characters")
         
-        # Extract job skills
-        try:
-            self.job_required_skills = self.get_job_required_skills()
-            logger.info("Job skills extraction completed successfully")
-        except Exception as e:
-            logger.error(f"Failed to extract job skills: {e}")
-            raise
+        # Extract job skills (async callers pass extract_skills=False and await aget_job_required_skills)
+        if extract_skills:
+            try:
+                self.job_required_skills = self.get_job_required_skills()
+                logger.info("Job skills extraction completed successfully")
+            except Exception as e:
+                logger.error(f"Failed to extract job skills: {e}")
+                raise
 
-    def get_job_required_skills(self):
-        """use AI to extradct required skills from job description"""
-        logger.info("Starting job skills extraction using AI")
-        
-        prompt = f"""
+    @classmethod
+    async def create(cls, job_description: str, resume: ResumeParser, model: AIInterface = None,
+                     stream: bool = False, on_partial=None, skills_store: JobSkillsStore = None,
+                     job_id: str = None, company_name: str = None, ats_mode: str = None,
+                     strip_boilerplate: bool = None) -> "ResumeAnalyzer":
+        """Async constructor: builds the analyzer and awaits the job skills extraction."""
+        analyzer = cls(job_description, resume, model=model, extract_skills=False, stream=stream, on_partial=on_partial,
+                       skills_store=skills_store, job_id=job_id, company_name=company_name, ats_mode=ats_mode,
+                       strip_boilerplate=strip_boilerplate)
+        await analyzer.aget_job_required_skills()
+        return analyzer
+
+    def _log_job_description_report(self):
+        report = self.job_description_report
+        if not report.removed:
+            logger.info("Job description kept as is: no boilerplate sections recognized")
+            return
+        removed = ", ".join(f"{category} {chars}" for category, chars in report.removed.items())
+        logger.info(f"Job description stripped: {report.original_chars} -> {report.kept_chars} characters "
+                    f"({report.cut_ratio:.0%} cut; removed {removed})")
+
+    def _job_skills_prompt(self) -> BuiltPrompt:
+        built = PromptBuilder("job_skills").build(self._render_job_skills_prompt,
+                                                  job_description=self.job_description_text)
+        logger.debug(f"AI prompt prepared for skill extraction: {built.tokens} tokens")
+        return built
+
+    @staticmethod
+    def _render_job_skills_prompt(job_description: str) -> str:
+        return f"""
         extract required skills from job description:
-        {self.job_description_text}
+        {job_description}
         Return **only** a **JSON object** with the following **exact** structure:
         ```json
         {{
@@ -74,35 +144,111 @@ class ResumeAnalyzer:
         }}
         ```
         """
-        
-        logger.debug(f"AI prompt prepared for skill extraction: {len(prompt)} characters")
-        
+
+    def _parse_job_skills(self, response_content: str) -> JobSkills:
+        logger.debug(f"AI response received: {len(response_content)} characters")
         try:
-            response_content = self.model.get_completion(prompt=prompt)
-            logger.debug(f"AI response received: {len(response_content)} characters")
-            
             job_skills = JobSkills(**json.loads(response_content))
-            logger.info(f"Successfully extracted {len(job_skills.required_skills)} required skills")
-            
-            # Log extracted skills for debugging
-            for skill in job_skills.required_skills:
-                logger.debug(f"Extracted skill: {skill.get('name', 'Unknown')} ({skill.get('category', 'Unknown')} - {skill.get('level', 'Unknown')})")
-            
-            return job_skills
-            
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             logger.debug(f"Raw AI response: {response_content}")
             raise
+        return self._accept_job_skills(job_skills)
+
+    def _accept_job_skills(self, job_skills: JobSkills) -> JobSkills:
+        logger.info(f"Successfully extracted {len(job_skills.required_skills)} required skills")
+        
+        # Log extracted skills for debugging
+        for skill in job_skills.required_skills:
+            logger.debug(f"Extracted skill: {skill.get('name', 'Unknown')} ({skill.get('category', 'Unknown')} - {skill.get('level', 'Unknown')})")
+        
+        self.job_required_skills = job_skills
+        return job_skills
+
+    def _skills_store_model(self) -> str:
+        """Store key of the extraction setup: model, its parameters and the prompt template.
+        Changing any of them extracts the skills again instead of serving stale ones."""
+        setup = json.dumps({"params": self.model.model_params, "prompt": self._render_job_skills_prompt("")},
+                           sort_keys=True, default=str)
+        setup_hash = hashlib.sha256(setup.encode("utf-8")).hexdigest()[:16]
+        return f"{self.model.model_provider}/{self.model.model_name}:{setup_hash}"
+
+    def _load_stored_job_skills(self):
+        """Return the stored extraction for this job description, or None."""
+        if self.skills_store is None:
+            return None
+        try:
+            stored = self.skills_store.get(self.job_description_text, self._skills_store_model())
+        except Exception as e:
+            logger.warning(f"Job skills store lookup failed: {e}")
+            return None
+        if stored is None:
+            return None
+        logger.info("Job skills loaded from store - skipping extraction")
+        return self._accept_job_skills(JobSkills(**stored))
+
+    def _save_job_skills(self, job_skills: JobSkills) -> JobSkills:
+        if self.skills_store is not None:
+            try:
+                self.skills_store.put(self.job_description_text, self._skills_store_model(), job_skills.model_dump(),
+                                      job_id=self.job_id, company_name=self.company_name)
+            except Exception as e:
+                logger.warning(f"Failed to store extracted job skills: {e}")
+        return job_skills
+
+    def get_job_required_skills(self):
+        """use AI to extradct required skills from job description"""
+        stored = self._load_stored_job_skills()
+        if stored is not None:
+            return stored
+        logger.info("Starting job skills extraction using AI")
+        try:
+            with stage(SKILL_EXTRACTION):
+                prompt = self._job_skills_prompt()
+                if self.stream:
+                    return self._save_job_skills(self._accept_job_skills(parse_stream(
+                        self.model.stream_completion(prompt=prompt.content, num_ctx=prompt.num_ctx,
+                                                    validate=_streamed_model(JobSkills)),
+                        JobSkills, self.on_partial)))
+                response_content = self.model.get_completion(prompt=prompt.content, num_ctx=prompt.num_ctx,
+                                                             validate=_json_model(JobSkills))
+                return self._save_job_skills(self._parse_job_skills(response_content))
         except Exception as e:
             logger.error(f"Error extracting job skills: {e}")
             raise
-    
 
-    def compare(self) -> ATSResult:
-        """Calculate the ATS score for the resume based on the job description."""
-        logger.info("Starting ATS comparison analysis")
-        
+    async def aget_job_required_skills(self):
+        """Async variant of get_job_required_skills."""
+        stored = self._load_stored_job_skills()
+        if stored is not None:
+            return stored
+        logger.info("Starting async job skills extraction using AI")
+        try:
+            with stage(SKILL_EXTRACTION):
+                prompt = self._job_skills_prompt()
+                if self.stream:
+                    return self._save_job_skills(self._accept_job_skills(await aparse_stream(
+                        self.model.astream_completion(prompt=prompt.content, num_ctx=prompt.num_ctx,
+                                                     validate=_streamed_model(JobSkills)),
+                        JobSkills, self.on_partial)))
+                response_content = await self.model.aget_completion(prompt=prompt.content, num_ctx=prompt.num_ctx,
+                                                                    validate=_json_model(JobSkills))
+                return self._save_job_skills(self._parse_job_skills(response_content))
+        except Exception as e:
+            logger.error(f"Error extracting job skills: {e}")
+            raise
+
+    def _compare_messages(self) -> BuiltPrompt:
+        built = PromptBuilder("ats_compare").build(
+            self._render_compare_messages,
+            job_skills=compact_skills(self.job_required_skills.required_skills),
+            resume=self.resume_text,
+        )
+        logger.debug(f"ATS analysis prompt prepared: {built.tokens} tokens")
+        return built
+
+    @staticmethod
+    def _render_compare_messages(job_skills: str, resume: str) -> list:
         system_prompt = f"""
         You are an Applicant Tracking System (ATS) that evaluates resumes against job descriptions.
         Return **only** a **JSON object** with the following **exact** structure:
@@ -119,11 +265,10 @@ class ResumeAnalyzer:
         """
         user_prompt = f"""
         **Job Description:**
-        {self.job_required_skills}
+        {job_skills}
         **Resume:**
-        {self.resume_text}
-        """        
-        logger.debug(f"ATS analysis prompt prepared: {len(user_prompt)} characters")
+        {resume}
+        """
         #response = openai.chat.completions.create(
         #    model="gpt-4o-mini",
         #    response_format={"type": "json_object"},
@@ -134,32 +279,158 @@ class ResumeAnalyzer:
         #    ]
         #)
         #response_content = response.choices[0].message.content
-        messages=[
+        return [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ]
+
+    def _parse_ats_result(self, response_content: str) -> ATSResult:
+        logger.debug(f"ATS analysis response received: {len(response_content)} characters")
         try:
-            logger.debug("Sending ATS analysis request to AI model")
-            response_content = self.model.get_completion(messages)
-            logger.debug(f"ATS analysis response received: {len(response_content)} characters")
-            
             ats_result = ATSResult(**json.loads(response_content))
-            
-            logger.info(f"ATS analysis completed successfully:")
-            logger.info(f"  - ATS Score: {ats_result.ats_score}")
-            logger.info(f"  - Missing Skills: {len(ats_result.missing_skills)}")
-            logger.info(f"  - Suggestions: {len(ats_result.suggested_improvements)} characters")
-            
-            # Log missing skills for debugging
-            for skill in ats_result.missing_skills:
-                logger.debug(f"Missing skill: {skill.get('name', 'Unknown')} ({skill.get('category', 'Unknown')} - {skill.get('level', 'Unknown')})")
-            
-            return ats_result
-            
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse ATS analysis response as JSON: {e}")
             logger.debug(f"Raw AI response: {response_content}")
             raise
+        return self._accept_ats_result(ats_result)
+
+    def _accept_ats_result(self, ats_result: ATSResult) -> ATSResult:
+        logger.info(f"ATS analysis completed successfully:")
+        logger.info(f"  - ATS Score: {ats_result.ats_score}")
+        logger.info(f"  - Missing Skills: {len(ats_result.missing_skills)}")
+        logger.info(f"  - Suggestions: {len(ats_result.suggested_improvements)} characters")
+        
+        # Log missing skills for debugging
+        for skill in ats_result.missing_skills:
+            logger.debug(f"Missing skill: {skill.get('name', 'Unknown')} ({skill.get('category', 'Unknown')} - {skill.get('level', 'Unknown')})")
+        
+        return ats_result
+
+    def local_score(self) -> ATSScore:
+        """Score the resume locally against the extracted job skills."""
+        local = LocalATSScorer().score(self.job_required_skills.required_skills, self.resume_data)
+        logger.info(f"Local ATS score: {local.ats_score} ({len(local.missing_skills)} missing skills)")
+        if self.on_partial:
+            self.on_partial("ats_score", local.ats_score)
+        return local
+
+    @staticmethod
+    def _local_suggestions(local: ATSScore) -> str:
+        if not local.missing_skills:
+            return "The resume covers all required skills; keep the most relevant ones prominent."
+        names = ", ".join(f"{skill.get('name', 'Unknown')} ({skill.get('level', 'Unknown')})"
+                          for skill in local.missing_skills)
+        return f"Highlight experience with the required skills missing from the resume: {names}."
+
+    def _suggestions_messages(self, local: ATSScore) -> BuiltPrompt:
+        return PromptBuilder("ats_suggestions").build(
+            lambda missing_skills, resume: self._render_suggestions_messages(local.ats_score, missing_skills, resume),
+            missing_skills=compact_skills(local.missing_skills),
+            resume=self.resume_text,
+        )
+
+    @staticmethod
+    def _render_suggestions_messages(ats_score: int, missing_skills: str, resume: str) -> list:
+        system_prompt = """
+        You are an Applicant Tracking System (ATS) expert helping a candidate improve a resume.
+        Return **only** a **JSON object** with the following **exact** structure:
+        ```json
+        {
+            "suggested_improvements": "Detailed suggestions on how to improve the resume."
+        }
+        ```
+        """
+        user_prompt = f"""
+        **ATS Score:** {ats_score}
+        **Missing Skills:**
+        {missing_skills}
+        **Resume:**
+        {resume}
+        """
+        return [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ]
+
+    def _local_ats_result(self, local: ATSScore, suggested_improvements: str) -> ATSResult:
+        return self._accept_ats_result(ATSResult(ats_score=local.ats_score, missing_skills=local.missing_skills,
+                                                 suggested_improvements=suggested_improvements))
+
+    def _compare_local(self) -> ATSResult:
+        local = self.local_score()
+        if self.ats_mode == "local":
+            return self._local_ats_result(local, self._local_suggestions(local))
+        logger.debug("Requesting suggested improvements from AI model")
+        prompt = self._suggestions_messages(local)
+        if self.stream:
+            suggestions = parse_stream(self.model.stream_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                                 validate=_streamed_model(ATSSuggestions)),
+                                       ATSSuggestions)
+        else:
+            suggestions = ATSSuggestions(**json.loads(
+                self.model.get_completion(prompt.content, num_ctx=prompt.num_ctx, validate=_json_model(ATSSuggestions))))
+        return self._local_ats_result(local, suggestions.suggested_improvements)
+
+    async def _acompare_local(self) -> ATSResult:
+        local = self.local_score()
+        if self.ats_mode == "local":
+            return self._local_ats_result(local, self._local_suggestions(local))
+        logger.debug("Requesting suggested improvements from AI model")
+        prompt = self._suggestions_messages(local)
+        if self.stream:
+            suggestions = await aparse_stream(self.model.astream_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                                         validate=_streamed_model(ATSSuggestions)),
+                                              ATSSuggestions)
+        else:
+            suggestions = ATSSuggestions(**json.loads(
+                await self.model.aget_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                validate=_json_model(ATSSuggestions))))
+        return self._local_ats_result(local, suggestions.suggested_improvements)
+
+    def compare(self) -> ATSResult:
+        """Calculate the ATS score for the resume based on the job description."""
+        logger.info(f"Starting ATS comparison analysis ({self.ats_mode} mode)")
+        if self.job_required_skills is None:
+            self.get_job_required_skills()
+        
+        try:
+            with stage(COMPARE):
+                if self.ats_mode != "llm":
+                    return self._compare_local()
+                logger.debug("Sending ATS analysis request to AI model")
+                prompt = self._compare_messages()
+                if self.stream:
+                    return self._accept_ats_result(parse_stream(
+                        self.model.stream_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                     validate=_streamed_model(ATSResult)),
+                        ATSResult, self.on_partial))
+                response_content = self.model.get_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                             validate=_json_model(ATSResult))
+                return self._parse_ats_result(response_content)
+        except Exception as e:
+            logger.error(f"Error during ATS comparison: {e}")
+            raise
+
+    async def acompare(self) -> ATSResult:
+        """Async variant of compare."""
+        logger.info(f"Starting async ATS comparison analysis ({self.ats_mode} mode)")
+        if self.job_required_skills is None:
+            await self.aget_job_required_skills()
+        
+        try:
+            with stage(COMPARE):
+                if self.ats_mode != "llm":
+                    return await self._acompare_local()
+                logger.debug("Sending ATS analysis request to AI model")
+                prompt = self._compare_messages()
+                if self.stream:
+                    return self._accept_ats_result(await aparse_stream(
+                        self.model.astream_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                      validate=_streamed_model(ATSResult)),
+                        ATSResult, self.on_partial))
+                response_content = await self.model.aget_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                                    validate=_json_model(ATSResult))
+                return self._parse_ats_result(response_content)
         except Exception as e:
             logger.error(f"Error during ATS comparison: {e}")
             raise
@@ -5,24 +5,29 @@ import openai
 import yaml
 import json
 from ai_interface import AIInterface
+from model_registry import get_default_model
+from prompt_builder import PromptBuilder, BuiltPrompt
+from stage_timing import stage, SUMMARY
 import logging
 import re
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+
+def _summary_field(response: str) -> str:
+    """Validator for AIInterface: only responses with a JSON "summary" field are cached."""
+    return json.loads(response)["summary"]
+
+
 class ResumeEnhancer:
-    def __init__(self, resume_path: str, company_name: str, job_title: str = ""):
+    def __init__(self, resume_path: str, company_name: str, job_title: str = "", model: AIInterface = None,
+                 job_id: str = None, resume_text: str = None):
         logger.info(f"Initializing ResumeEnhancer for resume: {resume_path}, company: {company_name}, job: {job_title}")
         
         try:
-            # Create the AI interface
-            self.model = AIInterface(
-                    model_provider="ollama",
-                    model_name="qwen2.5:3b",
-                    temperature=0,
-                    format="json"
-                )
+            # Use the injected client or the shared one from the model registry
+            self.model = model or get_default_model()
             logger.info("AI interface initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize AI interface: {e}")
@@ -31,6 +36,10 @@ class ResumeEnhancer:
         self.resume_path = Path(resume_path)
         self.company_name = company_name
         self.job_title = job_title
+        # Keeps enhanced resumes for several postings of one company apart
+        self.job_id = job_id
+        # YAML text already read by ResumeParser; avoids reading the file again
+        self.resume_text = resume_text
         
         try:
             self.yaml = YAML()
@@ -46,6 +55,10 @@ class ResumeEnhancer:
     
     def _load_resume(self) -> dict:
         """Loads the YAML resume file while preserving order."""
+        if self.resume_text is not None:
+            data = self.yaml.load(self.resume_text)
+            logger.info(f"Successfully loaded resume with {len(data)} top-level sections from memory")
+            return data
         logger.debug(f"Loading resume from {self.resume_path}")
         try:
             with open(self.resume_path, 'r') as file:
@@ -150,6 +163,9 @@ class ResumeEnhancer:
         
         filename_parts.append(self.company_name)
         
+        if self.job_id:
+            filename_parts.append(self._sanitize_filename(str(self.job_id)))
+        
         enhanced_filename = "_".join(filename_parts) + self.resume_path.suffix
         new_resume_path = company_resume_dir / enhanced_filename
         
@@ -164,8 +180,7 @@ class ResumeEnhancer:
             logger.error(f"Failed to save enhanced resume to {new_resume_path}: {e}")
             raise
     
-    def enhance_resume(self, ats_result: ATSResult) -> str:
-        """Enhances the resume based on ATS findings while preserving structure and order."""
+    def _log_missing_skills(self, ats_result: ATSResult):
         logger.info(f"🚀 Starting resume enhancement with ATS score: {ats_result.ats_score}")
         logger.info(f"📋 Missing skills to add: {len(ats_result.missing_skills)}")
         
@@ -181,6 +196,13 @@ class ResumeEnhancer:
             logger.info(f"📝 Skills identified as missing: {', '.join(skill_details)}")
         else:
             logger.info("✅ No missing skills identified by ATS analysis")
+
+    def enhance_resume(self, ats_result: ATSResult, save: bool = True) -> str:
+        """Enhances the resume based on ATS findings while preserving structure and order.
+
+        With save=False the result stays in self.resume_data and None is returned.
+        """
+        self._log_missing_skills(ats_result)
         
         try:
             # Filter skills to only include job-relevant ones
@@ -190,15 +212,29 @@ class ResumeEnhancer:
             
             self._add_missing_skills(filtered_skills)
             self._update_summary(ats_result)
-            enhanced_path = self._save_resume()
+            enhanced_path = self._save_resume() if save else None
+            logger.info("🎉 Resume enhancement completed successfully")
+            return enhanced_path
+        except Exception as e:
+            logger.error(f"❌ Resume enhancement failed: {e}")
+            raise
+
+    async def aenhance_resume(self, ats_result: ATSResult, save: bool = True) -> str:
+        """Async variant of enhance_resume."""
+        self._log_missing_skills(ats_result)
+        
+        try:
+            self._add_missing_skills(ats_result.missing_skills)
+            await self._aupdate_summary(ats_result)
+            enhanced_path = self._save_resume() if save else None
             logger.info("🎉 Resume enhancement completed successfully")
             return enhanced_path
         except Exception as e:
             logger.error(f"❌ Resume enhancement failed: {e}")
             raise
     
-    def _update_summary(self, ats_result: ATSResult):
-        """Updates the summary section of the resume."""
+    def _summary_messages(self, ats_result: ATSResult) -> BuiltPrompt:
+        """Builds the AI messages asking for a summary that includes the missing skills."""
         logger.info("Starting summary update with AI enhancement")
         
         current_summary = self.resume_data.get("summary", "")
@@ -210,8 +246,13 @@ class ResumeEnhancer:
             if isinstance(skill, dict) and 'name' in skill:
                 missing_skill_names.append(skill['name'])
         
-        missing_skills_text = ", ".join(missing_skill_names)
-        
+        built = PromptBuilder("summary").build(self._render_summary_messages, current_summary=current_summary,
+                                               missing_skills=", ".join(missing_skill_names))
+        logger.debug(f"AI prompt prepared: {built.tokens} tokens")
+        return built
+
+    @staticmethod
+    def _render_summary_messages(current_summary: str, missing_skills: str) -> list:
         prompt = f"""
         Rewrite this professional resume summary by naturally incorporating the missing skills listed below. 
         
@@ -227,32 +268,24 @@ class ResumeEnhancer:
         {current_summary}
         
         Missing Skills to incorporate naturally:
-        {missing_skills_text}
+        {missing_skills}
         
         Return only the JSON output with key "summary" and the enhanced summary as the value.
         """
-        
-        logger.debug(f"AI prompt prepared: {len(prompt)} characters")
-        
         messages = [
             {"role": "system", "content": "You are a professional resume writer. Write only resume content, never include advice or meta-commentary."},
             {"role": "user", "content": prompt}
         ]
-        
+        return messages
+
+    def _apply_summary_response(self, response: str):
+        """Parses the AI response and stores the validated summary."""
+        logger.debug(f"AI response received: {len(response)} characters")
+        current_summary = self.resume_data.get("summary", "")
+        response_data = None
         try:
-            logger.debug("Sending request to AI model for summary enhancement")
-            response = self.model.get_completion(messages)
-            logger.debug(f"AI response received: {len(response)} characters")
-            
             response_data = json.loads(response)
             new_summary = response_data["summary"]
-            
-            # Validate and clean the summary
-            validated_summary = self._validate_summary(new_summary)
-            
-            self.resume_data["summary"] = validated_summary
-            logger.info(f"Summary updated successfully: {len(current_summary)} -> {len(validated_summary)} characters")
-            
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse AI response as JSON: {e}")
             logger.debug(f"Raw AI response: {response}")
@@ -261,9 +294,38 @@ class ResumeEnhancer:
             logger.error(f"Expected 'summary' key not found in AI response: {e}")
             logger.debug(f"AI response data: {response_data}")
             raise
+        
+        # Validate and clean the summary
+        validated_summary = self._validate_summary(new_summary)
+        
+        self.resume_data["summary"] = validated_summary
+        logger.info(f"Summary updated successfully: {len(current_summary)} -> {len(validated_summary)} characters")
+
+    def _update_summary(self, ats_result: ATSResult):
+        """Updates the summary section of the resume."""
+        prompt = self._summary_messages(ats_result)
+        try:
+            with stage(SUMMARY):
+                logger.debug("Sending request to AI model for summary enhancement")
+                response = self.model.get_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                     validate=_summary_field)
+        except Exception as e:
+            logger.error(f"Error updating summary with AI: {e}")
+            raise
+        self._apply_summary_response(response)
+
+    async def _aupdate_summary(self, ats_result: ATSResult):
+        """Async variant of _update_summary."""
+        prompt = self._summary_messages(ats_result)
+        try:
+            with stage(SUMMARY):
+                logger.debug("Sending async request to AI model for summary enhancement")
+                response = await self.model.aget_completion(prompt.content, num_ctx=prompt.num_ctx,
+                                                            validate=_summary_field)
         except Exception as e:
             logger.error(f"Error updating summary with AI: {e}")
             raise
+        self._apply_summary_response(response)
 
     def _add_missing_skills(self, missing_skills: list[str]):
         """Adds missing skills while preserving the existing structure."""
@@ -1,24 +1,136 @@
 from jinja2 import Environment, FileSystemLoader
 from resume_parser import ResumeParser
 import os
+import re
+import base64
 import asyncio
+import mimetypes
+import functools
 from pyppeteer import launch
 from pathlib import Path
-from googletrans import Translator
+from browser_pool import browser_launch_options
+from event_loop_service import run_sync
+from translation_engine import TranslationEngine
+from translation_memory import get_translation_memory
+from translation_filter import get_translation_filter
+from translator_client import get_translator_client
+from stage_timing import stage, timed, TRANSLATION, HTML_RENDER, PDF_RENDER
 import logging
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+PDF_OPTIONS = {
+    "format": 'A4',
+    "printBackground": True,
+    "preferCSSPageSize": True,
+    "embedFonts": True  # Ensure fonts are embedded
+}
+
+# All static label keys with their default English texts.
+LABEL_KEYS = {
+    "personal_information": "Personal Information",
+    "summary": "Summary",
+    "experience": "Experience",
+    "education": "Education",
+    "skills": "Technical Skills",
+    "languages": "Languages",
+    "projects": "Projects",
+    "certifications": "Certifications",
+    "interests": "Interests",
+    "key_responsibilities": "Key Responsibilities",
+    "skills_acquired": "Skills Acquired",
+    "field_of_study": "Field of Study",
+    "institution": "Institution",
+    "graduation_year": "Graduation Year",
+    "role": "Role",
+    "description": "Description",
+    "year": "Year",
+    "link": "Link",
+    "view_project": "View Project",
+    "issuer": "Issuer",
+    "date_of_issuance": "Date of Issuance",
+    "certificate": "Certificate",
+    "view": "View",
+}
+
+_STYLESHEET_LINK = re.compile(r'<link\s+rel="stylesheet"\s+href="([^"]+)"\s*/?>')
+_IMAGE_SRC = re.compile(r'(<img\b[^>]*?\bsrc=")([^"]+)(")')
+_REMOTE_URL = re.compile(r'^(https?:|data:|file:|//)')
+
+
+@functools.lru_cache(maxsize=64)
+def _read_asset(path, mtime_ns):
+    """Read a template asset; the mtime in the cache key picks up edited files."""
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _load_asset(path):
+    path = Path(path).resolve()
+    return _read_asset(str(path), path.stat().st_mtime_ns)
+
+
+def inline_assets(html, base_dir):
+    """
+    Embed local stylesheets and images referenced relative to base_dir.
+
+    HTML loaded with setContent has no file:// location, so relative links would not resolve.
+    Missing assets are left untouched, exactly as a file:// load would miss them.
+    """
+    base_dir = Path(base_dir)
+
+    def stylesheet(match):
+        href = match.group(1)
+        if _REMOTE_URL.match(href):
+            return match.group(0)
+        try:
+            css = _load_asset(base_dir / href).decode("utf-8")
+        except OSError as e:
+            logger.warning(f"Stylesheet not found for inlining: {href} ({e})")
+            return match.group(0)
+        return f"<style>\n{css}\n</style>"
+
+    def image(match):
+        src = match.group(2)
+        if _REMOTE_URL.match(src):
+            return match.group(0)
+        try:
+            data = _load_asset(base_dir / src)
+        except OSError as e:
+            logger.warning(f"Image not found for inlining: {src} ({e})")
+            return match.group(0)
+        mime = mimetypes.guess_type(src)[0] or "application/octet-stream"
+        return f"{match.group(1)}data:{mime};base64,{base64.b64encode(data).decode('ascii')}{match.group(3)}"
+
+    return _IMAGE_SRC.sub(image, _STYLESHEET_LINK.sub(stylesheet, html))
+
+
+def write_atomic(path, data):
+    """Write a file through a temporary file and rename, so readers never see partial output."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{id(data)}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(data.encode("utf-8") if isinstance(data, str) else data)
+    os.replace(tmp_path, path)
+    return path
+
+
 class ResumeGenerator:
     """Generates an HTML resume from a YAML data structure with dynamic translation."""
 
-    def __init__(self, resume_path, output_dir, template_path, language="en"):
+    def __init__(self, resume_path, output_dir, template_path, language="en", browser_pool=None, translation_memory=None,
+                 translator=None):
         logger.info(f"Initializing ResumeGenerator with resume: {resume_path}, output: {output_dir}, template: {template_path}, language: {language}")
         
         self.resume_path = Path(resume_path)
         self.output_dir = Path(output_dir)
         self.language = language
+        # Optional BrowserPool; without one every PDF cold-launches its own browser
+        self.browser_pool = browser_pool
+        self.translation_memory = translation_memory if translation_memory is not None else get_translation_memory()
+        # Shared TranslatorClient, so its HTTP connections outlive this generator
+        self.translator = translator or get_translator_client()
         
         try:
             self.env = Environment(loader=FileSystemLoader(template_path))
@@ -29,184 +141,152 @@ class ResumeGenerator:
             raise
             
         try:
-            self.translator = Translator()
-            logger.debug("Translator initialized successfully")
+            self.translation_engine = TranslationEngine(self._request_translation, memory=self.translation_memory,
+                                                        text_filter=get_translation_filter())
+            logger.debug("Translation engine initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize translator: {e}")
+            logger.error(f"Failed to initialize translation engine: {e}")
             raise
             
         logger.info("ResumeGenerator initialization completed successfully")
 
-    async def _translate_text(self, text, target_lang):
-        """Translate text asynchronously using Google Translate.
-           Since googletrans is synchronous, we run it in an executor.
-        """
-        if target_lang == "en":
-            logger.debug(f"Skipping translation for English text: {text[:50]}...")
-            return text  # No translation needed for English
-            
+    async def _request_translation(self, text, target_lang):
+        """Send one translation request to Google Translate. Raises on failure."""
         logger.debug(f"Translating text to {target_lang}: {text[:50]}...")
-        try:
-            translation = await self.translator.translate(text, target_lang)
-            logger.debug(f"Translation successful: {text[:30]}... -> {translation.text[:30]}...")
-            return translation.text
-        except Exception as e:
-            logger.warning(f"Translation failed for text '{text[:50]}...': {e}")
-            return text  # Fallback to original text if translation fails
+        translation = await self.translator.translate(text, target_lang)
+        logger.debug(f"Translation successful: {text[:30]}... -> {translation[:30]}...")
+        return translation
 
-    async def generate_html_async(self, resume_data, output_file=None):
-        """Render resume data with dynamically translated labels and content."""
+    async def prewarm_translations_async(self, language, extra_texts=(), technical=()):
+        """Fill the translation memory with the labels (and any extra texts) for a language."""
+        if language == "en":
+            return {}
+        logger.info(f"Pre-warming translation memory for language: {language}")
+        return await self.translation_engine.translate_strings(list(LABEL_KEYS.values()) + list(extra_texts), language,
+                                                               technical)
+
+    @property
+    def html_path(self):
+        return self.output_dir / self.resume_path.name.replace(".yaml", ".html")
+
+    @property
+    def pdf_path(self):
+        return self.html_path.with_suffix(".pdf")
+
+    def html_path_for(self, language):
+        """HTML path of one language of a multi-language render."""
+        return self.output_dir / f"{self.html_path.stem}_{language}.html"
+
+    async def render_html_async(self, resume_data) -> str:
+        """Render resume data with dynamically translated labels and content, without touching disk."""
         logger.info(f"Starting HTML generation for language: {self.language}")
         
-        # Define all static label keys with their default English texts.
-        label_keys = {
-            "personal_information": "Personal Information",
-            "summary": "Summary",
-            "experience": "Experience",
-            "education": "Education",
-            "skills": "Technical Skills",
-            "languages": "Languages",
-            "projects": "Projects",
-            "certifications": "Certifications",
-            "interests": "Interests",
-            "key_responsibilities": "Key Responsibilities",
-            "skills_acquired": "Skills Acquired",
-            "field_of_study": "Field of Study",
-            "institution": "Institution",
-            "graduation_year": "Graduation Year",
-            "role": "Role",
-            "description": "Description",
-            "year": "Year",
-            "link": "Link",
-            "view_project": "View Project",
-            "issuer": "Issuer",
-            "date_of_issuance": "Date of Issuance",
-            "certificate": "Certificate",
-            "view": "View",
-            "lang": self.language  # Used to set the HTML lang attribute if desired
-        }
-
-        logger.debug(f"Translating {len(label_keys)} labels to {self.language}")
-        # Translate each label asynchronously.
-        labels = {}
-        for key, value in label_keys.items():
-            labels[key] = await self._translate_text(value, self.language)
-        logger.info("Label translation completed")
-
-        # Translate resume content fields as needed.
-        logger.debug("Starting content translation")
-        
-        if "personal_information" in resume_data:
-            logger.debug("Translating personal information")
-            if "citizenship" in resume_data["personal_information"]:
-                resume_data["personal_information"]["citizenship"] = await self._translate_text(resume_data["personal_information"]["citizenship"], self.language)
+        labels = dict(LABEL_KEYS, lang=self.language)  # lang sets the HTML lang attribute
         
-        if "summary" in resume_data:
-            logger.debug("Translating summary")
-            resume_data["summary"] = await self._translate_text(resume_data["summary"], self.language)
-
-        if "experiences" in resume_data:
-            logger.debug(f"Translating {len(resume_data['experiences'])} experiences")
-            for i, exp in enumerate(resume_data["experiences"]):
-                logger.debug(f"Translating experience {i+1}")
-                if "employment_period" in exp:
-                    exp["employment_period"] = await self._translate_text(exp["employment_period"], self.language)
-                if "location" in exp:
-                    exp["location"] = await self._translate_text(exp["location"], self.language)
-                if "key_responsibilities" in exp:
-                    logger.debug(f"Translating {len(exp['key_responsibilities'])} responsibilities")
-                    for res in exp["key_responsibilities"]:
-                        if "description" in res:
-                            res["description"] = await self._translate_text(res["description"], self.language)
-                if "skills_acquired" in exp:
-                    logger.debug(f"Translating {len(exp['skills_acquired'])} skills")
-                    exp["skills_acquired"] = [await self._translate_text(skill, self.language) for skill in exp["skills_acquired"]]
-
-        if "education" in resume_data:
-            logger.debug(f"Translating {len(resume_data['education'])} education entries")
-            for edu in resume_data["education"]:
-                if "field_of_study" in edu:
-                    edu["field_of_study"] = await self._translate_text(edu["field_of_study"], self.language)
-                if "graduation_year" in edu:
-                    edu["graduation_year"] = await self._translate_text(edu["graduation_year"], self.language)
-
-        if "projects" in resume_data:
-            logger.debug(f"Translating {len(resume_data['projects'])} projects")
-            for project in resume_data["projects"]:
-                if "role" in project:
-                    project["role"] = await self._translate_text(project["role"], self.language)
-                if "description" in project:
-                    project["description"] = await self._translate_text(project["description"], self.language)
-
-        if "certifications" in resume_data:
-            logger.debug(f"Translating {len(resume_data['certifications'])} certifications")
-            for cert in resume_data["certifications"]:
-                if "date" in cert:
-                    cert["date"] = await self._translate_text(cert["date"], self.language)
-
-        if "interests" in resume_data:
-            logger.debug(f"Translating {len(resume_data['interests'])} interests")
-            resume_data["interests"] = [await self._translate_text(interest, self.language) for interest in resume_data["interests"]]
-
-        if "languages" in resume_data:
-            logger.debug(f"Translating {len(resume_data['languages'])} language entries")
-            for lang in resume_data["languages"]:
-                if "language" in lang:
-                    lang["language"] = await self._translate_text(lang["language"], self.language)
-                if "proficiency" in lang:
-                    lang["proficiency"] = await self._translate_text(lang["proficiency"], self.language)
-
-        logger.info("Content translation completed")
+        if self.language == "en":
+            logger.debug("Skipping translation for English resume")
+        else:
+            logger.debug(f"Translating labels and content to {self.language}")
+            with stage(TRANSLATION):
+                labels = await self.translation_engine.translate_resume(resume_data, labels, self.language)
+            logger.info(f"Content translation completed - stats: {self.translation_engine.stats}, "
+                        f"memory: {self.translation_memory.stats}")
 
         # Render the template with translated content.
         logger.debug("Rendering HTML template")
         try:
-            output_html = self.template.render(resume_data, labels=labels)
-            html_file = output_file or (self.output_dir / self.resume_path.name.replace(".yaml", ".html"))
-            
-            with open(html_file, "w", encoding="utf-8") as file:
-                file.write(output_html)
-            
+            with stage(HTML_RENDER):
+                return self.template.render(resume_data, labels=labels)
+        except Exception as e:
+            logger.error(f"Failed to render HTML template: {e}")
+            raise
+
+    async def render_languages_async(self, resume_data, languages) -> dict:
+        """Render resume data in several languages with one template and one translation pass.
+
+        Returns {language: html}; resume_data itself is not modified.
+        """
+        targets = [language for language in languages if language != "en"]
+        logger.info(f"Starting HTML generation for languages: {', '.join(languages)}")
+        translated = {}
+        if targets:
+            with stage(TRANSLATION):
+                translated = await self.translation_engine.translate_resume_many(resume_data, dict(LABEL_KEYS), targets)
+            logger.info(f"Content translation completed - stats: {self.translation_engine.stats}, "
+                        f"memory: {self.translation_memory.stats}")
+
+        htmls = {}
+        with stage(HTML_RENDER):
+            for language in languages:
+                data, labels = translated.get(language, (resume_data, LABEL_KEYS))
+                htmls[language] = self.template.render(data, labels=dict(labels, lang=language))
+        return htmls
+
+    async def generate_html_async(self, resume_data, output_file=None):
+        """Render resume data and save the HTML file; returns its path."""
+        output_html = await self.render_html_async(resume_data)
+        html_file = output_file or self.html_path
+        try:
+            write_atomic(html_file, output_html)
             logger.info(f"HTML resume successfully saved as {html_file}")
             return html_file
         except Exception as e:
-            logger.error(f"Failed to render or save HTML template: {e}")
+            logger.error(f"Failed to save HTML file: {e}")
             raise
 
+    @timed(PDF_RENDER)
+    async def html_to_pdf_bytes_async(self, html) -> bytes:
+        """Print an HTML string to PDF bytes via page.setContent; nothing is written to disk."""
+        # Relative links resolve as if the HTML were saved in output_dir
+        html = inline_assets(html, self.output_dir)
+        if self.browser_pool:
+            logger.debug("Rendering HTML content on pooled browser")
+            pdf_bytes = await self.browser_pool.render_pdf_content(html, PDF_OPTIONS)
+        else:
+            browser = await launch(**browser_launch_options())
+            try:
+                page = await browser.newPage()
+                await page.setContent(html)
+                pdf_bytes = await page.pdf(PDF_OPTIONS)
+            finally:
+                await browser.close()
+        logger.info(f"PDF rendered in memory: {len(pdf_bytes)} bytes")
+        return pdf_bytes
+
+    @timed(PDF_RENDER)
+    async def html_to_pdf_bytes_many_async(self, htmls) -> dict:
+        """Print several HTML strings to PDF bytes in one browser session; returns {key: pdf_bytes}."""
+        htmls = {key: inline_assets(html, self.output_dir) for key, html in htmls.items()}
+        if self.browser_pool:
+            pdfs = await asyncio.gather(*(self.browser_pool.render_pdf_content(html, PDF_OPTIONS)
+                                          for html in htmls.values()))
+            pdfs = dict(zip(htmls, pdfs))
+        else:
+            pdfs = {}
+            browser = await launch(**browser_launch_options())
+            try:
+                page = await browser.newPage()
+                for key, html in htmls.items():
+                    await page.setContent(html)
+                    pdfs[key] = await page.pdf(PDF_OPTIONS)
+            finally:
+                await browser.close()
+        logger.info(f"{len(pdfs)} PDFs rendered in memory: {sum(len(pdf) for pdf in pdfs.values())} bytes")
+        return pdfs
+
     def generate_html(self, resume_data):
         logger.info("Starting synchronous HTML generation")
         try:
-            # Always run in a separate thread to avoid signal handler issues in web server contexts
-            import concurrent.futures
-            import threading
-            
-            def run_in_thread():
-                # Create a new event loop for this thread
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                try:
-                    return new_loop.run_until_complete(self.generate_html_async(resume_data))
-                finally:
-                    new_loop.close()
-            
-            # Check if we're likely in a web server context by checking thread name
-            current_thread = threading.current_thread()
-            is_main_thread = isinstance(current_thread, threading._MainThread)
-            
-            logger.debug(f"Thread info: name='{current_thread.name}', is_main={is_main_thread}, type={type(current_thread)}")
-            
-            # For now, always use separate thread to avoid signal issues
-            logger.debug("Using separate thread with new event loop to avoid signal handler issues")
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_in_thread)
-                result = future.result()
-            
+            # Runs on the shared event loop, where the translator client and browser pool live,
+            # and avoids signal handler issues in web server threads
+            result = run_sync(self.generate_html_async(resume_data))
             logger.info("Synchronous HTML generation completed successfully")
             return result
         except Exception as e:
             logger.error(f"Synchronous HTML generation failed: {e}")
             raise
 
+    @timed(PDF_RENDER)
     async def html_to_pdf_async(self, html_file):
         logger.info(f"Starting PDF generation from {html_file}")
         
@@ -215,46 +295,28 @@ class ResumeGenerator:
         
         logger.debug(f"PDF will be saved as: {resume_file_path}")
         
+        file_url = f'file://{html_file}'
+        if self.browser_pool:
+            logger.debug(f"Rendering {file_url} on pooled browser")
+            pdf_bytes = await self.browser_pool.render_pdf(file_url, PDF_OPTIONS)
+            with open(resume_file_path, "wb") as file:
+                file.write(pdf_bytes)
+            logger.info(f"PDF resume successfully saved as {resume_file_path}")
+            return resume_file_path
+        
+        browser = None
         try:
-            # Browser setup with signal handling disabled
-            if os.environ.get('CONTAINER'):
-                logger.debug("Running in container mode - using Chromium")
-                executablePath = "/usr/bin/chromium"
-                args = ['--no-sandbox', '--disable-setuid-sandbox']
-                browser = await launch(
-                    headless=True, 
-                    executablePath=executablePath, 
-                    args=args,
-                    handleSIGINT=False,
-                    handleSIGTERM=False,
-                    handleSIGHUP=False
-                )
-            else:
-                logger.debug("Running in local mode - using default browser")
-                browser = await launch(
-                    headless=True,
-                    handleSIGINT=False,
-                    handleSIGTERM=False,
-                    handleSIGHUP=False
-                )
-            
+            browser = await launch(**browser_launch_options())
             logger.debug("Browser launched successfully")
             
             page = await browser.newPage()
             logger.debug("New page created")
             
-            file_url = f'file://{html_file}'
             logger.debug(f"Loading HTML file: {file_url}")
             await page.goto(file_url)
             
             logger.debug("Generating PDF with settings")
-            await page.pdf({
-                "path": resume_file_path,
-                "format": 'A4',
-                "printBackground": True,
-                "preferCSSPageSize": True,
-                "embedFonts": True  # Ensure fonts are embedded
-            })
+            await page.pdf({"path": resume_file_path, **PDF_OPTIONS})
             
             logger.info(f"PDF resume successfully saved as {resume_file_path}")
             await browser.close()
@@ -265,8 +327,9 @@ class ResumeGenerator:
         except Exception as e:
             logger.error(f"PDF generation failed: {e}")
             try:
-                await browser.close()
-                logger.debug("Browser closed after error")
+                if browser:
+                    await browser.close()
+                    logger.debug("Browser closed after error")
             except:
                 pass
             raise
@@ -276,32 +339,9 @@ class ResumeGenerator:
         try:
             absolute_html_path = Path(html_file).resolve()
             logger.debug(f"Resolved HTML path: {absolute_html_path}")
-            
-            # Always run in a separate thread to avoid signal handler issues in web server contexts
-            import concurrent.futures
-            import threading
-            
-            def run_in_thread():
-                # Create a new event loop for this thread
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                try:
-                    return new_loop.run_until_complete(self.html_to_pdf_async(absolute_html_path))
-                finally:
-                    new_loop.close()
-            
-            # Check if we're likely in a web server context by checking thread name
-            current_thread = threading.current_thread()
-            is_main_thread = isinstance(current_thread, threading._MainThread)
-            
-            logger.debug(f"Thread info: name='{current_thread.name}', is_main={is_main_thread}, type={type(current_thread)}")
-            
-            # For now, always use separate thread to avoid signal issues
-            logger.debug("Using separate thread with new event loop to avoid signal handler issues")
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_in_thread)
-                result = future.result()
-            
+
+            # Pooled browsers live on the same shared event loop
+            result = run_sync(self.html_to_pdf_async(absolute_html_path))
             logger.info("Synchronous PDF generation completed successfully")
             return result
         except Exception as e:
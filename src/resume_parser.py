@@ -1,52 +1,83 @@
+import copy
+import hashlib
+import threading
 import yaml
 import logging
+from collections import OrderedDict
+from prompt_builder import compact
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader is several times faster; PyYAML builds without it fall back to pure Python
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed resumes keyed by the SHA-256 of their bytes, shared by all stages of the process
+_PARSE_CACHE_SIZE = 32
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _parse_yaml(raw: bytes, content_hash: str):
+    """Parse YAML bytes once per distinct content; callers get their own deep copy."""
+    with _parse_cache_lock:
+        data = _parse_cache.get(content_hash)
+        if data is not None:
+            _parse_cache.move_to_end(content_hash)
+    if data is None:
+        data = yaml.load(raw, Loader=SafeLoader)
+        with _parse_cache_lock:
+            _parse_cache[content_hash] = data
+            while len(_parse_cache) > _PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+    else:
+        logger.debug(f"Resume parse cache hit: {content_hash[:12]}")
+    # Stages mutate their copy (enhancement, translation), never the cached structure
+    return copy.deepcopy(data)
+
+
 class ResumeParser:
-    """Loads and parses resume data from a YAML file."""
+    """Loads and parses resume data from a YAML file, bytes or a binary/text stream."""
 
     def __init__(self, yaml_file):
-        logger.info(f"Initializing ResumeParser with file: {yaml_file}")
-        self.yaml_file = yaml_file
+        if isinstance(yaml_file, bytes):
+            self.yaml_file = "<bytes>"
+        elif hasattr(yaml_file, "read"):
+            self.yaml_file = getattr(yaml_file, "name", "<stream>")
+        else:
+            self.yaml_file = yaml_file
+        logger.info(f"Initializing ResumeParser with: {self.yaml_file}")
         try:
+            self.raw = self._read_bytes(yaml_file)
+            self.content_hash = hashlib.sha256(self.raw).hexdigest()
+            self.text = self.raw.decode("utf-8")
             self.data = self._load_yaml()
-            self.text = self._load_plain_text()
-            logger.info(f"Successfully loaded resume data from {yaml_file}")
+            logger.info(f"Successfully loaded resume data from {self.yaml_file}")
         except Exception as e:
             logger.error(f"Failed to initialize ResumeParser: {e}")
             raise
 
+    @staticmethod
+    def _read_bytes(source) -> bytes:
+        """Read the resume once, from a path, bytes or a stream."""
+        if isinstance(source, bytes):
+            return source
+        if hasattr(source, "read"):
+            content = source.read()
+            return content.encode("utf-8") if isinstance(content, str) else content
+        with open(source, "rb") as file:
+            return file.read()
+
     def _load_yaml(self):
-        """Load YAML data from file."""
+        """Parse the YAML content, reusing the process-level parse cache."""
         logger.debug(f"Loading YAML data from {self.yaml_file}")
         try:
-            with open(self.yaml_file, "r") as file:
-                data = yaml.safe_load(file)
-                logger.debug(f"Successfully loaded YAML data with {len(data)} top-level keys")
-                return data
-        except FileNotFoundError:
-            logger.error(f"YAML file not found: {self.yaml_file}")
-            raise
+            data = _parse_yaml(self.raw, self.content_hash)
+            logger.debug(f"Successfully loaded YAML data with {len(data)} top-level keys")
+            return data
         except yaml.YAMLError as e:
             logger.error(f"Error parsing YAML file {self.yaml_file}: {e}")
             raise
-        except Exception as e:
-            logger.error(f"Unexpected error loading YAML file {self.yaml_file}: {e}")
-            raise
-
-    def _load_plain_text(self):
-        """Load plain text data from file."""
-        logger.debug(f"Loading plain text from {self.yaml_file}")
-        try:
-            with open(self.yaml_file, "r") as file:
-                text = file.read()
-                logger.debug(f"Successfully loaded {len(text)} characters of plain text")
-                return text
-        except Exception as e:
-            logger.error(f"Error loading plain text from {self.yaml_file}: {e}")
-            raise
 
     def get_resume_summary(self):
         """Combine sections into plain text for ATS analysis."""
@@ -135,23 +166,28 @@ class ResumeParser:
             return ""
 
     def get_required_fields_for_ats(self):
-        """Combine sections into plain text for ATS analysis."""
+        """
+        Combine sections into compact plain text for ATS analysis.
+
+        Values are serialized without Python repr noise (quotes, brackets, key names),
+        one line per section, which keeps the prompts small.
+        """
         logger.info("Combining all resume fields for ATS analysis")
         try:
-            combined_text = "\n".join((
-                "summary: ",
-                self.get_resume_summary(),
-                "experiences skills_acquired: ",
-                self.get_resume_experiences_skills_acquired(),
-                "skills: ",
-                self.get_resume_skills(),
-                "languages: ",
-                self.get_resume_languages(),
-                "side project skills: ",
-                self.get_resume_project_skills(),
-                "interests: ",
-                self.get_resume_interests()
-            ))
+            data = self.data or {}
+            experience_skills = [skill for exp in data.get("experiences") or []
+                                 for skill in exp.get("skills_acquired") or []]
+            project_skills = [skill for proj in data.get("projects") or []
+                              for skill in proj.get("skills") or []]
+            sections = (
+                ("summary", data.get("summary")),
+                ("experiences skills_acquired", experience_skills),
+                ("skills", data.get("skills")),
+                ("languages", data.get("languages")),
+                ("side project skills", project_skills),
+                ("interests", data.get("interests")),
+            )
+            combined_text = "\n".join(f"{name}:\n{compact(value)}" for name, value in sections if value)
             logger.info(f"Successfully combined resume fields: {len(combined_text)} characters")
             return combined_text
         except Exception as e:
@@ -0,0 +1,226 @@
+import os
+import asyncio
+import functools
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+from pydantic import BaseModel, Field
+from langdetect import detect
+from resume_parser import ResumeParser
+from resume_analyzer import ResumeAnalyzer, ATSResult
+from resume_enhancer import ResumeEnhancer
+from resume_generator import ResumeGenerator, write_atomic
+from browser_pool import get_browser_pool
+from event_loop_service import run_sync
+from stage_timing import stage, timed, track_timings, PARSE, PIPELINE, TRANSLATION_PREWARM
+from model_registry import get_default_model
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+class PipelineResult(BaseModel):
+    pdf_bytes: bytes = Field(repr=False)
+    # Only set when the pipeline runs with persist=True
+    pdf_path: Optional[Path] = None
+    html_path: Optional[Path] = None
+    resume_path: Path
+    language: str
+    company_name: str
+    ats_result: Optional[ATSResult] = None
+    # Seconds per pipeline stage ("compare_s", "pdf_render_s", ...) and "total_s"
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+def tracked_run(method):
+    """Track the stage timings of a pipeline run, attach them to its results and log them."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        with track_timings() as timings:
+            with stage(PIPELINE):
+                result = await method(self, *args, **kwargs)
+            for pipeline_result in (result.values() if isinstance(result, dict) else [result]):
+                pipeline_result.timings = timings.as_dict()
+        logger.info(f"Stage timings: {timings.summary()}")
+        return result
+    return wrapper
+
+
+class ResumePipeline:
+    """
+    Runs ATS analysis, enhancement, translation and PDF rendering for a resume on one event loop.
+
+    While the LLM analyses and enhances the resume, the translations of every field the
+    enhancer does not rewrite are pre-warmed into the translation memory.
+    """
+
+    def __init__(self, output_dir, template_dir, model=None, browser_pool=None, stream=None, translation_memory=None,
+                 translator=None):
+        self.output_dir = Path(output_dir)
+        self.template_dir = Path(template_dir)
+        self.model = model or get_default_model()
+        self.browser_pool = browser_pool or get_browser_pool()
+        # None uses the process-wide translation memory and translator client
+        self.translation_memory = translation_memory
+        self.translator = translator
+        # Stream LLM output so malformed responses are rejected before generation ends
+        if stream is None:
+            stream = os.environ.get('LLM_STREAMING', 'false').lower() == 'true'
+        self.stream = stream
+
+    def run(self, resume_path, **kwargs) -> PipelineResult:
+        """Synchronous entry point. Runs on the process-wide event loop service, so model
+        clients, translators and browsers are all used from the same long-lived loop."""
+        return run_sync(self.run_async(resume_path, **kwargs))
+
+    def run_languages(self, resume_path, languages, **kwargs) -> Dict[str, PipelineResult]:
+        """Synchronous entry point of run_languages_async."""
+        return run_sync(self.run_languages_async(resume_path, languages, **kwargs))
+
+    @tracked_run
+    async def run_async(self, resume_path, job_description=None, company_name="Unknown Company",
+                        job_title="", language="auto", resume_parser=None, job_id=None,
+                        persist=True) -> PipelineResult:
+        """Run the whole pipeline. The PDF is rendered in memory; persist=True also saves the
+        enhanced resume, the HTML and the PDF to disk."""
+        resume_path = Path(resume_path)
+        if resume_parser is None:
+            with stage(PARSE):
+                resume_parser = ResumeParser(resume_path)
+        language = self._resolve_language(language, job_description)
+        resume_path, resume_data, ats_result = await self._analyze_and_enhance(
+            resume_path, resume_parser, [language], job_description, company_name, job_title, job_id, persist)
+
+        logger.info("Starting resume generation")
+        generator = self._generator(resume_path, language)
+        html = await generator.render_html_async(resume_data)
+        pdf_bytes = await generator.html_to_pdf_bytes_async(html)
+        html_path = pdf_path = None
+        if persist:
+            html_path = write_atomic(generator.html_path, html).resolve()
+            pdf_path = write_atomic(generator.pdf_path, pdf_bytes)
+            logger.info(f"Resume generated successfully! PDF saved at: {pdf_path}")
+        else:
+            logger.info(f"Resume generated successfully in memory ({len(pdf_bytes)} bytes)")
+
+        return PipelineResult(
+            pdf_bytes=pdf_bytes,
+            pdf_path=pdf_path,
+            html_path=html_path,
+            resume_path=resume_path,
+            language=language,
+            company_name=company_name,
+            ats_result=ats_result,
+        )
+
+    @tracked_run
+    async def run_languages_async(self, resume_path, languages, job_description=None,
+                                  company_name="Unknown Company", job_title="", resume_parser=None,
+                                  job_id=None, persist=True) -> Dict[str, PipelineResult]:
+        """Render the resume in several languages in one pass; returns {language: PipelineResult}.
+
+        Parsing, ATS analysis and enhancement run once. The translatable strings are
+        deduplicated once for all languages, one template render is done per language and
+        all PDFs are printed in the same browser session. Files are saved with a _<language> suffix.
+        """
+        resume_path = Path(resume_path)
+        if resume_parser is None:
+            with stage(PARSE):
+                resume_parser = ResumeParser(resume_path)
+        languages = list(dict.fromkeys(self._resolve_language(language, job_description) for language in languages))
+        if not languages:
+            raise ValueError("At least one language is required")
+        resume_path, resume_data, ats_result = await self._analyze_and_enhance(
+            resume_path, resume_parser, languages, job_description, company_name, job_title, job_id, persist)
+
+        logger.info(f"Starting resume generation for {len(languages)} languages")
+        generator = self._generator(resume_path, languages[0])
+        htmls = await generator.render_languages_async(resume_data, languages)
+        pdfs = await generator.html_to_pdf_bytes_many_async(htmls)
+
+        results = {}
+        for language in languages:
+            html_path = pdf_path = None
+            if persist:
+                html_path = write_atomic(generator.html_path_for(language), htmls[language]).resolve()
+                pdf_path = write_atomic(html_path.with_suffix(".pdf"), pdfs[language])
+            results[language] = PipelineResult(
+                pdf_bytes=pdfs[language],
+                pdf_path=pdf_path,
+                html_path=html_path,
+                resume_path=resume_path,
+                language=language,
+                company_name=company_name,
+                ats_result=ats_result,
+            )
+        logger.info(f"Resumes generated successfully in {', '.join(languages)}")
+        return results
+
+    def _generator(self, resume_path, language):
+        return ResumeGenerator(resume_path, self.output_dir, self.template_dir, language,
+                               browser_pool=self.browser_pool, translation_memory=self.translation_memory,
+                               translator=self.translator)
+
+    @staticmethod
+    def _resolve_language(language, job_description):
+        if language != 'auto':
+            return language
+        if not job_description:
+            return 'en'
+        logger.info("Auto-detecting language from job description")
+        language = detect(job_description)
+        logger.info(f"Language detected: {language}")
+        return language
+
+    async def _analyze_and_enhance(self, resume_path, resume_parser, languages, job_description, company_name,
+                                   job_title, job_id, persist):
+        """ATS analysis and enhancement; returns (resume_path, resume_data, ats_result) to render."""
+        resume_data = resume_parser.data
+        if not job_description:
+            return resume_path, resume_data, None
+
+        prewarm = asyncio.gather(*(self._prewarm_translations(resume_path, resume_parser.data, language)
+                                   for language in languages))
+        try:
+            logger.info("Starting ATS analysis")
+            analyzer = await ResumeAnalyzer.create(job_description, resume_parser, model=self.model,
+                                                   stream=self.stream, on_partial=self._on_partial,
+                                                   job_id=job_id, company_name=company_name)
+            ats_result = await analyzer.acompare()
+            logger.info(f"ATS analysis completed - Score: {ats_result.ats_score}")
+
+            logger.info("Starting resume enhancement process")
+            enhancer = ResumeEnhancer(resume_path, company_name, job_title, model=self.model, job_id=job_id,
+                                      resume_text=resume_parser.text)
+            enhanced_path = await enhancer.aenhance_resume(ats_result, save=persist)
+            if persist:
+                resume_path = Path(enhanced_path)
+            # The enhanced structure is rendered directly instead of re-reading the saved file
+            resume_data = enhancer.resume_data
+        except Exception:
+            prewarm.cancel()
+            # Wait for the cancellation so no pre-warm keeps running on the shared loop
+            await asyncio.gather(prewarm, return_exceptions=True)
+            raise
+        await prewarm
+        return resume_path, resume_data, ats_result
+
+    @staticmethod
+    def _on_partial(field, value):
+        if field == 'ats_score':
+            logger.info(f"ATS score available before analysis finished: {value}")
+
+    @timed(TRANSLATION_PREWARM)
+    async def _prewarm_translations(self, resume_path, resume_data, language):
+        """Translate the labels and the current resume fields into the translation memory."""
+        if language == 'en':
+            return
+        try:
+            generator = self._generator(resume_path, language)
+            engine = generator.translation_engine
+            slots = engine.collect(resume_data)
+            await generator.prewarm_translations_async(language, [slot.text for slot in slots],
+                                                       engine.technical_texts(slots))
+        except Exception as e:
+            # Pre-warming is an optimization only; rendering translates whatever is missing
+            logger.warning(f"Translation pre-warm failed: {e}")
@@ -0,0 +1,214 @@
+import os
+import atexit
+import asyncio
+import threading
+import logging
+from urllib.parse import urlparse
+from contextlib import asynccontextmanager
+from browser_pool import browser_launch_options, open_browser, release_browser
+from event_loop_service import EventLoopService, get_event_loop_service
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# off: load everything; lean: block images, media, fonts, stylesheets and trackers;
+# document: only the HTML document itself is fetched (no scripts, so no modals to dismiss)
+INTERCEPT_MODES = ("off", "lean", "document")
+LEAN_BLOCKED_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "manifest", "other"}
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net",
+    "ads.linkedin.com", "px.ads.linkedin.com", "snap.licdn.com", "bat.bing.com", "hotjar.com",
+)
+
+
+def is_tracker(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == tracker or host.endswith("." + tracker) for tracker in TRACKER_HOSTS)
+
+
+class ScraperSession:
+    """
+    A long-lived browser with a few reusable pages for scraping job postings.
+
+    Like the BrowserPool, the session lives on the process-wide event loop service, because
+    pyppeteer objects are bound to the loop they were created on. Each scrape uses one page
+    exclusively; pages and the browser are re-created when they crash. Closing the session
+    only kills the processes of the browser it launched; with a supervisor_url it connects
+    to a supervised browser instead and only disconnects on close.
+    """
+
+    def __init__(self, intercept="document", launch_options=None, navigation_timeout=30000, pages=1,
+                 supervisor_url=None, loop_service: EventLoopService = None):
+        if intercept not in INTERCEPT_MODES:
+            raise ValueError(f"Unsupported intercept mode '{intercept}', expected one of {INTERCEPT_MODES}")
+        if pages < 1:
+            raise ValueError("ScraperSession needs at least one page")
+        logger.info(f"Initializing ScraperSession - intercept mode: {intercept}, pages: {pages}")
+        self.intercept = intercept
+        self.launch_options = launch_options or browser_launch_options()
+        self.navigation_timeout = navigation_timeout
+        self.pages = pages
+        self.supervisor_url = supervisor_url
+        self.loop_service = loop_service or get_event_loop_service()
+
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(pages)
+        self._browser = None
+        self._disconnected = False
+        self._idle_pages = []
+        self._closed = False
+        self.stats = {"launches": 0, "scrapes": 0, "blocked": 0, "allowed": 0}
+
+    @property
+    def scripts_enabled(self) -> bool:
+        return self.intercept != "document"
+
+    # ------------------------------------------------------------------
+    # Event loop management
+    # ------------------------------------------------------------------
+    @property
+    def loop(self):
+        if self._closed:
+            raise RuntimeError("ScraperSession has been shut down")
+        return self.loop_service.loop
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the session's event loop and block until it finishes."""
+        return self.loop_service.run(coro, timeout)
+
+    async def run_async(self, coro):
+        """Await a coroutine on the session's event loop from any event loop."""
+        return await self.loop_service.run_async(coro)
+
+    # ------------------------------------------------------------------
+    # Page
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def page(self):
+        """Check out one of the session's pages. Must be used from the session's event loop."""
+        if asyncio.get_running_loop() is not self.loop_service.loop:
+            raise RuntimeError("ScraperSession.page() must be used on the session's event loop; use run() or run_async()")
+        if self._closed:
+            raise RuntimeError("ScraperSession has been shut down")
+
+        async with self._slots:
+            page = await self._checkout()
+            try:
+                yield page
+            except Exception:
+                # The page may be stuck mid-navigation or its browser gone; start fresh next time
+                await self._close_page(page)
+                raise
+            else:
+                # Pages of a browser that was relaunched meanwhile are not reused
+                if page.browser is self._browser:
+                    self._idle_pages.append(page)
+            finally:
+                self.stats["scrapes"] += 1
+
+    async def _checkout(self):
+        async with self._lock:
+            if self._browser is not None and not self._browser_alive():
+                logger.warning("Scraper browser is gone - relaunching")
+                await self._close_browser()
+            if self._browser is None:
+                logger.info("Launching scraper browser")
+                self._browser = await open_browser(self.launch_options, self.supervisor_url, self.stats["launches"])
+                self._disconnected = False
+                self._browser.on('disconnected', self._on_disconnected)
+                self.stats["launches"] += 1
+            while self._idle_pages:
+                page = self._idle_pages.pop()
+                if not page.isClosed():
+                    return page
+            page = await self._browser.newPage()
+            page.setDefaultNavigationTimeout(self.navigation_timeout)
+            if self.intercept != "off":
+                await page.setRequestInterception(True)
+                page.on('request', self._on_request)
+            if not self.scripts_enabled:
+                await page.setJavaScriptEnabled(False)
+            logger.debug(f"Scraper page ready (intercept: {self.intercept})")
+            return page
+
+    def _on_disconnected(self):
+        self._disconnected = True
+
+    def _browser_alive(self):
+        process = getattr(self._browser, 'process', None)
+        return not self._disconnected and (process is None or process.poll() is None)
+
+    def _allows(self, request) -> bool:
+        if self.intercept == "document":
+            return request.resourceType == "document"
+        return request.resourceType not in LEAN_BLOCKED_TYPES and not is_tracker(request.url)
+
+    def _on_request(self, request):
+        if request.url.startswith("data:"):
+            asyncio.ensure_future(request.continue_())
+        elif self._allows(request):
+            self.stats["allowed"] += 1
+            asyncio.ensure_future(request.continue_())
+        else:
+            self.stats["blocked"] += 1
+            asyncio.ensure_future(request.abort())
+
+    async def _close_page(self, page):
+        try:
+            await page.close()
+        except Exception as e:
+            logger.debug(f"Error while closing scraper page: {e}")
+
+    # ------------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------------
+    async def _close_browser(self):
+        pages, self._idle_pages = self._idle_pages, []
+        browser, self._browser = self._browser, None
+        if browser is None:
+            return
+        try:
+            await release_browser(browser, pages)
+        except Exception as e:
+            logger.warning(f"Error while closing scraper browser: {e}")
+        logger.debug("Scraper browser closed")
+
+    def shutdown(self, timeout=30):
+        """Close the session's browser; the shared event loop keeps running."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._browser is None or not self.loop_service.running:
+            return
+
+        logger.info("Shutting down ScraperSession")
+        try:
+            self.loop_service.run(self._close_browser(), timeout)
+        except Exception as e:
+            logger.warning(f"Error while closing scraper browser: {e}")
+        logger.info(f"ScraperSession shut down - stats: {self.stats}")
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def get_scraper_session():
+    """Return the process-wide scraper session, creating it on first use."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = ScraperSession(intercept=os.environ.get('SCRAPER_INTERCEPT', 'document').lower(),
+                                             pages=int(os.environ.get('SCRAPER_PAGES', 2)),
+                                             supervisor_url=os.environ.get('BROWSER_SUPERVISOR_URL') or None)
+            atexit.register(shutdown_scraper_session)
+        return _shared_session
+
+
+def shutdown_scraper_session():
+    """Shut down the process-wide scraper session if it was created."""
+    global _shared_session
+    with _shared_session_lock:
+        session, _shared_session = _shared_session, None
+    if session is not None:
+        session.shutdown()
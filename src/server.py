@@ -3,18 +3,24 @@ import logging
 import tempfile
 import yaml
 from pathlib import Path
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, g
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-from langdetect import detect
+import io
 import uuid
 import json
+import zipfile
+import threading
 # Import the modules from main.py
 from resume_parser import ResumeParser
-from resume_generator import ResumeGenerator
-from resume_enhancer import ResumeEnhancer 
-from resume_analyzer import ResumeAnalyzer
+from resume_pipeline import ResumePipeline
+from browser_pool import get_browser_pool
 from job_data import JobData
+from model_registry import get_default_model
+from job_queue import get_job_queue, WorkerPool, DONE, FAILED
+from result_cache import ResultCache, get_result_cache, file_fingerprint
+from resume_generator import write_atomic
+from stage_timing import stage, begin_timings, end_timings, current_timings, get_stage_metrics, PARSE
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
@@ -27,6 +33,8 @@ INPUT_FOLDER = project_root / 'input'
 ALLOWED_EXTENSIONS = {'yaml', 'yml', 'txt'}
 app.config['INPUT_FOLDER'] = str(INPUT_FOLDER)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+OUTPUT_FOLDER = project_root / 'output' / 'generated_resume'
+EXAMPLE_DIR = project_root / 'example'
 
 logger.info(f"Server configuration:")
 logger.info(f"  - Project root: {project_root}")
@@ -55,6 +63,175 @@ def setup_logging(log_path: Path):
     )
     logger.info(f"Logging configured - log file: {log_path}")
 
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+def start_job_workers():
+    """Start the job workers of this process; they also resume jobs left behind by stopped servers.
+    Runs when the app is loaded and in every forked WSGI worker, since threads do not survive a fork."""
+    global _worker_pool
+    if is_reloader_parent():
+        return None
+    with _worker_pool_lock:
+        if _worker_pool is None or _worker_pool.pid != os.getpid():
+            _worker_pool = WorkerPool(get_job_queue(), run_queued_job, workers=int(os.environ.get('JOB_WORKERS', 2)))
+            _worker_pool.start()
+        return _worker_pool
+
+def restart_job_workers_after_fork():
+    global _worker_pool_lock
+    # The parent may have held the lock while forking
+    _worker_pool_lock = threading.Lock()
+    start_job_workers()
+
+def get_worker_pool():
+    """The job workers running in this process, or None."""
+    pool = _worker_pool
+    return pool if pool is not None and pool.pid == os.getpid() else None
+
+def is_reloader_parent():
+    """The debug reloader's watcher process only restarts the server; it must not run jobs."""
+    return os.environ.get('FLASK_ENV') == 'development' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+
+def run_resume_pipeline(resume_path, job_data_dict, language, resume_parser=None, request_id="", persist=True,
+                        languages=None):
+    """Run analysis, enhancement, translation and rendering for one request on the shared event loop.
+    With a list of languages all of them are rendered in one pass and {language: result} is returned."""
+    if job_data_dict:
+        job_data_object = JobData(**job_data_dict)
+        job_id, job_title, job_description, company_name = job_data_object.get_job_data()
+    else:
+        # No job data provided - use default values
+        job_id = None
+        job_title = None
+        job_description = None
+        company_name = "Unknown Company"
+        logger.info(f"[{request_id}] No job data provided - proceeding with basic resume generation")
+    
+    logger.info(f"[{request_id}] Starting resume pipeline")
+    logger.debug(f"[{request_id}] Using template directory: {EXAMPLE_DIR}")
+    OUTPUT_FOLDER.mkdir(exist_ok=True)
+    
+    pipeline = ResumePipeline(OUTPUT_FOLDER, EXAMPLE_DIR, model=get_default_model(), browser_pool=get_browser_pool())
+    if languages:
+        return pipeline.run_languages(
+            resume_path,
+            languages,
+            job_description=job_description,
+            company_name=company_name,
+            job_title=job_title,
+            resume_parser=resume_parser,
+            job_id=job_id,
+            persist=persist
+        )
+    return pipeline.run(
+        resume_path,
+        job_description=job_description,
+        company_name=company_name,
+        job_title=job_title,
+        language=language,
+        resume_parser=resume_parser,
+        job_id=job_id,
+        persist=persist
+    )
+
+def run_queued_job(params):
+    """Worker handler: run the pipeline for a queued request and return the response data."""
+    result = run_resume_pipeline(Path(params['resume_path']), params.get('job_data'), params.get('language', 'auto'),
+                                 request_id=params.get('request_id', ''))
+    return {
+        "status": "success",
+        "message": "Resume generated successfully",
+        "pdf_path": str(result.pdf_path),
+        "company_name": result.company_name,
+        "language": result.language,
+        "timings": result.timings
+    }
+
+def generation_settings():
+    """Environment settings that change the generated resume; part of the result cache key."""
+    glossary_path = os.environ.get('TRANSLATION_GLOSSARY')
+    glossary = file_fingerprint(glossary_path) if glossary_path and Path(glossary_path).is_file() else ""
+    return (f"ats={os.environ.get('ATS_MODE', 'llm').lower()}:"
+            f"streaming={os.environ.get('LLM_STREAMING', 'false').lower()}:"
+            f"strip={os.environ.get('JOB_DESCRIPTION_STRIP', 'true').lower()}:"
+            f"translation_filter={os.environ.get('TRANSLATION_FILTER', 'true').lower()}:"
+            f"glossary={glossary}")
+
+def result_cache_key(resume_bytes, job_data_dict, language):
+    """Key over everything that determines the PDF and its name: resume, job (with its id), language,
+    template, model and settings."""
+    model = get_default_model()
+    model_id = (f"{model.model_provider}/{model.model_name}:"
+                f"{json.dumps(model.model_params, sort_keys=True, default=str)}:"
+                f"{generation_settings()}")
+    template_version = file_fingerprint(EXAMPLE_DIR / 'resume_template.html', EXAMPLE_DIR / 'styles.css')
+    return ResultCache.make_key(
+        resume_bytes,
+        job_data_dict.get('job_description'),
+        job_data_dict.get('company_name', 'Unknown Company'),
+        job_data_dict.get('job_title'),
+        language,
+        template_version,
+        model_id,
+        job_data_dict.get('job_id')
+    )
+
+def pdf_etag(cache_key):
+    """Validator of the PDF bytes. JSON bodies carry per-run data (timings, paths) and get none."""
+    return f"{cache_key}-pdf"
+
+def pdf_response(pdf_bytes, download_name, language, etag=None):
+    """Send PDF bytes from memory"""
+    response = send_file(io.BytesIO(pdf_bytes), mimetype='application/pdf',
+                         as_attachment=True, download_name=download_name)
+    response.headers['X-Resume-Language'] = language
+    if etag:
+        response.set_etag(etag)
+    return response
+
+def multi_language_response(request_id, results, download_stem, wants_pdf):
+    """Answer a multi-language request: a ZIP of the PDFs, or JSON with one entry per language."""
+    if wants_pdf:
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for language, result in results.items():
+                zip_file.writestr(f"{download_stem}_{language}.pdf", result.pdf_bytes)
+        logger.info(f"[{request_id}] Sending {len(results)} PDFs as ZIP ({archive.tell()} bytes)")
+        archive.seek(0)
+        response = send_file(archive, mimetype='application/zip', as_attachment=True,
+                             download_name=f"{download_stem}.zip")
+        response.headers['X-Resume-Language'] = ",".join(results)
+        return response
+    
+    first = next(iter(results.values()))
+    return jsonify({
+        "status": "success",
+        "message": "Resumes generated successfully",
+        "company_name": first.company_name,
+        "resumes": [{"language": language, "pdf_path": str(result.pdf_path)} for language, result in results.items()],
+        "timings": current_timings().as_dict()
+    })
+
+def cached_result_response(request_id, cache_key, pdf_bytes, metadata, wants_pdf):
+    """Answer from the result cache; JSON responses get their PDF restored on disk if needed."""
+    logger.info(f"[{request_id}] Result cache hit - {len(pdf_bytes)} PDF bytes")
+    if wants_pdf:
+        return pdf_response(pdf_bytes, metadata['pdf_name'], metadata['language'], etag=pdf_etag(cache_key))
+    
+    pdf_path = OUTPUT_FOLDER / metadata['pdf_name']
+    if not pdf_path.exists():
+        OUTPUT_FOLDER.mkdir(exist_ok=True)
+        write_atomic(pdf_path, pdf_bytes)
+    return jsonify({
+        "status": "success",
+        "message": "Resume generated successfully",
+        "pdf_path": str(pdf_path),
+        "company_name": metadata['company_name'],
+        "language": metadata['language'],
+        "cached": True
+    })
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     logger.debug(f"Checking if file is allowed: {filename}")
@@ -74,6 +251,11 @@ def health_check():
     logger.info("Health check completed successfully")
     return jsonify(response)
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus latency histograms per pipeline stage (this worker process only)"""
+    return app.response_class(get_stage_metrics().render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/generate-resume', methods=['POST'])
 def generate_resume():
     """
@@ -82,6 +264,15 @@ def generate_resume():
     - resume_file: YAML resume file
     - job_data: JSON string with format: {"job_id": "123", "job_title": "Software Engineer", "job_description": "...", "company_name": "Company"} (optional)
     - language: Language for resume (optional, defaults to 'auto')
+    - languages: Comma-separated languages rendered in one pass, e.g. 'en,de,fr' (optional);
+      answered with a ZIP of the PDFs for PDF responses, otherwise with one JSON entry per language
+    - async: 'true' to queue the request and return a job id at once (optional)
+      Poll GET /jobs/<job_id> and download the PDF from GET /jobs/<job_id>/result
+    - response_format: 'pdf' (or an Accept: application/pdf header) to receive the PDF bytes
+      rendered in memory instead of a JSON body with a path (optional)
+    - persist: 'true' to also save the files of a PDF response on disk (optional)
+    Identical inputs are answered from the result cache. PDF responses carry an ETag; a matching
+    If-None-Match header gets 304. Cache-Control: no-cache forces regeneration.
     """
     request_id = str(uuid.uuid4())[:8]  # Short request ID for tracking
     client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', 'Unknown'))
@@ -110,6 +301,11 @@ def generate_resume():
             return jsonify({"error": "No resume file selected"}), 400
         
         logger.info(f"[{request_id}] Resume file received: {resume_file.filename}")
+        run_async = request.form.get('async', 'false').lower() == 'true'
+        wants_pdf = (request.form.get('response_format', '').lower() == 'pdf' or
+                     request.accept_mimetypes.best == 'application/pdf')
+        # JSON responses point at files on disk, so only PDF responses can skip writing them
+        persist = not wants_pdf or request.form.get('persist', 'false').lower() == 'true'
         
         if not allowed_file(resume_file.filename):
             logger.warning(f"[{request_id}] Invalid file type: {resume_file.filename}")
@@ -117,10 +313,15 @@ def generate_resume():
         
         logger.debug(f"[{request_id}] Saving uploaded resume file")
         filename = secure_filename(resume_file.filename)
+        if run_async:
+            # Queued jobs run later, so later uploads with the same name must not replace this file
+            filename = f"{request_id}_{filename}"
         # Check if original filename exists and create backup if needed
         resume_path = Path(app.config['INPUT_FOLDER']) / filename
         try:
-            resume_file.save(resume_path)
+            # The upload is read once; the bytes feed the saved file, the cache key and the parser
+            resume_bytes = resume_file.read()
+            write_atomic(resume_path, resume_bytes)
             logger.info(f"[{request_id}] Resume file saved successfully: {resume_path}")
         except Exception as e:
             logger.error(f"[{request_id}] Failed to save resume file: {e}")
@@ -129,10 +330,13 @@ def generate_resume():
         # Get job data
         job_data = request.form.get('job_data')
         language = request.form.get('language', 'auto')
+        languages = [lang.strip() for lang in request.form.get('languages', '').split(',') if lang.strip()]
         
         logger.info(f"[{request_id}] Request parameters:")
         logger.info(f"[{request_id}]   - Job data: {job_data}")
         logger.info(f"[{request_id}]   - Language: {language}")
+        if languages:
+            logger.info(f"[{request_id}]   - Languages: {languages}")
         
         # Parse job data from JSON string
         try:
@@ -158,91 +362,102 @@ def generate_resume():
             logger.error(f"[{request_id}] Error processing job data: {e}")
             return jsonify({"error": f"Error processing job data: {str(e)}"}), 400
         
-        # Create output directory - use generated_resume subdirectory
-        logger.debug(f"[{request_id}] Setting up output directory")
-        project_root = Path(__file__).parent.parent
-        output_dir = project_root / 'output' / 'generated_resume'
-        output_dir.mkdir(exist_ok=True)
-        logger.debug(f"[{request_id}] Output directory ready: {output_dir}")
+        # Identical inputs always produce the same PDF
+        # Multi-language results are not cached; their key would collide with the single-language one
+        result_cache = None if run_async or languages else get_result_cache()
+        cache_key = None
+        if result_cache is not None:
+            cache_key = result_cache_key(resume_bytes, job_data_dict, language)
+            no_cache = request.cache_control.no_cache
+            if wants_pdf and not no_cache and request.if_none_match.contains(pdf_etag(cache_key)):
+                logger.info(f"[{request_id}] Client copy is current (ETag {cache_key[:12]}...)")
+                response = app.response_class(status=304)
+                response.set_etag(pdf_etag(cache_key))
+                return response
+            if not no_cache:
+                cached = result_cache.get(cache_key)
+                if cached is not None:
+                    return cached_result_response(request_id, cache_key, *cached, wants_pdf)
         
         logger.info(f'[{request_id}] Starting AI Resume Creator processing...')
         
         # Load resume
         logger.info(f"[{request_id}] Loading and parsing resume")
         try:
-            resume_parser = ResumeParser(resume_path)
+            with stage(PARSE):
+                resume_parser = ResumeParser(resume_bytes)
             logger.info(f"[{request_id}] Resume parsed successfully")
         except Exception as e:
             logger.error(f"[{request_id}] Failed to parse resume: {e}")
             return jsonify({"error": f"Failed to parse resume: {str(e)}"}), 500
         
-        resume_lang = language
-        # Process job description if provided
-        if job_data_dict:
-            job_data_object = JobData(**job_data_dict)
-            job_id, job_title, job_description, company_name = job_data_object.get_job_data()
-        else:
-            # No job data provided - use default values
-            job_id = None
-            job_title = None
-            job_description = None
-            company_name = "Unknown Company"
-            logger.info(f"[{request_id}] No job data provided - proceeding with basic resume generation")
-        
-        # If job description is provided, enhance the resume
-        if job_description:
-            logger.info(f"[{request_id}] Starting resume enhancement process")
+        if languages:
+            if run_async:
+                logger.warning(f"[{request_id}] Multi-language requests cannot be queued")
+                return jsonify({"error": "languages cannot be combined with async"}), 400
             try:
-                logger.debug(f"[{request_id}] Running ATS analysis")
-                ra = ResumeAnalyzer(job_description, resume_parser)
-                ats_result = ra.compare()
-                logger.info(f"[{request_id}] ATS analysis completed - Score: {ats_result.ats_score}")
-                
-                logger.debug(f"[{request_id}] Enhancing resume based on ATS results")
-                resume_enhancer = ResumeEnhancer(resume_path, company_name, job_title)
-                enhanced_resume_path = resume_enhancer.enhance_resume(ats_result)
-                logger.info(f"[{request_id}] Resume enhanced successfully: {enhanced_resume_path}")
-                
-                # Use enhanced resume for generation
-                resume_parser = ResumeParser(enhanced_resume_path)
-                
-                if resume_lang == 'auto':
-                    logger.debug(f"[{request_id}] Auto-detecting language from job description")
-                    resume_lang = detect(job_description)
-                    logger.info(f"[{request_id}] Language detected: {resume_lang}")
-                    
+                results = run_resume_pipeline(resume_path, job_data_dict, language, resume_parser, request_id,
+                                              persist=persist, languages=languages)
             except Exception as e:
-                logger.error(f"[{request_id}] Resume enhancement failed: {e}")
-                return jsonify({"error": f"Resume enhancement failed: {str(e)}"}), 500
+                logger.error(f"[{request_id}] Resume generation failed: {e}")
+                return jsonify({"error": f"Resume generation failed: {str(e)}"}), 500
+            company_name = next(iter(results.values())).company_name
+            download_stem = f"{Path(filename).stem}_{secure_filename(company_name)}"
+            return multi_language_response(request_id, results, download_stem, wants_pdf)
+        
+        if run_async:
+            queue_job_id = get_job_queue().submit({
+                "resume_path": str(resume_path),
+                "job_data": job_data_dict,
+                "language": language,
+                "request_id": request_id
+            })
+            worker_pool = get_worker_pool()
+            if worker_pool is not None:
+                worker_pool.notify()
+            logger.info(f"[{request_id}] Resume generation queued as job {queue_job_id}")
+            return jsonify({
+                "status": "queued",
+                "job_id": queue_job_id,
+                "status_url": f"/jobs/{queue_job_id}",
+                "result_url": f"/jobs/{queue_job_id}/result"
+            }), 202
         
-        # Generate resume using synchronous methods
-        logger.info(f"[{request_id}] Starting resume generation")
         try:
-            example_dir = Path(__file__).parent.parent / "example"
-            logger.debug(f"[{request_id}] Using template directory: {example_dir}")
-            
-            actual_resume_path = enhanced_resume_path if job_description else resume_path
-            resume_generator = ResumeGenerator(actual_resume_path, output_dir, example_dir, resume_lang)            
-            # Generate HTML and PDF using synchronous methods with proper event loop handling
-            logger.info(f"[{request_id}] Generating HTML resume")
-            resume_html = resume_generator.generate_html(resume_parser.data)
+            result = run_resume_pipeline(resume_path, job_data_dict, language, resume_parser, request_id,
+                                         persist=persist)
+            pdf_path = result.pdf_path
+            company_name = result.company_name
+            resume_lang = result.language
             
-            logger.info(f"[{request_id}] Converting HTML to PDF")
-            pdf_path = resume_generator.html_to_pdf(resume_html)
-            
-            logger.info(f'[{request_id}] Resume generated successfully: {pdf_path}')
+            logger.info(f'[{request_id}] Resume generated successfully: {pdf_path or "in memory"}')
             
         except Exception as e:
             logger.error(f"[{request_id}] Resume generation failed: {e}")
             return jsonify({"error": f"Resume generation failed: {str(e)}"}), 500
         
+        download_name = pdf_path.name if pdf_path else f"{Path(filename).stem}_{secure_filename(company_name)}.pdf"
+        if result_cache is not None:
+            try:
+                result_cache.set(cache_key, result.pdf_bytes,
+                                 {"pdf_name": download_name, "company_name": company_name, "language": resume_lang})
+            except Exception as e:
+                logger.warning(f"[{request_id}] Failed to store result in cache: {e}")
+        
+        if wants_pdf:
+            logger.info(f'[{request_id}] Streaming {len(result.pdf_bytes)} PDF bytes')
+            return pdf_response(result.pdf_bytes, download_name, resume_lang,
+                                etag=pdf_etag(cache_key) if cache_key else None)
+        
         # Prepare response
         response_data = {
             "status": "success",
             "message": "Resume generated successfully",
             "pdf_path": str(pdf_path),
             "company_name": company_name,
-            "language": resume_lang
+            "language": resume_lang,
+            # Pipeline stages plus the request's own (upload parsing), and the request total
+            "timings": current_timings().as_dict()
         }
         
         logger.info(f'[{request_id}] Resume generation completed successfully!')
@@ -263,6 +478,44 @@ def generate_resume():
         logger.error(f'[{request_id}] Unexpected error occurred: {e}', exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status of a queued resume generation job"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        logger.warning(f"Unknown job requested: {job_id}")
+        return jsonify({"error": f"Job not found: {job_id}"}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Serve the PDF of a finished job; 202 while it is still queued or running"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        logger.warning(f"Unknown job result requested: {job_id}")
+        return jsonify({"error": f"Job not found: {job_id}"}), 404
+    if job["status"] == FAILED:
+        return jsonify({"error": f"Resume generation failed: {job['error']}", "job_id": job_id}), 500
+    if job["status"] != DONE:
+        return jsonify({"status": job["status"], "job_id": job_id}), 202
+    
+    pdf_path = Path(job["result"]["pdf_path"])
+    if not pdf_path.exists():
+        logger.error(f"PDF of job {job_id} no longer exists: {pdf_path}")
+        return jsonify({"error": "Generated PDF no longer available"}), 410
+    return send_file(pdf_path, mimetype='application/pdf', as_attachment=True, download_name=pdf_path.name)
+
+# Track the pipeline stage timings of every request
+@app.before_request
+def start_stage_timings():
+    g.stage_timings_token = begin_timings()
+
+@app.teardown_request
+def end_stage_timings(exc):
+    token = g.pop('stage_timings_token', None)
+    if token is not None:
+        end_timings(token)
+
 # Add request logging middleware
 @app.before_request
 def log_request_info():
@@ -277,6 +530,10 @@ def log_response_info(response):
     logger.debug(f"Response: {response.status_code} for {request.method} {request.path} to {client_ip}")
     return response
 
+# Resume queued jobs as soon as the app is loaded, also under a WSGI server
+start_job_workers()
+os.register_at_fork(after_in_child=restart_job_workers_after_fork)
+
 if __name__ == '__main__':
     logger.info("Initializing AI Resume Creator Flask Server...")
     
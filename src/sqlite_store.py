@@ -0,0 +1,61 @@
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Default location for on-disk caches and stores
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "output" / "cache"
+
+
+class SQLiteStore:
+    """
+    Base class for small SQLite-backed stores.
+
+    One connection is shared by all threads of the process and guarded by a lock.
+    WAL mode and a busy timeout let several processes use the same file.
+    Subclasses define SCHEMA.
+    """
+
+    SCHEMA = ""
+    # Seconds a write waits for another connection's lock
+    BUSY_TIMEOUT = 30
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        try:
+            self._conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            logger.debug(f"{type(self).__name__} opened at {self.db_path}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open {type(self).__name__} at {self.db_path}: {e}")
+            raise
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction; rolls back on error."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,160 @@
+"""
+Stage-level latency instrumentation for the resume pipeline.
+
+Wrap a stage in `with stage("compare"):` (also around awaits). Every span is observed in
+the process-wide Prometheus histograms served on /metrics, and added to the timings of
+the current request when one is being tracked (track_timings / begin_timings). The
+current request travels in a context variable, so spans recorded on the shared event
+loop are attributed to the request that submitted the work.
+"""
+import time
+import bisect
+import functools
+import inspect
+import threading
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Stage names used by the pipeline
+PARSE = "parse"
+SKILL_EXTRACTION = "skill_extraction"
+COMPARE = "compare"
+SUMMARY = "summary"
+TRANSLATION_PREWARM = "translation_prewarm"
+TRANSLATION = "translation"
+HTML_RENDER = "html_render"
+PDF_RENDER = "pdf_render"
+PIPELINE = "pipeline"
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+METRIC_NAME = "resume_stage_duration_seconds"
+
+
+class StageTimings:
+    """Stage durations of one request in seconds; a stage that runs several times is summed."""
+
+    def __init__(self):
+        self.durations = {}
+        self.started_at = time.perf_counter()
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def as_dict(self) -> dict:
+        timings = {f"{name}_s": round(seconds, 3) for name, seconds in self.durations.items()}
+        timings["total_s"] = round(time.perf_counter() - self.started_at, 3)
+        return timings
+
+    def summary(self) -> str:
+        """One log line, slowest stage first."""
+        stages = sorted(self.durations.items(), key=lambda item: item[1], reverse=True)
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in stages]
+        return ", ".join(parts + [f"total {time.perf_counter() - self.started_at:.2f}s"])
+
+
+class StageHistograms:
+    """Cumulative latency histograms per stage, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._sums = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            counts = self._counts.setdefault(name, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._sums[name] = self._sums.get(name, 0.0) + seconds
+
+    def count(self, name) -> int:
+        with self._lock:
+            return sum(self._counts.get(name, ()))
+
+    def render(self) -> str:
+        lines = [f"# HELP {METRIC_NAME} Duration of resume pipeline stages in seconds.",
+                 f"# TYPE {METRIC_NAME} histogram"]
+        with self._lock:
+            for name in sorted(self._counts):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), self._counts[name]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{METRIC_NAME}_sum{{stage="{name}"}} {self._sums[name]!r}')
+                lines.append(f'{METRIC_NAME}_count{{stage="{name}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+_metrics = StageHistograms()
+_current_timings = ContextVar("stage_timings", default=None)
+
+
+def get_stage_metrics() -> StageHistograms:
+    """Return the process-wide stage histograms."""
+    return _metrics
+
+
+def current_timings():
+    """Timings of the request being tracked in this context, or None."""
+    return _current_timings.get()
+
+
+def begin_timings():
+    """Start tracking a request in the current context; returns a token for end_timings()."""
+    return _current_timings.set(StageTimings())
+
+
+def end_timings(token):
+    _current_timings.reset(token)
+
+
+@contextmanager
+def track_timings():
+    """Track the stages of a request; reuses the timings of an enclosing tracked request."""
+    timings = _current_timings.get()
+    if timings is not None:
+        yield timings
+        return
+    token = begin_timings()
+    try:
+        yield _current_timings.get()
+    finally:
+        end_timings(token)
+
+
+@contextmanager
+def stage(name):
+    """Timing span around one pipeline stage; failed stages are recorded too."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        _metrics.observe(name, elapsed)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+        logger.debug(f"Stage {name} took {elapsed:.3f}s")
+
+
+def timed(name):
+    """Decorator form of stage() for sync and async functions."""
+    def decorate(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
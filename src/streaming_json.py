@@ -0,0 +1,230 @@
+import json
+import typing
+import logging
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+_CODE_FENCES = ("```json", "```")
+
+
+class SchemaMismatchError(ValueError):
+    """Raised as soon as streamed output can no longer match the expected model."""
+
+
+class _FieldSpec:
+    """What the parser knows about one top-level field of a pydantic model."""
+
+    def __init__(self, annotation, required):
+        self.adapter = TypeAdapter(annotation)
+        self.required = required
+        origin = typing.get_origin(annotation) or annotation
+        self.container = {list: "[", dict: "{"}.get(origin)
+        args = typing.get_args(annotation)
+        item = typing.get_origin(args[0]) or args[0] if origin is list and args else None
+        self.item_container = {list: "[", dict: "{"}.get(item)
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object validated against a pydantic model.
+
+    Chunks are fed as they arrive. Each top-level field is validated as soon as its
+    value is complete and reported through on_field, so callers can use e.g. ats_score
+    before the generation finishes. Extra keys are ignored, like pydantic does.
+    """
+
+    def __init__(self, model: typing.Type[BaseModel], on_field=None):
+        self.model = model
+        self.on_field = on_field
+        self.specs = {name: _FieldSpec(field.annotation, field.is_required())
+                      for name, field in model.model_fields.items()}
+        self.fields = {}
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._token_start = None
+        self._after_comma = False
+
+    @property
+    def done(self):
+        return self._state == "done"
+
+    def _fail(self, reason):
+        snippet = self._buffer[max(0, self._pos - 40):self._pos + 1]
+        raise SchemaMismatchError(f"{self.model.__name__} stream rejected at char {self._pos}: {reason} (near {snippet!r})")
+
+    def feed(self, chunk: str):
+        """Consume a chunk; raises SchemaMismatchError as soon as the output cannot match."""
+        self._buffer += chunk
+        while self._pos < len(self._buffer):
+            if self._state == "start" and not self._skip_prefix():
+                return  # Need more data to decide about a code fence
+            if self._pos >= len(self._buffer):
+                return
+            self._step(self._buffer[self._pos])
+            self._pos += 1
+
+    def _skip_prefix(self):
+        """Skip leading whitespace and an optional ```json fence before the object."""
+        rest = self._buffer[self._pos:].lstrip(_WHITESPACE)
+        self._pos = len(self._buffer) - len(rest)
+        if rest.startswith("`"):
+            if any(fence.startswith(rest) and len(rest) < len(fence) for fence in _CODE_FENCES):
+                return False
+            for fence in _CODE_FENCES:
+                if rest.startswith(fence):
+                    self._pos += len(fence)
+                    return self._skip_prefix()
+        return True
+
+    def _step(self, char):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._state == "key_string":
+                    self._key = json.loads(self._buffer[self._token_start:self._pos + 1])
+                    self._state = "colon"
+                elif self._state == "value_string":
+                    self._complete_value(self._pos + 1)
+            return
+
+        if self._state == "start":
+            if char != "{":
+                self._fail("output is not a JSON object")
+            self._state = "key"
+        elif self._state == "done":
+            if char not in _WHITESPACE and char != "`":
+                self._fail("data after the closing brace")
+        elif self._state == "key":
+            if char in _WHITESPACE:
+                return
+            if char == '"':
+                self._in_string = True
+                self._token_start = self._pos
+                self._state = "key_string"
+            elif char == "}" and not self._after_comma:
+                self._finish()
+            else:
+                self._fail("expected a key")
+        elif self._state == "colon":
+            if char == ":":
+                self._state = "value"
+            elif char not in _WHITESPACE:
+                self._fail("expected ':'")
+        elif self._state == "value":
+            if char in _WHITESPACE:
+                return
+            self._token_start = self._pos
+            spec = self.specs.get(self._key)
+            if spec and spec.container and char != spec.container:
+                self._fail(f"field '{self._key}' must start with '{spec.container}'")
+            if char == '"':
+                self._in_string = True
+                self._state = "value_string"
+            elif char in "{[":
+                self._stack.append(char)
+                self._state = "value_nested"
+            else:
+                self._state = "value_scalar"
+        elif self._state == "value_scalar":
+            if char in _WHITESPACE or char in ",}":
+                self._complete_value(self._pos)
+                self._step(char)
+        elif self._state == "value_nested":
+            self._step_nested(char)
+        elif self._state == "comma":
+            if char == ",":
+                self._state = "key"
+                self._after_comma = True
+            elif char == "}":
+                self._finish()
+            elif char not in _WHITESPACE:
+                self._fail("expected ',' or '}'")
+
+    def _step_nested(self, char):
+        if char in _WHITESPACE:
+            return
+        spec = self.specs.get(self._key)
+        # Items of a top-level list must have the expected shape (e.g. list[dict])
+        if (spec and spec.item_container and len(self._stack) == 1 and self._stack[0] == "["
+                and char not in ",]" and char != spec.item_container):
+            self._fail(f"items of '{self._key}' must start with '{spec.item_container}'")
+
+        if char == '"':
+            self._in_string = True
+        elif char in "{[":
+            self._stack.append(char)
+        elif char in "}]":
+            opener = self._stack.pop()
+            if (opener, char) not in (("{", "}"), ("[", "]")):
+                self._fail("mismatched brackets")
+            if not self._stack:
+                self._complete_value(self._pos + 1)
+
+    def _complete_value(self, end):
+        raw = self._buffer[self._token_start:end]
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self._fail(f"invalid value for '{self._key}': {e}")
+
+        spec = self.specs.get(self._key)
+        if spec is not None:
+            try:
+                value = spec.adapter.validate_python(value)
+            except ValidationError as e:
+                self._fail(f"invalid value for '{self._key}': {e.errors()[0]['msg']}")
+            self.fields[self._key] = value
+            logger.debug(f"Streamed field complete: {self._key}")
+            if self.on_field:
+                self.on_field(self._key, value)
+        self._state = "comma"
+        self._after_comma = False
+
+    def _finish(self):
+        missing = [name for name, spec in self.specs.items() if spec.required and name not in self.fields]
+        if missing:
+            self._fail(f"object closed without required fields {missing}")
+        self._state = "done"
+
+    def close(self) -> BaseModel:
+        """Return the validated model once the stream has ended."""
+        if not self.done:
+            self._pos = len(self._buffer)
+            self._fail("stream ended before the JSON object was complete")
+        return self.model(**self.fields)
+
+
+def parse_stream(chunks, model: typing.Type[BaseModel], on_field=None) -> BaseModel:
+    """Parse a sync stream of text chunks; stops consuming as soon as the output is rejected."""
+    parser = IncrementalJSONParser(model, on_field)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()  # Stops the generation when we abort early
+    return parser.close()
+
+
+async def aparse_stream(chunks, model: typing.Type[BaseModel], on_field=None) -> BaseModel:
+    """Parse an async stream of text chunks; stops consuming as soon as the output is rejected."""
+    parser = IncrementalJSONParser(model, on_field)
+    try:
+        async for chunk in chunks:
+            parser.feed(chunk)
+    finally:
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+    return parser.close()
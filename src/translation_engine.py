@@ -0,0 +1,247 @@
+import copy
+import asyncio
+import logging
+from translation_filter import SKIP_REASONS
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Resume fields that get translated, as paths into the resume data.
+# "*" stands for every item of a list.
+TRANSLATABLE_FIELDS = [
+    ("personal_information", "citizenship"),
+    ("summary",),
+    ("experiences", "*", "employment_period"),
+    ("experiences", "*", "location"),
+    ("experiences", "*", "key_responsibilities", "*", "description"),
+    ("experiences", "*", "skills_acquired", "*"),
+    ("education", "*", "field_of_study"),
+    ("education", "*", "graduation_year"),
+    ("projects", "*", "role"),
+    ("projects", "*", "description"),
+    ("certifications", "*", "date"),
+    ("interests", "*"),
+    ("languages", "*", "language"),
+    ("languages", "*", "proficiency"),
+]
+
+# Fields that only hold technical terms (skill names); ambiguous glossary terms are kept there
+TECHNICAL_FIELDS = {
+    ("experiences", "*", "skills_acquired", "*"),
+}
+
+# Separator used to send several strings in one translator request
+BATCH_SEPARATOR = "\n"
+
+
+class TranslationSlot:
+    """A location in the resume data holding a string to translate."""
+
+    __slots__ = ("container", "key", "path", "field")
+
+    def __init__(self, container, key, path, field=None):
+        self.container = container
+        self.key = key
+        self.path = path
+        # The TRANSLATABLE_FIELDS pattern the slot was collected for
+        self.field = field
+
+    @property
+    def text(self):
+        return self.container[self.key]
+
+    def write(self, value):
+        self.container[self.key] = value
+
+
+class TranslationEngine:
+    """
+    Collect-then-translate engine for resume content.
+
+    Walks the resume data once, dedupes the strings, sends them to the translator
+    in batches with bounded concurrency and writes the results back in place.
+    """
+
+    def __init__(self, translate_fn, memory=None, batch_size=25, max_batch_chars=4000, max_concurrency=4,
+                 fields=TRANSLATABLE_FIELDS, text_filter=None):
+        """
+        translate_fn is an async callable (text, target_lang) -> translated text that raises on failure.
+        memory is an optional TranslationMemory consulted before calling the translator.
+        text_filter is an optional TranslationFilter; strings it resolves never reach memory or translator.
+        """
+        self.translate_fn = translate_fn
+        self.memory = memory
+        self.text_filter = text_filter
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_concurrency = max_concurrency
+        self.fields = fields
+        self.stats = {"strings": 0, "unique": 0, "memory_hits": 0, "requests": 0, "failures": 0, "skipped": 0,
+                      **{f"skipped_{reason}": 0 for reason in SKIP_REASONS}}
+
+    def collect(self, resume_data):
+        """Return a slot for every non-empty string in the translatable fields."""
+        slots = []
+        for path in self.fields:
+            for slot in self._walk(resume_data, path, ()):
+                slot.field = path
+                slots.append(slot)
+        logger.debug(f"Collected {len(slots)} translatable fields")
+        return slots
+
+    @staticmethod
+    def technical_texts(slots):
+        """Texts that only occur in TECHNICAL_FIELDS, for the filter's technical context."""
+        technical = {slot.text for slot in slots if slot.field in TECHNICAL_FIELDS}
+        return technical - {slot.text for slot in slots if slot.field not in TECHNICAL_FIELDS}
+
+    def _walk(self, node, path, location):
+        head, rest = path[0], path[1:]
+        if head == "*":
+            if not isinstance(node, list):
+                return
+            keys = range(len(node))
+        else:
+            if not isinstance(node, dict) or head not in node:
+                return
+            keys = [head]
+
+        for key in keys:
+            if rest:
+                yield from self._walk(node[key], rest, location + (key,))
+            elif isinstance(node[key], str) and node[key].strip():
+                yield TranslationSlot(node, key, location + (key,))
+
+    def _make_batches(self, texts):
+        """Group texts into batches bounded by item count and characters."""
+        batches, current, current_chars = [], [], 0
+        for text in texts:
+            if BATCH_SEPARATOR in text:
+                # Multi-line texts cannot be split back reliably, send them alone
+                batches.append([text])
+                continue
+            if current and (len(current) >= self.batch_size or current_chars + len(text) > self.max_batch_chars):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(text)
+            current_chars += len(text) + len(BATCH_SEPARATOR)
+        if current:
+            batches.append(current)
+        return batches
+
+    def resolve_locally(self, texts, target_lang, technical=()):
+        """Return {text: output} for the texts the filter lets bypass the translator.
+
+        technical is the set of texts that come from technical fields only (see technical_texts).
+        """
+        if self.text_filter is None:
+            return {}
+        local = {}
+        for text in texts:
+            resolved = self.text_filter.resolve(text, target_lang, technical=text in technical)
+            if resolved is not None:
+                reason, local[text] = resolved
+                self.stats[f"skipped_{reason}"] += 1
+        self.stats["skipped"] += len(local)
+        if local:
+            logger.debug(f"{len(local)} of {len(texts)} strings for {target_lang} resolved without the translator")
+        return local
+
+    async def _translate_one(self, text, target_lang):
+        """Translate a single string; returns None when the translator fails."""
+        self.stats["requests"] += 1
+        try:
+            return await self.translate_fn(text, target_lang)
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.warning(f"Translation failed for text '{text[:50]}...': {e}")
+            return None
+
+    async def _translate_batch(self, batch, target_lang):
+        if len(batch) == 1:
+            return [await self._translate_one(batch[0], target_lang)]
+
+        translated = await self._translate_one(BATCH_SEPARATOR.join(batch), target_lang)
+        if translated is not None:
+            parts = translated.split(BATCH_SEPARATOR)
+            if len(parts) == len(batch):
+                return [part.strip() for part in parts]
+            logger.warning(f"Batch of {len(batch)} strings came back as {len(parts)} lines - translating one by one")
+        return await asyncio.gather(*(self._translate_one(text, target_lang) for text in batch))
+
+    async def translate_strings(self, texts, target_lang, technical=()):
+        """Translate texts and return a {source: translation} mapping.
+
+        Strings the translator fails on map to themselves and are not stored in memory.
+        technical is passed on to resolve_locally().
+        """
+        unique = list(dict.fromkeys(texts))
+        self.stats["strings"] += len(texts)
+        self.stats["unique"] += len(unique)
+        if not unique:
+            return {}
+
+        local = self.resolve_locally(unique, target_lang, technical)
+        remaining = [text for text in unique if text not in local]
+        translations = self.memory.get_many(remaining, target_lang) if self.memory is not None and remaining else {}
+        self.stats["memory_hits"] += len(translations)
+        pending = [text for text in remaining if text not in translations]
+        translations.update(local)
+        if not pending:
+            logger.info(f"All {len(unique)} strings for {target_lang} served locally or from translation memory")
+            return translations
+
+        batches = self._make_batches(pending)
+        logger.info(f"Translating {len(pending)} strings to {target_lang} in {len(batches)} batches "
+                    f"({len(texts)} fields, {len(unique)} unique, {len(local)} skipped, "
+                    f"{len(translations) - len(local)} from memory)")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch):
+            async with semaphore:
+                return await self._translate_batch(batch, target_lang)
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        fresh = {}
+        for batch, translated in zip(batches, results):
+            for text, translation in zip(batch, translated):
+                if translation is not None:
+                    fresh[text] = translation
+                translations[text] = translation if translation is not None else text
+
+        if self.memory is not None and fresh:
+            self.memory.put_many(fresh, target_lang)
+        return translations
+
+    async def translate_resume(self, resume_data, labels, target_lang):
+        """Translate resume_data in place and return the translated labels."""
+        slots = self.collect(resume_data)
+        label_texts = [value for key, value in labels.items() if key != "lang"]
+        translations = await self.translate_strings(label_texts + [slot.text for slot in slots], target_lang,
+                                                    self.technical_texts(slots))
+
+        for slot in slots:
+            slot.write(translations.get(slot.text, slot.text))
+        return {key: translations.get(value, value) if key != "lang" else value
+                for key, value in labels.items()}
+
+    async def translate_resume_many(self, resume_data, labels, target_langs):
+        """Translate resume_data into several languages; returns {lang: (data, labels)}.
+
+        The strings are collected and deduplicated once, then every language is translated
+        concurrently. resume_data itself is left untouched; each language gets a copy.
+        """
+        label_texts = [value for key, value in labels.items() if key != "lang"]
+        slots = self.collect(resume_data)
+        texts = list(dict.fromkeys(label_texts + [slot.text for slot in slots]))
+        technical = self.technical_texts(slots)
+        results = await asyncio.gather(*(self.translate_strings(texts, lang, technical) for lang in target_langs))
+
+        translated = {}
+        for lang, translations in zip(target_langs, results):
+            data = copy.deepcopy(resume_data)
+            for slot in self.collect(data):
+                slot.write(translations.get(slot.text, slot.text))
+            translated[lang] = (data, {key: translations.get(value, value) if key != "lang" else lang
+                                       for key, value in labels.items()})
+        return translated
@@ -0,0 +1,164 @@
+import os
+import re
+import threading
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# Terms that read the same in every language; matched against whole fields or list-like fields
+DEFAULT_GLOSSARY = {
+    "python", "java", "javascript", "typescript", "go", "golang", "rust", "c", "c++", "c#", "kotlin", "swift",
+    "scala", "ruby", "php", "r", "matlab", "bash", "sql", "nosql", "html", "css", "sass",
+    "react", "angular", "vue", "vue.js", "node.js", "next.js", "django", "flask", "fastapi", "spring",
+    "spring boot", ".net", "tensorflow", "pytorch", "keras", "scikit-learn", "pandas", "numpy", "spark",
+    "pyspark", "hadoop", "kafka", "airflow", "dbt", "snowflake", "databricks", "tableau", "power bi",
+    "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "sqlite", "oracle",
+    "docker", "kubernetes", "terraform", "ansible", "jenkins", "gitlab", "github", "github actions", "git",
+    "linux", "unix", "aws", "azure", "gcp", "google cloud", "openai", "langchain", "llm", "graphql",
+    "rest", "grpc", "ci/cd", "devops", "mlops", "jira", "confluence", "figma", "scrum", "kanban", "agile",
+}
+
+# Glossary terms that are also plain words ("Go" as a game, "Spring" the season); they are only
+# protected next to another technical term or in a field that only holds skill names
+AMBIGUOUS_TERMS = {
+    "go", "r", "c", "rest", "spring", "swift", "rust", "ruby", "spark", "oracle", "flask", "agile",
+    "react", "angular", "tableau", "snowflake", "kafka",
+}
+
+# Whole fields made of numbers, years, percentages or numeric dates ("2018", "05/2020", "40%")
+NUMERIC_PATTERN = re.compile(r"^[\d\s.,:;/%+\-–—()~]+$")
+# Year ranges with an open end ("2019-Present"); the end word is translated locally
+OPEN_DATE_RANGE_PATTERN = re.compile(
+    r"^(?P<start>(?:\d{1,2}[./])?\d{4})(?P<sep>\s*[-–—]\s*)(?:present|current|now|today|ongoing)$", re.IGNORECASE)
+PRESENT_WORDS = {
+    "en": "Present", "de": "heute", "fr": "présent", "es": "presente", "it": "presente",
+    "pt": "presente", "nl": "heden", "pl": "obecnie", "sv": "nu", "da": "nu", "no": "nå",
+}
+_LIST_SEPARATORS = re.compile(r"\s*[,;/|]\s*")
+
+# Frequent function words used to recognise the language of longer fields
+STOPWORDS = {
+    "en": {"the", "and", "of", "to", "in", "for", "with", "on", "an", "is", "as", "by", "from", "using", "at",
+           "our", "we", "this", "that", "into", "across"},
+    "de": {"der", "die", "das", "und", "mit", "für", "von", "zu", "den", "dem", "ein", "eine", "einer", "ist",
+           "im", "auf", "bei", "sowie", "durch", "wir", "über"},
+    "fr": {"le", "la", "les", "et", "des", "du", "pour", "avec", "dans", "une", "un", "sur", "au", "aux",
+           "par", "est", "nous", "ces", "sont"},
+    "es": {"el", "los", "las", "y", "del", "para", "con", "una", "por", "que", "al", "es", "como", "sus"},
+    "it": {"il", "lo", "gli", "e", "di", "della", "per", "con", "una", "che", "sono", "nel", "alla", "dei"},
+    "nl": {"het", "een", "en", "van", "voor", "met", "op", "bij", "te", "door", "aan", "zijn", "wij", "ook"},
+    "pt": {"os", "e", "do", "da", "dos", "das", "para", "com", "em", "um", "uma", "no", "na", "que", "ao"},
+}
+_WORDS = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Reasons a string bypasses the translator, as reported in TranslationEngine.stats
+GLOSSARY = "glossary"
+PATTERN = "pattern"
+SAME_LANGUAGE = "language"
+SKIP_REASONS = (GLOSSARY, PATTERN, SAME_LANGUAGE)
+
+
+def detect_language(text, min_words=4) -> Optional[str]:
+    """
+    Guess the language of a text from its function words; None when unsure.
+
+    Much cheaper than a statistical detector and good enough to recognise sentences that
+    are clearly written in one language. Short texts are never classified.
+    """
+    words = [word.lower() for word in _WORDS.findall(text)]
+    if len(words) < min_words:
+        return None
+    scores = sorted(((sum(word in stopwords for word in words), lang) for lang, stopwords in STOPWORDS.items()),
+                    reverse=True)
+    (best, lang), (runner_up, _) = scores[0], scores[1]
+    if best >= 2 and best >= len(words) * 0.15 and best > runner_up:
+        return lang
+    return None
+
+
+def load_glossary(path) -> set:
+    """Read extra protected terms from a file, one per line; # starts a comment."""
+    terms = set()
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            terms.add(line.casefold())
+    return terms
+
+
+class TranslationFilter:
+    """
+    Decides locally which strings never need the translator.
+
+    A string bypasses translation when it is a protected glossary term (or a list of
+    them), when it only holds numbers or dates, or when it is already written in the
+    target language. resolve() returns the reason and the text to use instead.
+    Ambiguous terms need a technical context: another unambiguous term in the same
+    list, or technical=True for fields that only hold skill names.
+    """
+
+    def __init__(self, glossary=DEFAULT_GLOSSARY, detect_languages=True, min_words=4, ambiguous=AMBIGUOUS_TERMS):
+        self.glossary = {term.casefold() for term in glossary}
+        self.ambiguous = {term.casefold() for term in ambiguous}
+        self.detect_languages = detect_languages
+        self.min_words = min_words
+
+    def is_protected(self, text, technical=False) -> bool:
+        key = text.strip().casefold()
+        if key in self.glossary:
+            return technical or key not in self.ambiguous
+        parts = [part for part in _LIST_SEPARATORS.split(key) if part]
+        if len(parts) < 2 or not all(part in self.glossary for part in parts):
+            return False
+        return technical or any(part not in self.ambiguous for part in parts)
+
+    def resolve(self, text, target_lang, technical=False) -> Optional[Tuple[str, str]]:
+        """Return (reason, output) when text can skip the translator, else None.
+
+        technical=True marks text from a field that only holds technical terms (skill names).
+        """
+        stripped = text.strip()
+        if NUMERIC_PATTERN.match(stripped):
+            return PATTERN, text
+        date_range = OPEN_DATE_RANGE_PATTERN.match(stripped)
+        if date_range and target_lang in PRESENT_WORDS:
+            return PATTERN, f"{date_range.group('start')}{date_range.group('sep')}{PRESENT_WORDS[target_lang]}"
+        if self.is_protected(stripped, technical):
+            return GLOSSARY, text
+        if self.detect_languages and detect_language(stripped, self.min_words) == target_lang:
+            return SAME_LANGUAGE, text
+        return None
+
+
+_shared_filter = None
+_shared_filter_lock = threading.Lock()
+
+
+def get_translation_filter():
+    """
+    Return the process-wide translation filter, or None when TRANSLATION_FILTER=false.
+
+    TRANSLATION_GLOSSARY may point to a file of extra protected terms.
+    """
+    global _shared_filter
+    if os.environ.get('TRANSLATION_FILTER', 'true').lower() != 'true':
+        return None
+    with _shared_filter_lock:
+        if _shared_filter is None:
+            glossary = set(DEFAULT_GLOSSARY)
+            ambiguous = set(AMBIGUOUS_TERMS)
+            glossary_path = os.environ.get('TRANSLATION_GLOSSARY')
+            if glossary_path:
+                try:
+                    extra_terms = load_glossary(glossary_path)
+                    # Terms listed explicitly are always protected
+                    glossary |= extra_terms
+                    ambiguous -= extra_terms
+                except OSError as e:
+                    logger.warning(f"Failed to read translation glossary {glossary_path}: {e}")
+            _shared_filter = TranslationFilter(glossary, ambiguous=ambiguous)
+            logger.info(f"Translation filter ready - {len(glossary)} protected terms")
+        return _shared_filter
@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+import logging
+from sqlite_store import SQLiteStore, DEFAULT_CACHE_DIR
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of host parameters per statement
+_MAX_PARAMS = 500
+
+
+class TranslationMemory(SQLiteStore):
+    """Disk-backed translation memory keyed by (text, target language) with LRU eviction."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS translations (
+            text TEXT NOT NULL,
+            lang TEXT NOT NULL,
+            translation TEXT NOT NULL,
+            last_used INTEGER NOT NULL,
+            PRIMARY KEY (text, lang)
+        );
+        CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used);
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_DIR / "translation_memory.sqlite3", max_entries=50000):
+        logger.info(f"Initializing TranslationMemory at {db_path} (max entries: {max_entries})")
+        super().__init__(db_path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, texts, lang):
+        """Return {text: translation} for the texts already in memory."""
+        texts = list(dict.fromkeys(texts))
+        found = {}
+        now = time.time_ns()
+        with self._transaction() as conn:
+            for start in range(0, len(texts), _MAX_PARAMS):
+                chunk = texts[start:start + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text, translation FROM translations WHERE lang = ? AND text IN ({placeholders})",
+                    [lang, *chunk]).fetchall()
+                found.update(rows)
+                if rows:
+                    conn.executemany("UPDATE translations SET last_used = ? WHERE text = ? AND lang = ?",
+                                     [(now, text, lang) for text, _ in rows])
+        self.hits += len(found)
+        self.misses += len(texts) - len(found)
+        logger.debug(f"Translation memory lookup ({lang}): {len(found)} hits, {len(texts) - len(found)} misses")
+        return found
+
+    def get(self, text, lang):
+        return self.get_many([text], lang).get(text)
+
+    def put_many(self, translations, lang):
+        """Store a {text: translation} mapping and evict the least recently used entries."""
+        if not translations:
+            return
+        now = time.time_ns()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO translations (text, lang, translation, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (text, lang) DO UPDATE SET translation = excluded.translation, last_used = excluded.last_used",
+                [(text, lang, translation, now) for text, translation in translations.items()])
+            count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                evicted = count - self.max_entries
+                conn.execute("DELETE FROM translations WHERE rowid IN "
+                             "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)", (evicted,))
+                logger.info(f"Translation memory evicted {evicted} least recently used entries")
+
+    def put(self, text, translation, lang):
+        self.put_many({text: translation}, lang)
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM translations")[0][0]
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+_shared_memory = None
+_shared_memory_lock = threading.Lock()
+
+
+def get_translation_memory():
+    """Return the process-wide translation memory, creating it on first use."""
+    global _shared_memory
+    with _shared_memory_lock:
+        if _shared_memory is None:
+            _shared_memory = TranslationMemory(
+                db_path=os.environ.get('TRANSLATION_MEMORY_PATH', DEFAULT_CACHE_DIR / "translation_memory.sqlite3"),
+                max_entries=int(os.environ.get('TRANSLATION_MEMORY_SIZE', 50000)),
+            )
+        return _shared_memory
@@ -0,0 +1,82 @@
+import atexit
+import threading
+import logging
+from googletrans import Translator
+from event_loop_service import EventLoopService, get_event_loop_service
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+
+class TranslatorClient:
+    """
+    One Google translator shared by every ResumeGenerator of the process.
+
+    googletrans keeps an httpx.AsyncClient that is bound to the loop it first ran on, so the
+    translator is created on the process-wide event loop service and every request is sent
+    from there. Its connections survive between resumes and are closed on shutdown().
+    """
+
+    def __init__(self, loop_service: EventLoopService = None, translator_factory=Translator):
+        self.loop_service = loop_service or get_event_loop_service()
+        self._translator_factory = translator_factory
+        self._translator = None
+        self._closed = False
+        self.stats = {"requests": 0}
+
+    async def translate(self, text, target_lang) -> str:
+        """Translate text into target_lang. Safe to await from any event loop; raises on failure."""
+        return await self.loop_service.run_async(self._translate(text, target_lang))
+
+    async def _translate(self, text, target_lang):
+        if self._closed:
+            raise RuntimeError("TranslatorClient has been shut down")
+        if self._translator is None:
+            logger.debug("Creating Google translator on the event loop service")
+            self._translator = self._translator_factory()
+        self.stats["requests"] += 1
+        translation = await self._translator.translate(text, target_lang)
+        return translation.text
+
+    async def _close_translator(self):
+        translator, self._translator = self._translator, None
+        if translator is not None:
+            await translator.client.aclose()
+
+    def shutdown(self, timeout=30):
+        """Close the translator's HTTP client; the shared event loop keeps running."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._translator is None or not self.loop_service.running:
+            return
+
+        logger.info("Shutting down TranslatorClient")
+        try:
+            self.loop_service.run(self._close_translator(), timeout)
+        except Exception as e:
+            logger.warning(f"Error while closing translator client: {e}")
+        logger.info(f"TranslatorClient shut down - stats: {self.stats}")
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_translator_client():
+    """Return the process-wide translator client, creating it on first use."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = TranslatorClient()
+            atexit.register(shutdown_translator_client)
+        return _shared_client
+
+
+def shutdown_translator_client():
+    """Shut down the process-wide translator client if it was created."""
+    global _shared_client
+    with _shared_client_lock:
+        client, _shared_client = _shared_client, None
+    if client is not None:
+        client.shutdown()
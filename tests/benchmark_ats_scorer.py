@@ -0,0 +1,96 @@
+"""
+Benchmark ATS scoring: the LLM comparison vs. the deterministic local scorer.
+
+The job skills are extracted once (or taken from the job skills store), then both
+paths score the same resume. Reports latency and the score/missing skills of each.
+
+Usage:
+    python tests/benchmark_ats_scorer.py --job-description job.txt --iterations 5
+    python tests/benchmark_ats_scorer.py --local-only --iterations 1000
+"""
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from resume_parser import ResumeParser
+from resume_analyzer import ResumeAnalyzer, JobSkills
+from job_skills_store import JobSkillsStore
+
+# Used with --local-only so the benchmark runs without a model
+SAMPLE_JOB_SKILLS = JobSkills(required_skills=[
+    {"category": "Programming Languages", "name": "Python", "level": "Advanced"},
+    {"category": "Programming Languages", "name": "Go", "level": "Intermediate"},
+    {"category": "Cloud Services", "name": "AWS", "level": "Advanced"},
+    {"category": "Tools", "name": "Kubernetes", "level": "Intermediate"},
+    {"category": "Tools", "name": "Docker", "level": "Advanced"},
+    {"category": "Databases", "name": "PostgreSQL", "level": "Intermediate"},
+    {"category": "Frameworks", "name": "React", "level": "Expert"},
+    {"category": "Methodologies", "name": "Scrum", "level": "Intermediate"},
+])
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(name, samples, result):
+    print(f"{name:<8} n={len(samples):<5} p50={percentile(samples, 50) * 1000:10.3f} ms  "
+          f"p99={percentile(samples, 99) * 1000:10.3f} ms  mean={statistics.mean(samples) * 1000:10.3f} ms  "
+          f"score={result.ats_score:<3} missing={sorted(skill.get('name', '') for skill in result.missing_skills)}")
+
+
+def measure(analyzer, iterations):
+    samples = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = analyzer.compare()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LLM vs local ATS scoring')
+    parser.add_argument('--resume', type=str, default=str(project_root / "example" / "resume.yaml"))
+    parser.add_argument('--job-description', type=str, default=None, help='Job description text file')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--local-only', action='store_true', help='Skip the LLM path and use sample job skills')
+    args = parser.parse_args()
+
+    resume = ResumeParser(args.resume)
+    job_description = Path(args.job_description).read_text() if args.job_description else "sample job"
+    if not args.local_only and not args.job_description:
+        parser.error("--job-description is required unless --local-only is set")
+
+    model = None
+    if args.local_only:
+        model = object()  # Never called in local mode
+        store = JobSkillsStore(":memory:")
+    else:
+        store = None  # Shared store: the extraction is done at most once
+
+    analyzers = {}
+    for mode in (("local",) if args.local_only else ("llm", "hybrid", "local")):
+        analyzer = ResumeAnalyzer(job_description, resume, model=model, extract_skills=not args.local_only,
+                                  skills_store=store, ats_mode=mode)
+        if args.local_only:
+            analyzer.job_required_skills = SAMPLE_JOB_SKILLS
+        analyzers[mode] = analyzer
+
+    for mode, analyzer in analyzers.items():
+        # The LLM response cache would turn repeated LLM comparisons into lookups
+        if mode != "local":
+            analyzer.model.cache = None
+        samples, result = measure(analyzer, args.iterations)
+        report(mode, samples, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark PDF rendering latency: cold browser launch per render vs. the warm BrowserPool.
+
+Usage:
+    python tests/benchmark_browser_pool.py --iterations 20 --concurrency 4
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from resume_parser import ResumeParser
+from resume_generator import ResumeGenerator
+from browser_pool import BrowserPool
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(name, samples, wall_time):
+    print(f"{name:<8} n={len(samples):<4} p50={percentile(samples, 50) * 1000:8.1f} ms  "
+          f"p99={percentile(samples, 99) * 1000:8.1f} ms  mean={statistics.mean(samples) * 1000:8.1f} ms  "
+          f"throughput={len(samples) / wall_time:6.2f} pdf/s")
+
+
+async def run_renders(generator, html_file, iterations, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def render_once():
+        async with semaphore:
+            start = time.perf_counter()
+            await generator.html_to_pdf_async(html_file)
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(render_once() for _ in range(iterations)))
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold-launch vs pooled PDF rendering')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=2)
+    parser.add_argument('--browsers', type=int, default=2)
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    resume = project_root / "example" / "resume.yaml"
+    output = project_root / "output" / "benchmark"
+    output.mkdir(parents=True, exist_ok=True)
+
+    cold_generator = ResumeGenerator(resume, output, project_root / "example", "en")
+    html_file = Path(cold_generator.generate_html(ResumeParser(resume).data)).resolve()
+
+    cold_samples, cold_wall = asyncio.run(run_renders(cold_generator, html_file, args.iterations, args.concurrency))
+
+    pool = BrowserPool(max_browsers=args.browsers, pages_per_browser=args.pages)
+    pooled_generator = ResumeGenerator(resume, output, project_root / "example", "en", browser_pool=pool)
+    try:
+        # Warm-up render so the pool's launch cost is not counted in the steady state
+        pool.run(pooled_generator.html_to_pdf_async(html_file))
+        pooled_samples, pooled_wall = pool.run(
+            run_renders(pooled_generator, html_file, args.iterations, args.concurrency))
+    finally:
+        pool.shutdown()
+
+    report("cold", cold_samples, cold_wall)
+    report("pooled", pooled_samples, pooled_wall)
+    print(f"pool stats: {pool.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark job posting scrape latency against a local fixture page.
+
+The fixture (tests/fixtures/linkedin_job.html) is served by a local HTTP server together
+with stylesheets, fonts, scripts and images that each take --asset-delay ms, standing in
+for LinkedIn's CDN. Compares a cold browser per scrape with a reused ScraperSession
+in each interception mode, and the plain HTTP fast path.
+
+Usage:
+    python tests/benchmark_scraper.py --iterations 10 --asset-delay 50
+"""
+import sys
+import time
+import argparse
+import statistics
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from scraper_session import ScraperSession, INTERCEPT_MODES
+from linkedin_job_description import LinkedinJobDescription
+from job_page_fetcher import HttpJobFetcher
+
+FIXTURE = Path(__file__).parent / "fixtures" / "linkedin_job.html"
+
+
+def make_handler(asset_delay):
+    page = FIXTURE.read_bytes()
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/jobs/view/"):
+                body, content_type = page, "text/html; charset=utf-8"
+            else:
+                time.sleep(asset_delay)
+                body, content_type = b"", "application/octet-stream"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(name, samples, stats=None):
+    print(f"{name:<16} n={len(samples):<4} p50={percentile(samples, 50) * 1000:8.1f} ms  "
+          f"p99={percentile(samples, 99) * 1000:8.1f} ms  mean={statistics.mean(samples) * 1000:8.1f} ms"
+          + (f"  blocked={stats['blocked']} allowed={stats['allowed']}" if stats else ""))
+
+
+def check(job_description, company_name):
+    if company_name != "Acme Corp" or "Kafka" not in job_description:
+        raise RuntimeError(f"Unexpected scrape result: {company_name!r}, {job_description[:80]!r}")
+
+
+def scrape(url, session):
+    start = time.perf_counter()
+    scraper = LinkedinJobDescription(url, session=session)
+    job_description, company_name = session.run(scraper.get_job_description_via_pyppeteer())
+    elapsed = time.perf_counter() - start
+    check(job_description, company_name)
+    return elapsed
+
+
+def fetch(url, fetcher):
+    start = time.perf_counter()
+    job_description, company_name, _ = fetcher.fetch(url)
+    elapsed = time.perf_counter() - start
+    check(job_description, company_name)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold vs reused, intercepted scraping')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--asset-delay', type=float, default=50, help='Delay per non-document request in ms')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.asset_delay / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/jobs/view/4114686525"
+
+    try:
+        fetcher = HttpJobFetcher()
+        report("http", [fetch(url, fetcher) for _ in range(args.iterations)])
+
+        # A new browser per posting without interception, as before the session existed
+        cold_samples = []
+        for _ in range(args.iterations):
+            session = ScraperSession(intercept="off")
+            try:
+                cold_samples.append(scrape(url, session))
+            finally:
+                session.shutdown()
+        report("cold/off", cold_samples)
+
+        for mode in INTERCEPT_MODES:
+            session = ScraperSession(intercept=mode)
+            try:
+                scrape(url, session)  # Warm-up: browser launch is not part of the steady state
+                samples = [scrape(url, session) for _ in range(args.iterations)]
+                report(f"reused/{mode}", samples, session.stats)
+            finally:
+                session.shutdown()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
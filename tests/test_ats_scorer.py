@@ -0,0 +1,74 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ats_scorer import LocalATSScorer, normalize_skill, split_alternatives
+from job_skills_store import JobSkillsStore
+from resume_analyzer import ResumeAnalyzer, JobSkills
+
+RESUME = {
+    "skills": [
+        {"category": "Programming Languages", "name": "Python", "level": "Expert"},
+        {"category": "Frameworks", "name": "React", "level": "Intermediate"},
+    ],
+    "experiences": [{"skills_acquired": ["Node.js", "K8s", "PostgreSQL 14"]}],
+    "projects": [{"name": "Resume Generator", "skills": ["Docker"]}],
+}
+
+
+class FakeResume:
+    data = RESUME
+
+    def get_required_fields_for_ats(self):
+        return "Python developer"
+
+
+class TestLocalATSScorer(unittest.TestCase):
+
+    def test_normalization(self):
+        self.assertEqual(normalize_skill(" Node.JS "), "nodejs")
+        self.assertEqual(normalize_skill("Python 3.11"), "python")
+        self.assertEqual(normalize_skill("C++"), "c++")
+        self.assertEqual(normalize_skill("k8s"), "kubernetes")
+
+    def test_slash_compounds_are_one_skill(self):
+        self.assertEqual(split_alternatives("CI / CD, Python/Go"), ["ci cd", "Python", "Go"])
+        available = LocalATSScorer.resume_skills({"skills": ["CI/CD"], "projects": [{"skills": ["PL/SQL"]}]})
+        self.assertEqual(set(available), {"cicd", "plsql"})
+
+        required = [{"category": "Tools", "name": "CI-CD"}, {"category": "Databases", "name": "pl/sql"}]
+        result = LocalATSScorer().score(required, {"skills": ["CI/CD", "PL/SQL"]})
+        self.assertEqual((result.ats_score, result.missing_skills), (100, []))
+
+    def test_weighted_score_and_missing_skills(self):
+        required = [
+            {"category": "Programming Languages", "name": "Python", "level": "Advanced"},
+            {"category": "Tools", "name": "Kubernetes", "level": "Intermediate"},
+            {"category": "Databases", "name": "Postgres", "level": "Intermediate"},
+            {"category": "Frameworks", "name": "React", "level": "Expert"},
+            {"category": "Programming Languages", "name": "Go", "level": "Advanced"},
+        ]
+        result = LocalATSScorer().score(required, RESUME)
+
+        self.assertEqual([skill["name"] for skill in result.missing_skills], ["Go"])
+        # React is matched below the required level and earns half credit
+        self.assertEqual(result.ats_score, 64)
+        self.assertEqual(result, LocalATSScorer().score(required, RESUME))
+
+    def test_local_mode_skips_the_model(self):
+        analyzer = ResumeAnalyzer("Python developer", FakeResume(), model=object(), extract_skills=False,
+                                  skills_store=JobSkillsStore(":memory:"), ats_mode="local")
+        analyzer.job_required_skills = JobSkills(required_skills=[
+            {"category": "Programming Languages", "name": "Python", "level": "Advanced"},
+            {"category": "Programming Languages", "name": "Rust", "level": "Advanced"},
+        ])
+        result = analyzer.compare()
+        self.assertEqual(result.ats_score, 50)
+        self.assertEqual(result.missing_skills[0]["name"], "Rust")
+        self.assertIn("Rust", result.suggested_improvements)
+
+
+if __name__ == '__main__':
+    unittest.main()
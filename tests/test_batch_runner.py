@@ -0,0 +1,59 @@
+import io
+import sys
+import json
+import asyncio
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from batch_runner import BatchRunner
+from resume_pipeline import PipelineResult
+
+RESUME = Path(__file__).parent.parent / "example" / "resume.yaml"
+
+
+class FakePipeline:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.parsers = set()
+
+    async def run_async(self, resume_path, job_description=None, company_name=None, job_title="",
+                        language="auto", resume_parser=None, job_id=None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.parsers.add(id(resume_parser))
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if job_id == "fail":
+            raise RuntimeError("model unavailable")
+        return PipelineResult(pdf_bytes=b"%PDF", pdf_path=f"/tmp/{job_id}.pdf", html_path=f"/tmp/{job_id}.html",
+                              resume_path=resume_path, language="en", company_name=company_name)
+
+
+def job_line(job_id):
+    return json.dumps({"job_id": job_id, "job_title": "Engineer", "job_description": "Python", "company_name": "Acme"})
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def test_streams_one_result_per_job_with_bounded_concurrency(self):
+        pipeline = FakePipeline()
+        lines = [job_line(str(i)) for i in range(5)] + ["", "not json", job_line("fail")]
+        output = io.StringIO()
+
+        summary = asyncio.run(BatchRunner(pipeline, RESUME, concurrency=2).run_async(iter(lines), output))
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(summary["jobs"], 7)
+        self.assertEqual((summary["ok"], summary["error"]), (5, 2))
+        self.assertEqual(len(results), 7)
+        self.assertEqual(pipeline.max_running, 2)
+        self.assertEqual(len(pipeline.parsers), 1)
+        self.assertIn("total_s", results[-1]["timings"])
+        self.assertIn("model unavailable", [r["error"] for r in results if r["status"] == "error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
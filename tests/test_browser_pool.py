@@ -0,0 +1,164 @@
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import browser_pool
+from browser_pool import BrowserPool
+from event_loop_service import EventLoopService
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def goto(self, url):
+        pass
+
+    async def setContent(self, html):
+        pass
+
+    async def pdf(self, options):
+        await asyncio.sleep(0.01)
+        self.browser.rendered += 1
+        return b"%PDF"
+
+    async def cookies(self):
+        return []
+
+    async def deleteCookie(self, *cookies):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Stands in for a pyppeteer browser without a process of ours."""
+
+    process = None
+
+    def __init__(self):
+        self.pages = []
+        self.rendered = 0
+        self.released = False
+        self._listeners = []
+
+    def on(self, event, callback):
+        self._listeners.append(callback)
+
+    def crash(self):
+        for callback in self._listeners:
+            callback()
+
+    async def newPage(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        for page in self.pages:
+            await page.close()
+        self.released = True
+
+    async def disconnect(self):
+        self.released = True
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def setUp(self):
+        self.launched = []
+        self.launch_delay = 0
+
+        async def fake_launch(**options):
+            await asyncio.sleep(self.launch_delay)
+            browser = FakeBrowser()
+            self.launched.append(browser)
+            return browser
+
+        patcher = mock.patch.object(browser_pool, "launch", fake_launch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = EventLoopService(name="PoolTestLoop")
+        self.addCleanup(self.service.shutdown)
+
+    def make_pool(self, **kwargs):
+        pool = BrowserPool(launch_options={"headless": True}, loop_service=self.service, **kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def render(self, pool, count=1):
+        async def render_many():
+            return await asyncio.gather(*(pool._render_pdf("about:blank", {}) for _ in range(count)))
+        return pool.run(render_many())
+
+    def test_checkout_and_checkin_reuse_warm_pages(self):
+        pool = self.make_pool(max_browsers=1, pages_per_browser=2)
+        self.render(pool, 2)
+        self.render(pool, 2)
+
+        self.assertEqual(len(self.launched), 1)
+        self.assertEqual(len(self.launched[0].pages), 2)
+        pooled = pool._browsers[0]
+        self.assertEqual((pooled.active_pages, len(pooled.idle_pages), pooled.renders), (0, 2, 4))
+        self.assertEqual(pool.stats["renders"], 4)
+
+    def test_browser_is_recycled_after_max_renders(self):
+        pool = self.make_pool(max_browsers=1, pages_per_browser=1, max_renders_per_browser=2)
+        self.render(pool, 3)
+
+        self.assertEqual(len(self.launched), 2)
+        self.assertTrue(self.launched[0].released)
+        self.assertTrue(all(page.closed for page in self.launched[0].pages))
+        self.assertEqual(pool.stats["recycled"], 1)
+        self.assertEqual([pooled.browser for pooled in pool._browsers], [self.launched[1]])
+
+    def test_crashed_browser_is_reaped_and_replaced(self):
+        pool = self.make_pool(max_browsers=1, pages_per_browser=1)
+        self.render(pool)
+        self.launched[0].crash()
+        self.render(pool)
+
+        self.assertEqual(pool.stats["crashed"], 1)
+        self.assertEqual(len(self.launched), 2)
+        self.assertEqual(self.launched[1].rendered, 1)
+        self.assertEqual([pooled.browser for pooled in pool._browsers], [self.launched[1]])
+
+    def test_checkout_never_exceeds_pages_per_browser(self):
+        pool = self.make_pool(max_browsers=1, pages_per_browser=1)
+        # Let more callers past the slot semaphore than the pool has pages for
+        pool._slots = asyncio.Semaphore(3)
+        self.render(pool, 3)
+
+        self.assertEqual(len(self.launched), 1)
+        self.assertEqual(len(self.launched[0].pages), 1)
+        self.assertEqual(self.launched[0].rendered, 3)
+
+    def test_slow_launch_does_not_hold_up_other_pages(self):
+        pool = self.make_pool(max_browsers=2, pages_per_browser=1)
+        self.render(pool)
+        self.launch_delay = 0.5
+
+        async def warm_render_time():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            warm = asyncio.ensure_future(pool._render_pdf("about:blank", {}))
+            cold = asyncio.ensure_future(pool._render_pdf("about:blank", {}))
+            await warm
+            elapsed = loop.time() - started
+            await cold
+            return elapsed
+
+        # The warm page is checked in while the second browser is still starting
+        self.assertLess(pool.run(warm_render_time()), 0.25)
+        self.assertEqual(len(self.launched), 2)
+        self.assertEqual([b.page_count for b in pool._browsers], [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import sys
+import asyncio
+import subprocess
+import threading
+import unittest
+from pathlib import Path
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from browser_supervisor import BrowserSupervisor, make_handler, process_tree_rss
+from browser_pool import release_browser, supervisor_endpoints
+
+SMALL = ["sleep", "30"]
+LARGE = [sys.executable, "-c", "import time; data = b'x' * (64 * 2 ** 20); time.sleep(30)"]
+
+
+class FakeBrowser:
+    """A launched browser stand-in: a real process, an endpoint and the pyppeteer calls used."""
+
+    launched = 0
+
+    def __init__(self, command=None):
+        FakeBrowser.launched += 1
+        self.process = subprocess.Popen(command) if command else None
+        self.wsEndpoint = f"ws://127.0.0.1:9222/devtools/browser/{FakeBrowser.launched}"
+        self.closed = False
+        self.disconnected = False
+
+    def on(self, event, handler):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSupervisor(BrowserSupervisor):
+    def __init__(self, commands, **kwargs):
+        super().__init__(launch_options={}, **kwargs)
+        self.commands = list(commands)
+
+    async def _launch_browser(self):
+        return FakeBrowser(self.commands.pop(0) if self.commands else SMALL)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "reads /proc")
+class TestBrowserSupervisor(unittest.TestCase):
+
+    def test_restarts_crashed_instances(self):
+        async def scenario():
+            supervisor = FakeSupervisor([SMALL, SMALL], instances=2)
+            await supervisor.start()
+            try:
+                crashed = supervisor.browsers[0]
+                crashed.process.kill()
+                crashed.process.wait()
+                await supervisor.check()
+
+                self.assertEqual(supervisor.stats["crash_restarts"], 1)
+                self.assertEqual([b["restarts"] for b in supervisor.endpoints()], [1, 0])
+                self.assertTrue(all(b["alive"] for b in supervisor.endpoints()))
+                self.assertNotEqual(supervisor.endpoints()[0]["ws_endpoint"], crashed.ws_endpoint)
+            finally:
+                await supervisor.close()
+        asyncio.run(scenario())
+
+    def test_memory_cap_restarts_the_largest_instance(self):
+        async def scenario():
+            supervisor = FakeSupervisor([SMALL, LARGE], instances=2, max_memory_mb=32)
+            await supervisor.start()
+            try:
+                large = supervisor.browsers[1]
+                for _ in range(50):
+                    if process_tree_rss(large.process) > 48 * 2 ** 20:
+                        break
+                    await asyncio.sleep(0.05)
+                await supervisor.check()
+
+                self.assertEqual(supervisor.stats["memory_restarts"], 1)
+                self.assertIsNotNone(large.process.poll())
+                self.assertEqual([b["restarts"] for b in supervisor.endpoints()], [0, 1])
+            finally:
+                await supervisor.close()
+        asyncio.run(scenario())
+
+    def test_workers_read_endpoints_and_only_disconnect(self):
+        supervisor = FakeSupervisor([SMALL], instances=1)
+        asyncio.run(supervisor.start())
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(supervisor))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            endpoints = supervisor_endpoints(f"http://127.0.0.1:{server.server_address[1]}")
+            self.assertEqual(endpoints, [supervisor.browsers[0].ws_endpoint])
+        finally:
+            server.shutdown()
+            server.server_close()
+            asyncio.run(supervisor.close())
+
+        # A connected browser has no process of ours: close our pages, keep the browser
+        remote, page = FakeBrowser(), FakePage()
+        asyncio.run(release_browser(remote, [page]))
+        self.assertTrue(remote.disconnected and page.closed)
+        self.assertFalse(remote.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
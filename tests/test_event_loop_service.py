@@ -0,0 +1,65 @@
+import sys
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from event_loop_service import EventLoopService
+
+
+class TestEventLoopService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = EventLoopService(name="TestLoop")
+
+    def tearDown(self):
+        self.service.shutdown()
+
+    def test_one_loop_serves_every_caller(self):
+        async def current_loop():
+            await asyncio.sleep(0)
+            return asyncio.get_running_loop(), threading.current_thread().name
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: self.service.run(current_loop()), range(8)))
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(results[0], (self.service.loop, "TestLoop-loop"))
+
+    def test_loop_bound_resources_survive_between_calls(self):
+        async def create():
+            return asyncio.Queue()
+
+        queue = self.service.run(create())
+        self.service.run(queue.put("warm"))
+        self.assertEqual(self.service.run(queue.get()), "warm")
+
+    def test_run_async_from_another_loop(self):
+        async def on_service():
+            return asyncio.get_running_loop()
+
+        async def caller():
+            return await self.service.run_async(on_service())
+
+        self.assertIs(asyncio.run(caller()), self.service.loop)
+
+    def test_blocking_run_on_the_loop_thread_raises(self):
+        async def nested():
+            return self.service.run(asyncio.sleep(0))
+
+        with self.assertRaises(RuntimeError):
+            self.service.run(nested())
+
+    def test_shutdown_cancels_pending_work(self):
+        future = self.service.submit(asyncio.sleep(30))
+        self.service.shutdown(timeout=5)
+        self.assertTrue(future.cancelled())
+        self.assertFalse(self.service.running)
+        with self.assertRaises(RuntimeError):
+            self.service.start()
+
+
+if __name__ == '__main__':
+    unittest.main()
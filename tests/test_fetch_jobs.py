@@ -0,0 +1,116 @@
+import io
+import sys
+import json
+import time
+import asyncio
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fetch_jobs import JobFetcher
+from job_page_fetcher import JobPage, JobPageParseError
+from job_store import JobStore
+from batch_runner import read_job_records
+
+
+class FakeHttpFetcher:
+    """Serves postings by job id; ids listed in `walled` hit a login wall the first `failures` times."""
+
+    def __init__(self, delay=0.05, walled=(), failures=1):
+        self.delay = delay
+        self.walled = {job_id: failures for job_id in walled}
+        self.active = 0
+        self.max_active = 0
+        self.started = []
+
+    def fetch(self, url):
+        job_id = url.rstrip("/").split("/")[-1]
+        self.started.append(time.monotonic())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.walled.get(job_id):
+            self.walled[job_id] -= 1
+            raise JobPageParseError("login wall")
+        return JobPage(f"Description of job {job_id}", "Acme", f"Engineer {job_id}")
+
+
+class FailingSession:
+    """Browser fallback that fails like the scraper does without a usable page."""
+
+    async def run_async(self, coro):
+        coro.close()
+        return "Error fetching job description.", "Error fetching company name"
+
+
+def urls(count):
+    return [f"https://www.linkedin.com/jobs/view/{index}" for index in range(1, count + 1)]
+
+
+class TestJobFetcher(unittest.TestCase):
+
+    def fetch(self, fetcher, job_urls):
+        async def collect():
+            return [result async for result in fetcher.fetch_all(job_urls)]
+        return asyncio.run(collect())
+
+    def test_concurrency_cap_and_streaming_jsonl(self):
+        http = FakeHttpFetcher()
+        fetcher = JobFetcher(concurrency=3, host_delay=0, session=FailingSession(), http_fetcher=http,
+                             store=JobStore(":memory:"))
+        output = io.StringIO()
+        summary = asyncio.run(fetcher.write_jsonl(urls(8), output))
+
+        self.assertEqual(summary["ok"], 8)
+        self.assertEqual(http.max_active, 3)
+        records = list(read_job_records(output.getvalue().splitlines()))
+        self.assertEqual(len(records), 8)
+        self.assertTrue(all(not isinstance(job, str) for _, job in records))
+        self.assertEqual({job.job_title for _, job in records}, {f"Engineer {index}" for index in range(1, 9)})
+
+    def test_host_delay(self):
+        http = FakeHttpFetcher(delay=0)
+        fetcher = JobFetcher(concurrency=4, host_delay=0.1, session=FailingSession(), http_fetcher=http,
+                             store=JobStore(":memory:"))
+        self.fetch(fetcher, urls(3))
+        gaps = [later - earlier for earlier, later in zip(http.started, http.started[1:])]
+        self.assertTrue(all(gap >= 0.09 for gap in gaps), gaps)
+
+    def test_retries_store_and_errors(self):
+        store = JobStore(":memory:")
+        http = FakeHttpFetcher(delay=0, walled=("2", "3"), failures=1)
+        http.walled["3"] = 5  # Never gets past the wall
+        fetcher = JobFetcher(concurrency=2, host_delay=0, retries=2, retry_delay=0.01,
+                             session=FailingSession(), http_fetcher=http, store=store)
+        results = {result["job_id"]: result for result in self.fetch(fetcher, urls(3) + ["https://example.com/job"])
+                   if "job_id" in result}
+
+        self.assertEqual((results["1"]["status"], results["1"]["attempts"]), ("ok", 1))
+        self.assertEqual((results["2"]["status"], results["2"]["attempts"]), ("ok", 2))
+        self.assertEqual((results["3"]["status"], results["3"]["attempts"]), ("error", 3))
+        self.assertEqual(store.get("2").job_title, "Engineer 2")
+
+        # Stored postings are not fetched again
+        again = self.fetch(fetcher, urls(1))
+        self.assertEqual(again[0]["source"], "store")
+        json.dumps(again)
+
+    def test_retry_backoff_frees_the_slot(self):
+        http = FakeHttpFetcher(delay=0.02, walled=("1",), failures=1)
+        fetcher = JobFetcher(concurrency=1, host_delay=0, retries=1, retry_delay=0.5,
+                             session=FailingSession(), http_fetcher=http, store=JobStore(":memory:"))
+        started = time.monotonic()
+        results = self.fetch(fetcher, urls(3))
+
+        # The healthy postings are fetched while the failed one waits for its retry
+        self.assertEqual([result["job_id"] for result in results], ["2", "3", "1"])
+        self.assertEqual(results[-1]["attempts"], 2)
+        self.assertLess(time.monotonic() - started, 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from job_description_sections import (split_sections, strip_boilerplate, classify_heading,
+                                      TASKS, REQUIREMENTS, BENEFITS, COMPANY, LEGAL, OTHER)
+
+GERMAN_POSTING = """Senior Data Engineer (m/w/d)
+Standort: Berlin
+Das sind Ihre Aufgaben:
+Sie entwickeln Datenpipelines mit Python, PySpark und Databricks für unsere Kunden in der Industrie.
+Sie beraten Fachbereiche bei Architektur und Betrieb. Was sind unsere Tätigkeitsfelder:
+Data Warehousing, MLOps und Cloud-Technologien (AWS, Azure oder GCP).
+Das bringen Sie mit:
+Mindestens 5 Jahre Erfahrung mit SQL und Spark
+Sehr gute Deutsch- und Englischkenntnisse
+Das bieten wir Ihnen:
+Flexible Arbeitszeiten, 30 Tage Urlaub und ein attraktives Gehalt mit zusätzlichen Sozialleistungen.
+Das sind wir:
+Ein Unternehmen mit 350 Mitarbeitenden in Deutschland und Rumänien, das IT-Dienstleistungen erbringt.
+"""
+
+ENGLISH_POSTING = """About the job
+Backend Engineer
+Responsibilities
+- Build and operate Go and Python services on Kubernetes
+- Own the PostgreSQL data model and its migrations
+Requirements:
+- 3+ years of backend development experience
+- Experience with AWS and Terraform
+We are an equal opportunity employer and value diversity of all kinds.
+What we offer
+- Stock options, learning budget and a remote-first culture with yearly offsites
+About us
+We are a fast-growing fintech that helps small businesses get paid on time across Europe.
+"""
+
+
+class TestJobDescriptionSections(unittest.TestCase):
+
+    def test_german_sections(self):
+        categories = [section.category for section in split_sections(GERMAN_POSTING)]
+        self.assertEqual(categories, [OTHER, TASKS, TASKS, REQUIREMENTS, BENEFITS, COMPANY])
+
+        stripped = strip_boilerplate(GERMAN_POSTING)
+        self.assertIn("PySpark", stripped.text)
+        self.assertIn("Data Warehousing", stripped.text)
+        self.assertIn("SQL und Spark", stripped.text)
+        self.assertNotIn("Urlaub", stripped.text)
+        self.assertNotIn("Rumänien", stripped.text)
+        self.assertEqual(set(stripped.removed), {BENEFITS, COMPANY})
+        self.assertGreater(stripped.cut_ratio, 0.2)
+
+    def test_english_sections_and_legal_lines(self):
+        stripped = strip_boilerplate(ENGLISH_POSTING)
+        self.assertIn("Kubernetes", stripped.text)
+        self.assertIn("Terraform", stripped.text)
+        self.assertNotIn("equal opportunity", stripped.text)
+        self.assertNotIn("Stock options", stripped.text)
+        self.assertNotIn("fintech", stripped.text)
+        self.assertEqual(set(stripped.removed), {LEGAL, BENEFITS, COMPANY})
+
+    def test_headings(self):
+        self.assertEqual(classify_heading("**Your Profile:**"), REQUIREMENTS)
+        self.assertEqual(classify_heading("Benefits"), BENEFITS)
+        self.assertEqual(classify_heading("About Acme", company_name="Acme"), COMPANY)
+        self.assertIsNone(classify_heading("Experience with AWS and Terraform"))
+        self.assertIsNone(classify_heading("Publication Date:  Mar 17, 2025"))
+
+    def test_unstructured_text_is_kept(self):
+        text = "We need a Python developer with Django experience. " * 10
+        stripped = strip_boilerplate(text)
+        self.assertEqual(stripped.text, text)
+        self.assertEqual(stripped.removed, {})
+        self.assertEqual(stripped.cut_ratio, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
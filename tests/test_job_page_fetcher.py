@@ -0,0 +1,99 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from job_page_fetcher import HttpJobFetcher, JobPageParseError, parse_job_page
+from linkedin_job_description import LinkedinJobDescription
+
+FIXTURE = Path(__file__).parent / "fixtures" / "linkedin_job.html"
+AUTHWALL = b"<html><body><form class='authwall'>Sign in to view this job</form></body></html>"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the saved job page like LinkedIn's public job view, and a login wall."""
+
+    protocol_version = "HTTP/1.1"
+    client_ports = []
+
+    def do_GET(self):
+        self.client_ports.append(self.client_address[1])
+        if self.path.startswith("/jobs/view/"):
+            body = FIXTURE.read_bytes()
+        else:
+            body = AUTHWALL
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeSession:
+    """Stands in for the browser session; records whether the fallback ran."""
+
+    def __init__(self):
+        self.used = False
+
+    def run(self, coro):
+        coro.close()
+        self.used = True
+        return "Description from the browser", "Browser Corp"
+
+
+class TestJobPageFetcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_parse_saved_page(self):
+        job_description, company_name, job_title = parse_job_page(FIXTURE.read_text(encoding="utf-8"))
+        self.assertEqual(company_name, "Acme Corp")
+        self.assertEqual(job_title, "Senior Data Engineer")
+        self.assertIn("Responsibilities\nDesign and operate batch and streaming pipelines", job_description)
+        self.assertIn("PostgreSQL and Snowflake & own its quality", job_description)
+        self.assertNotIn("Show more", job_description)
+        with self.assertRaises(JobPageParseError):
+            parse_job_page(AUTHWALL.decode())
+
+    def test_fetches_reuse_one_connection(self):
+        StandInHandler.client_ports.clear()
+        fetcher = HttpJobFetcher()
+        try:
+            for _ in range(3):
+                page = fetcher.fetch(f"{self.base_url}/jobs/view/4114686525")
+                self.assertEqual(page.company_name, "Acme Corp")
+        finally:
+            fetcher.close()
+        self.assertEqual(len(StandInHandler.client_ports), 3)
+        self.assertEqual(len(set(StandInHandler.client_ports)), 1)
+
+    def test_browser_is_only_used_when_parsing_fails(self):
+        fetcher = HttpJobFetcher()
+        session = FakeSession()
+        job = LinkedinJobDescription(f"{self.base_url}/jobs/view/4114686525", session=session, http_fetcher=fetcher)
+        self.assertEqual(job.get_job_description()[1], "Acme Corp")
+        self.assertFalse(session.used)
+
+        job = LinkedinJobDescription(f"{self.base_url}/authwall", session=session, http_fetcher=fetcher)
+        self.assertEqual(job.get_job_description(), ("Description from the browser", "Browser Corp"))
+        self.assertTrue(session.used)
+        fetcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+import time
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from job_queue import JobQueue, WorkerPool, QUEUED, RUNNING, DONE, FAILED
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def test_jobs_survive_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "queue.sqlite3"
+            queue = JobQueue(path, lease_seconds=0.1)
+            first = queue.submit({"n": 1})
+            second = queue.submit({"n": 2})
+            self.assertEqual(queue.claim("host:1"), (first, {"n": 1}))
+            queue.close()
+
+            # The first job was running when the server stopped; it is only re-queued once its lease expired
+            queue = JobQueue(path, lease_seconds=0.1)
+            self.assertEqual(queue.get(first)["status"], RUNNING)
+            self.assertEqual(queue.get(first)["owner"], "host:1")
+            self.assertEqual(queue.requeue_stale(), 0)
+            time.sleep(0.15)
+            self.assertEqual(queue.requeue_stale(), 1)
+            self.assertEqual(queue.counts(), {QUEUED: 2})
+            self.assertEqual(queue.claim()[0], first)
+            self.assertEqual(queue.claim()[0], second)
+            self.assertIsNone(queue.claim())
+            queue.close()
+
+    def test_live_workers_keep_their_jobs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "queue.sqlite3"
+            release = threading.Event()
+
+            def handler(params):
+                release.wait(5)
+                return {"ok": True}
+
+            pool = WorkerPool(JobQueue(path, lease_seconds=0.2), handler, workers=1, poll_interval=0.05,
+                              heartbeat_interval=0.05)
+            pool.start()
+            try:
+                job_id = pool.queue.submit({})
+                pool.notify()
+                # Another server process starting on the same file must not take over the running job
+                other = JobQueue(path, lease_seconds=0.2)
+                deadline = time.time() + 5
+                while other.get(job_id)["status"] != RUNNING:
+                    self.assertLess(time.time(), deadline)
+                    time.sleep(0.02)
+                time.sleep(0.5)
+                self.assertEqual(other.requeue_stale(), 0)
+                self.assertEqual(other.get(job_id)["attempts"], 1)
+                release.set()
+                while other.get(job_id)["status"] != DONE:
+                    self.assertLess(time.time(), deadline)
+                    time.sleep(0.02)
+                other.close()
+            finally:
+                release.set()
+                pool.stop()
+                pool.queue.close()
+
+    def test_jobs_interrupted_too_often_fail(self):
+        queue = JobQueue(":memory:", lease_seconds=0.01, max_attempts=2)
+        job_id = queue.submit({})
+        for attempt in range(2):
+            self.assertEqual(queue.claim(f"host:{attempt}")[0], job_id)
+            time.sleep(0.02)
+            self.assertEqual(queue.requeue_stale(), 1 - attempt)
+
+        job = queue.get(job_id)
+        self.assertEqual(job["status"], FAILED)
+        self.assertEqual(job["attempts"], 2)
+        self.assertIn("interrupted 2 times", job["error"])
+        self.assertIsNone(queue.claim())
+
+    def test_old_queue_files_are_migrated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "queue.sqlite3"
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT NOT NULL, "
+                         "result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+                         "started_at REAL, finished_at REAL)")
+            conn.execute("INSERT INTO jobs (id, status, params, created_at) VALUES ('old', 'running', '{}', 0)")
+            conn.commit()
+            conn.close()
+
+            queue = JobQueue(path)
+            self.assertEqual(queue.requeue_stale(), 1)
+            self.assertEqual(queue.claim("host:2"), ("old", {}))
+            queue.close()
+
+    def test_worker_pool_runs_jobs(self):
+        queue = JobQueue(":memory:")
+
+        def handler(params):
+            if params["n"] < 0:
+                raise ValueError("negative")
+            return {"square": params["n"] ** 2}
+
+        pool = WorkerPool(queue, handler, workers=2, poll_interval=0.05)
+        pool.start()
+        try:
+            ok = queue.submit({"n": 3})
+            bad = queue.submit({"n": -1})
+            pool.notify()
+            deadline = time.time() + 5
+            while queue.counts().get(QUEUED) or queue.counts().get(RUNNING):
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.02)
+        finally:
+            pool.stop()
+
+        self.assertEqual(queue.get(ok)["status"], DONE)
+        self.assertEqual(queue.get(ok)["result"], {"square": 9})
+        self.assertEqual(queue.get(bad)["status"], FAILED)
+        self.assertEqual(queue.get(bad)["error"], "negative")
+
+
+if __name__ == '__main__':
+    unittest.main()
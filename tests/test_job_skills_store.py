@@ -0,0 +1,76 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from job_skills_store import JobSkillsStore
+from resume_analyzer import ResumeAnalyzer
+
+SKILLS = {"required_skills": [{"category": "Programming Languages", "name": "Python", "level": "Advanced"}]}
+
+
+class FakeResume:
+    data = {}
+
+    def get_required_fields_for_ats(self):
+        return "Python developer"
+
+
+class FakeModel:
+    model_provider = "ollama"
+    model_name = "qwen2.5:3b"
+
+    def __init__(self, **params):
+        self.model_params = {"temperature": 0, "format": "json", **params}
+        self.calls = 0
+
+    def get_completion(self, messages=None, prompt=None, **kwargs):
+        self.calls += 1
+        return '{"required_skills": [{"category": "Programming Languages", "name": "Python", "level": "Advanced"}]}'
+
+
+class TestJobSkillsStore(unittest.TestCase):
+
+    def test_put_get_and_indexes(self):
+        store = JobSkillsStore(":memory:")
+        self.assertIsNone(store.get("Senior Python developer", "ollama/qwen2.5:3b"))
+        store.put("Senior Python developer", "ollama/qwen2.5:3b", SKILLS, job_id="42", company_name="Acme")
+        store.put("Senior Python developer", "ollama/qwen2.5:3b", SKILLS)
+
+        self.assertEqual(store.get("Senior Python developer", "ollama/qwen2.5:3b"), SKILLS)
+        self.assertIsNone(store.get("Senior Python developer", "ollama/llama3.2"))
+        self.assertEqual(store.find_by_job_id("42"), [SKILLS])
+        self.assertEqual(store.find_by_company("Acme"), [("42", SKILLS)])
+
+    def test_reanalysis_skips_extraction(self):
+        store = JobSkillsStore(":memory:")
+        model = FakeModel()
+        ResumeAnalyzer("Senior   Python\n developer", FakeResume(), model=model, skills_store=store, job_id="42")
+        analyzer = ResumeAnalyzer("Senior Python developer ", FakeResume(), model=model, skills_store=store)
+
+        self.assertEqual(model.calls, 1)
+        self.assertEqual(analyzer.job_required_skills.required_skills, SKILLS["required_skills"])
+
+    def test_new_params_or_prompt_extract_again(self):
+        store = JobSkillsStore(":memory:")
+        ResumeAnalyzer("Senior Python developer", FakeResume(), model=FakeModel(), skills_store=store)
+
+        other_params = FakeModel(num_predict=512)
+        ResumeAnalyzer("Senior Python developer", FakeResume(), model=other_params, skills_store=store)
+        self.assertEqual(other_params.calls, 1)
+
+        new_prompt = FakeModel()
+        with mock.patch.object(ResumeAnalyzer, "_render_job_skills_prompt",
+                               staticmethod(lambda job_description: f"list the skills in: {job_description}")):
+            ResumeAnalyzer("Senior Python developer", FakeResume(), model=new_prompt, skills_store=store)
+        self.assertEqual(new_prompt.calls, 1)
+
+        same_setup = FakeModel()
+        ResumeAnalyzer("Senior Python developer", FakeResume(), model=same_setup, skills_store=store)
+        self.assertEqual(same_setup.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import time
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from job_data import JobData
+from job_store import JobStore
+import linkedin_job_description
+from job_description_interface import JobDescriptionInterface
+
+
+class FakePlatform:
+    job_title = "Data Engineer"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_job_description(self):
+        self.calls += 1
+        return "Build data pipelines with Python.", "Acme"
+
+
+class FakeInterface(JobDescriptionInterface):
+    """Skips the platform scraper so the store logic can be tested offline."""
+
+    platform = None
+
+    def detect_the_platform(self):
+        self.job_id = "4114686525"
+        return self.platform
+
+
+class TestJobStore(unittest.TestCase):
+
+    def test_upsert_lookups_and_ttl(self):
+        store = JobStore(":memory:", ttl=3600)
+        store.put(JobData("1", "Data Engineer", "Python and Spark", "Acme"), source_url="https://example.com/1")
+        store.put(JobData("1", None, "Python, Spark and Kafka", "Acme"))
+        store.put(JobData("2", "Backend Engineer", "Python, Spark and Kafka", "Globex"),
+                  fetched_at=time.time() - 7200)
+
+        job_id, job_title, job_description, company_name = store.get("1").get_job_data()
+        self.assertEqual((job_id, job_title, job_description), ("1", "Data Engineer", "Python, Spark and Kafka"))
+        self.assertIsNone(store.get("2"))
+        self.assertIsNotNone(store.get("2", max_age=0))
+        self.assertEqual([job.job_id for job in store.find_by_company("Acme")], ["1"])
+        self.assertEqual([job.job_id for job in store.find_by_content("Python, Spark and Kafka")], ["1", "2"])
+
+        self.assertEqual(store.purge_expired(), 1)
+        self.assertEqual(len(store), 1)
+
+    def test_concurrent_writers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "jobs.sqlite3"
+            JobStore(path)  # Create the schema once
+
+            def worker(index):
+                store = JobStore(path)  # Separate connection, like a separate server worker
+                for job in range(25):
+                    store.put(JobData(str(job), None, f"Description {job} from worker {index}", "Acme"))
+                    store.put(JobData(f"{index}-{job}", None, "Unique", "Acme"))
+                store.close()
+
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            store = JobStore(path)
+            self.assertEqual(len(store), 25 + 4 * 25)
+            self.assertTrue(store.get("7").job_description.startswith("Description 7 from worker"))
+            store.close()
+
+    def test_interface_fetches_once(self):
+        store = JobStore(":memory:")
+        FakeInterface.platform = FakePlatform()
+        url = "https://www.linkedin.com/jobs/view/4114686525/"
+        first = FakeInterface(url, store=store).get_job_description(load_from_store=True, save_to_store=True)
+        second = FakeInterface(url, store=store).get_job_description(load_from_store=True, save_to_store=True)
+
+        self.assertEqual(first, ("Build data pipelines with Python.", "Acme"))
+        self.assertEqual(second, first)
+        self.assertEqual(FakeInterface.platform.calls, 1)
+        self.assertEqual(store.get("4114686525").company_name, "Acme")
+        self.assertEqual(store.get("4114686525").job_title, "Data Engineer")
+
+    def test_deprecated_file_arguments_still_work(self):
+        store = JobStore(":memory:")
+        FakeInterface.platform = FakePlatform()
+        url = "https://www.linkedin.com/jobs/view/4114686525"
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "4114686525.txt").write_text("Initech\nMaintain TPS reports.", encoding="utf-8")
+            with self.assertWarns(DeprecationWarning):
+                result = FakeInterface(url, store=store).get_job_description(load_from_file=True, save_to_file=True,
+                                                                             job_dir=tmp)
+
+        self.assertEqual(result, ("Maintain TPS reports.", "Initech"))
+        self.assertEqual(FakeInterface.platform.calls, 0)
+        self.assertEqual(store.get("4114686525").company_name, "Initech")
+
+    def test_stored_postings_need_no_scraper(self):
+        store = JobStore(":memory:")
+        store.put(JobData("4114686525", "Data Engineer", "Python and Spark", "Acme"))
+        unavailable = mock.Mock(side_effect=AssertionError("scraper created"))
+        with mock.patch.object(linkedin_job_description, "get_scraper_session", unavailable), \
+                mock.patch.object(linkedin_job_description, "get_http_fetcher", unavailable):
+            result = JobDescriptionInterface("https://www.linkedin.com/jobs/view/4114686525",
+                                             store=store).get_job_description(load_from_store=True)
+
+        self.assertEqual(result, ("Python and Spark", "Acme"))
+        unavailable.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
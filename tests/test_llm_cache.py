@@ -0,0 +1,130 @@
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from llm_cache import LLMCache, InMemoryLRUBackend, DiskBackend
+from ai_interface import AIInterface
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return f'{{"answer": {self.calls}}}'
+
+
+class TestLLMCache(unittest.TestCase):
+
+    def test_key_ignores_indentation_but_not_params(self):
+        key = LLMCache.make_key("ollama/qwen2.5:3b", {"temperature": 0}, "\n        extract skills:\n        text\n")
+        self.assertEqual(key, LLMCache.make_key("ollama/qwen2.5:3b", {"temperature": 0}, "extract skills:\ntext"))
+        self.assertNotEqual(key, LLMCache.make_key("ollama/qwen2.5:3b", {"temperature": 0.5}, "extract skills:\ntext"))
+        self.assertNotEqual(key, LLMCache.make_key("ollama/llama3.2", {"temperature": 0}, "extract skills:\ntext"))
+
+    def test_memory_backend_lru_and_ttl(self):
+        backend = InMemoryLRUBackend(max_entries=2, ttl=0.05)
+        backend.set("a", "1")
+        backend.set("b", "2")
+        backend.get("a")
+        backend.set("c", "3")
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), "1")
+        time.sleep(0.06)
+        self.assertIsNone(backend.get("a"))
+
+    def test_disk_backend_size_eviction(self):
+        backend = DiskBackend(":memory:", max_entries=2)
+        for key in ("a", "b", "c"):
+            backend.set(key, key.upper())
+        self.assertEqual(len(backend), 2)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.get("c"), "C")
+
+    def test_disk_backend_lookups_keep_lru_order(self):
+        backend = DiskBackend(":memory:", max_entries=2)
+        backend.set("a", "A")
+        backend.set("b", "B")
+        self.assertEqual(backend.get("a"), "A")
+        backend.set("c", "C")
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), "A")
+
+    def test_disk_lookup_does_not_wait_for_writers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_cache.sqlite3"
+            backend = DiskBackend(path, touch_batch=1)
+            backend.set("a", "A")
+            # Another process is in the middle of a write
+            writer = sqlite3.connect(path, isolation_level=None)
+            writer.execute("BEGIN IMMEDIATE")
+            results = []
+            lookup = threading.Thread(target=lambda: results.append(backend.get("a")))
+            lookup.start()
+            lookup.join(2)
+            finished_while_locked = not lookup.is_alive()
+            writer.execute("ROLLBACK")
+            writer.close()
+            lookup.join()
+
+            self.assertTrue(finished_while_locked)
+            self.assertEqual(results, ["A"])
+            # The last_used update is kept for the next write
+            self.assertIn("a", backend._touched)
+            backend.set("b", "B")
+            self.assertEqual(backend._touched, {})
+            backend.close()
+
+    def test_entries_failing_validation_count_as_misses(self):
+        cache = LLMCache()
+        cache.set("key", "not json")
+        self.assertIsNone(cache.get("key", validate=json.loads))
+        cache.set("key", '{"answer": 1}')
+        self.assertEqual(cache.get("key", validate=json.loads), '{"answer": 1}')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_ai_interface_serves_repeated_prompts_from_cache(self):
+        ai = AIInterface("ollama", "qwen2.5:3b", cache=LLMCache(), temperature=0, format="json")
+        ai.model = FakeModel()
+        messages = [{"role": "user", "content": "compare"}]
+
+        first = ai.get_completion(messages)
+        self.assertEqual(ai.get_completion(messages), first)
+        self.assertEqual(ai.model.calls, 1)
+
+        ai.get_completion(messages, use_cache=False)
+        self.assertEqual(ai.model.calls, 2)
+        refreshed = ai.get_completion(messages, refresh_cache=True)
+        self.assertEqual(ai.get_completion(messages), refreshed)
+        self.assertEqual(ai.model.calls, 3)
+
+    def test_responses_failing_validation_are_not_served_from_cache(self):
+        cache = LLMCache()
+        ai = AIInterface("ollama", "qwen2.5:3b", cache=cache, temperature=0, format="json")
+        ai.model = FakeModel()
+        replies = iter(['{"answer": ', '{"answer": 2}'])
+        ai.model.invoke = lambda prompt: next(replies)
+        validate = lambda response: json.loads(response)["answer"]
+
+        self.assertEqual(ai.get_completion(prompt="extract", validate=validate), '{"answer": ')
+        self.assertEqual(len(cache.backend), 0)
+        self.assertEqual(ai.get_completion(prompt="extract", validate=validate), '{"answer": 2}')
+        self.assertEqual(ai.get_completion(prompt="extract", validate=validate), '{"answer": 2}')
+
+        # A bad entry already in the cache is discarded and requested again
+        cache.set(ai._cache_key("summarize"), "not json")
+        ai.model.invoke = lambda prompt: '{"answer": 3}'
+        self.assertEqual(ai.get_completion(prompt="summarize", validate=validate), '{"answer": 3}')
+        self.assertEqual(cache.get(ai._cache_key("summarize")), '{"answer": 3}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+os.environ.setdefault('LLM_CACHE_BACKEND', 'memory')
+
+from model_registry import ModelRegistry
+from llm_cache import get_llm_cache
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ModelRegistry()
+
+    def test_clients_are_shared_per_configuration(self):
+        model = self.registry.get("ollama", "qwen2.5:3b", temperature=0, format="json")
+        self.assertIs(self.registry.get("ollama", "qwen2.5:3b", format="json", temperature=0), model)
+        self.assertIsNot(self.registry.get("ollama", "qwen2.5:3b", temperature=0.7, format="json"), model)
+        self.assertEqual(len(self.registry), 2)
+
+    def test_response_cache_only_for_deterministic_models(self):
+        self.assertIs(self.registry.get("ollama", "qwen2.5:3b", temperature=0).cache, get_llm_cache())
+        self.assertIsNone(self.registry.get("ollama", "qwen2.5:3b", temperature=0.7).cache)
+        self.assertIsNone(self.registry.get("ollama", "qwen2.5:3b").cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from prompt_builder import PromptBuilder, TokenCounter, compact, compact_skills, context_size
+
+
+class EstimatingCounter(TokenCounter):
+    """Character-based counter, so the tests never need the tiktoken encoding files."""
+
+    @property
+    def encoding(self):
+        return None
+
+
+def render(job_description, resume):
+    return [
+        {"role": "system", "content": "Score the resume against the job."},
+        {"role": "user", "content": f"Job:\n{job_description}\nResume:\n{resume}"},
+    ]
+
+
+class TestPromptBuilder(unittest.TestCase):
+
+    def test_compact_serialization(self):
+        skills = [
+            {"category": "Programming Languages", "name": "Python", "level": "Expert"},
+            {"category": "Programming Languages", "name": "Go", "level": "Advanced"},
+            {"category": "Tools", "name": "Docker"},
+        ]
+        self.assertEqual(compact_skills(skills), "Programming Languages: Python (Expert), Go (Advanced)\nTools: Docker")
+        self.assertEqual(compact([{"language": "English", "proficiency": "Native"}]), "English (Native)")
+        self.assertEqual(compact(["Python", "AWS", "Python"]), "Python, AWS")
+
+    def test_small_prompt_is_unchanged(self):
+        counter = EstimatingCounter()
+        built = PromptBuilder("ats_compare", budget=1000, counter=counter).build(
+            render, job_description="Python", resume="Python (Expert)")
+        self.assertIn("Resume:\nPython (Expert)", built.content[1]["content"])
+        self.assertEqual(built.num_ctx, 4096)
+
+    def test_oversized_sections_are_truncated_to_the_budget(self):
+        counter = EstimatingCounter()
+        builder = PromptBuilder("ats_compare", budget=300, counter=counter)
+        built = builder.build(render, job_description="short job", resume="experience " * 2000)
+
+        self.assertLessEqual(built.tokens, 300)
+        self.assertIn("short job", built.content[1]["content"])
+        self.assertIn("Score the resume against the job.", built.content[0]["content"])
+
+    def test_context_size_uses_buckets(self):
+        self.assertEqual(context_size(100, 1024), 4096)
+        self.assertEqual(context_size(5000, 1024), 8192)
+        self.assertEqual(context_size(10 ** 6, 1024), 32768)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from result_cache import ResultCache, file_fingerprint
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_key_covers_all_inputs(self):
+        args = (b"name: Jane", "Python developer", "Acme", "Engineer", "en", "tpl1", "ollama/qwen2.5:3b", "job-1")
+        key = ResultCache.make_key(*args)
+        self.assertEqual(key, ResultCache.make_key(*args))
+        for index in range(len(args)):
+            changed = list(args)
+            changed[index] = b"other" if index == 0 else "other"
+            self.assertNotEqual(key, ResultCache.make_key(*changed))
+
+    def test_size_bounded_lru_eviction(self):
+        cache = ResultCache(":memory:", max_bytes=10)
+        cache.set("a", b"1234", {"pdf_name": "a.pdf"})
+        cache.set("b", b"1234", {"pdf_name": "b.pdf"})
+        cache.get("a")
+        cache.set("c", b"1234", {"pdf_name": "c.pdf"})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (b"1234", {"pdf_name": "a.pdf"}))
+        self.assertEqual(cache.size, 8)
+        cache.set("huge", b"x" * 11, {})
+        self.assertIsNone(cache.get("huge"))
+
+    def test_fingerprint_follows_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            template = Path(tmp) / "resume_template.html"
+            template.write_text("<html>v1</html>")
+            first = file_fingerprint(template)
+            template.write_text("<html>v2!</html>")
+            os.utime(template, ns=(0, 1))
+            self.assertNotEqual(first, file_fingerprint(template))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from resume_generator import ResumeGenerator, inline_assets, write_atomic
+from resume_parser import ResumeParser
+from translation_memory import TranslationMemory
+
+EXAMPLE_DIR = Path(__file__).parent.parent / "example"
+
+
+class FakeBrowserPool:
+    """Records the HTML printed on pooled pages."""
+
+    def __init__(self):
+        self.printed = []
+
+    async def render_pdf_content(self, html, pdf_options):
+        self.printed.append(html)
+        return f"%PDF-{len(self.printed)}".encode()
+
+
+class TestInlineAssets(unittest.TestCase):
+
+    def test_local_assets_are_embedded_relative_to_base_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "example").mkdir()
+            (root / "output").mkdir()
+            (root / "example" / "styles.css").write_text("body { color: red; }")
+            (root / "example" / "foto.png").write_bytes(b"\x89PNG")
+            html = ('<link rel="stylesheet" href="../example/styles.css">'
+                    '<img src="../example/foto.png" alt="me"><img src="https://example.com/a.png">'
+                    '<img src="../missing.jpg">')
+
+            inlined = inline_assets(html, root / "output")
+
+            self.assertIn("<style>\nbody { color: red; }\n</style>", inlined)
+            self.assertIn('<img src="data:image/png;base64,iVBORw==" alt="me">', inlined)
+            self.assertIn('<img src="https://example.com/a.png">', inlined)
+            self.assertIn('<img src="../missing.jpg">', inlined)
+
+    def test_write_atomic_replaces_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_atomic(Path(tmp) / "resume.html", "<html></html>")
+            write_atomic(path, b"%PDF")
+            self.assertEqual(path.read_bytes(), b"%PDF")
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], ["resume.html"])
+
+
+class TestMultiLanguageRender(unittest.TestCase):
+
+    def test_languages_share_one_translation_pass_and_browser_pool(self):
+        requests = []
+
+        async def translate(text, target_lang):
+            requests.append(target_lang)
+            return "\n".join(f"[{target_lang}] {line}" for line in text.split("\n"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = FakeBrowserPool()
+            generator = ResumeGenerator(EXAMPLE_DIR / "resume.yaml", tmp, EXAMPLE_DIR, browser_pool=pool,
+                                        translation_memory=TranslationMemory(":memory:"))
+            generator._request_translation = translate
+            generator.translation_engine.translate_fn = translate
+            resume_data = ResumeParser(EXAMPLE_DIR / "resume.yaml").data
+            summary = resume_data["summary"]
+
+            htmls = asyncio.run(generator.render_languages_async(resume_data, ["en", "de", "fr"]))
+            pdfs = asyncio.run(generator.html_to_pdf_bytes_many_async(htmls))
+
+        self.assertEqual(list(htmls), ["en", "de", "fr"])
+        self.assertIn('lang="de"', htmls["de"])
+        self.assertIn("<h2>[fr] Summary</h2>", htmls["fr"])
+        self.assertNotIn("[de]", htmls["en"])
+        self.assertEqual(resume_data["summary"], summary)
+        # Same batches for every target language, none for English
+        self.assertEqual(set(requests), {"de", "fr"})
+        self.assertEqual(requests.count("de"), requests.count("fr"))
+        self.assertEqual(len(pool.printed), 3)
+        self.assertEqual(set(pdfs), {"en", "de", "fr"})
+
+
+if __name__ == '__main__':
+    unittest.main()
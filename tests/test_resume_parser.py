@@ -0,0 +1,35 @@
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from resume_parser import ResumeParser
+
+RESUME = Path(__file__).parent.parent / "example" / "resume.yaml"
+
+
+class TestResumeParser(unittest.TestCase):
+
+    def test_path_bytes_and_streams_parse_alike(self):
+        raw = RESUME.read_bytes()
+        from_path = ResumeParser(RESUME)
+        for source in (raw, io.BytesIO(raw), io.StringIO(raw.decode("utf-8"))):
+            parser = ResumeParser(source)
+            self.assertEqual(parser.data, from_path.data)
+            self.assertEqual(parser.text, from_path.text)
+            self.assertEqual(parser.content_hash, from_path.content_hash)
+
+    def test_cached_parse_is_not_shared_between_instances(self):
+        first = ResumeParser(RESUME)
+        first.update_summary("Changed")
+        first.data["skills"].append({"name": "Rust"})
+
+        second = ResumeParser(RESUME)
+        self.assertNotEqual(second.data["summary"], "Changed")
+        self.assertNotIn({"name": "Rust"}, second.data["skills"])
+
+
+if __name__ == '__main__':
+    unittest.main()
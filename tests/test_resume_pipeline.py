@@ -0,0 +1,64 @@
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from resume_pipeline import ResumePipeline
+from test_resume_generator import FakeBrowserPool
+from translation_memory import TranslationMemory
+
+EXAMPLE_DIR = Path(__file__).parent.parent / "example"
+
+
+class FailingModel:
+    model_provider = "fake"
+    model_name = "failing"
+
+    async def aget_completion(self, *args, **kwargs):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model unavailable")
+
+
+class SlowPrewarmPipeline(ResumePipeline):
+    """Records what happens to the translation pre-warm running next to the analysis."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prewarm_states = []
+
+    async def _prewarm_translations(self, resume_path, resume_data, language):
+        try:
+            await asyncio.sleep(10)
+            self.prewarm_states.append("finished")
+        except asyncio.CancelledError:
+            self.prewarm_states.append("cancelled")
+            raise
+
+
+class TestResumePipeline(unittest.TestCase):
+
+    @mock.patch.dict(os.environ, {"JOB_SKILLS_STORE_PATH": "none"})
+    def test_failed_analysis_cancels_and_awaits_the_prewarm(self):
+        async def run(pipeline):
+            with self.assertRaisesRegex(RuntimeError, "model unavailable"):
+                await pipeline.run_async(EXAMPLE_DIR / "resume.yaml", job_description="Python developer",
+                                         company_name="Acme", language="de")
+            # Nothing of the pipeline is left running on the loop
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pipeline = SlowPrewarmPipeline(tmp, EXAMPLE_DIR, model=FailingModel(), browser_pool=FakeBrowserPool(),
+                                           stream=False, translation_memory=TranslationMemory(":memory:"))
+            leftover = asyncio.run(run(pipeline))
+
+        self.assertEqual(pipeline.prewarm_states, ["cancelled"])
+        self.assertEqual(leftover, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
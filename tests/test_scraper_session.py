@@ -0,0 +1,55 @@
+import sys
+import time
+import subprocess
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from scraper_session import ScraperSession, is_tracker
+from browser_pool import browser_process_tree, kill_browser_processes
+
+
+def request(resource_type, url="https://www.linkedin.com/jobs/view/1"):
+    return SimpleNamespace(resourceType=resource_type, url=url)
+
+
+class TestScraperSession(unittest.TestCase):
+
+    def test_interception_modes(self):
+        document = ScraperSession(intercept="document")
+        self.assertTrue(document._allows(request("document")))
+        self.assertFalse(document._allows(request("script")))
+        self.assertFalse(document.scripts_enabled)
+
+        lean = ScraperSession(intercept="lean")
+        self.assertTrue(lean._allows(request("script")))
+        self.assertFalse(lean._allows(request("image")))
+        self.assertFalse(lean._allows(request("font")))
+        self.assertFalse(lean._allows(request("script", "https://www.googletagmanager.com/gtm.js")))
+
+        self.assertTrue(is_tracker("https://px.ads.linkedin.com/collect?pid=1"))
+        self.assertFalse(is_tracker("https://www.linkedin.com/jobs/view/1"))
+        with self.assertRaises(ValueError):
+            ScraperSession(intercept="everything")
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "reads /proc")
+    def test_shutdown_kills_only_the_owned_process_tree(self):
+        bystander = subprocess.Popen(["sleep", "30"])
+        owned = subprocess.Popen(["sh", "-c", "sleep 30 & sleep 30 & wait"])
+        try:
+            time.sleep(0.2)
+            processes = browser_process_tree(owned)
+            self.assertEqual(len(processes), 3)
+
+            kill_browser_processes(owned, processes)
+            self.assertIsNotNone(owned.poll())
+            self.assertIsNone(bystander.poll())
+        finally:
+            bystander.kill()
+            bystander.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
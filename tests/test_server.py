@@ -0,0 +1,169 @@
+import io
+import os
+import json
+import sys
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# The server starts its job workers on import, so point them at a scratch queue first
+SCRATCH = tempfile.TemporaryDirectory()
+os.environ['JOB_QUEUE_PATH'] = str(Path(SCRATCH.name) / "job_queue.sqlite3")
+os.environ['JOB_LEASE_SECONDS'] = "0.3"
+os.environ['JOB_WORKERS'] = "1"
+os.environ['RESULT_CACHE_PATH'] = str(Path(SCRATCH.name) / "result_cache.sqlite3")
+os.environ.setdefault('LLM_CACHE_BACKEND', 'memory')
+
+import server
+from job_queue import JobQueue, DONE
+
+RESUME = Path(__file__).parent.parent / "example" / "resume.yaml"
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output_dir = Path(self.tmp.name)
+        self.pipeline_calls = []
+
+        patches = [
+            mock.patch.object(server, "run_resume_pipeline", self.fake_pipeline),
+            mock.patch.object(server, "OUTPUT_FOLDER", self.output_dir),
+            mock.patch.dict(server.app.config, {"INPUT_FOLDER": self.tmp.name}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = server.app.test_client()
+
+    def fake_pipeline(self, resume_path, job_data_dict, language, resume_parser=None, request_id="", persist=True,
+                      languages=None):
+        self.pipeline_calls.append(resume_path)
+        pdf_path = self.output_dir / f"resume_{len(self.pipeline_calls)}.pdf"
+        pdf_path.write_bytes(b"%PDF-fake")
+        return SimpleNamespace(pdf_bytes=b"%PDF-fake", pdf_path=pdf_path, company_name="Acme", language="en",
+                               timings={"total_s": 0.0})
+
+    def wait_for_job(self, job_id, timeout=5):
+        deadline = time.time() + timeout
+        while True:
+            job = self.client.get(f"/jobs/{job_id}").get_json()
+            if job["status"] == DONE:
+                return job
+            self.assertLess(time.time(), deadline, f"job still {job['status']}")
+            time.sleep(0.05)
+
+    def test_async_submit_poll_and_result(self):
+        response = self.client.post("/generate-resume", data={
+            "resume_file": (io.BytesIO(RESUME.read_bytes()), "resume.yaml"),
+            "async": "true",
+            "language": "en",
+        })
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()["job_id"]
+
+        job = self.wait_for_job(job_id)
+        self.assertEqual(job["result"]["company_name"], "Acme")
+        result = self.client.get(f"/jobs/{job_id}/result")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.data, b"%PDF-fake")
+        self.assertEqual(self.client.get("/jobs/unknown").status_code, 404)
+
+    def generate(self, resume=b"", headers=None, **form):
+        resume = resume or RESUME.read_bytes()
+        return self.client.post("/generate-resume", headers=headers or {},
+                                data={"resume_file": (io.BytesIO(resume), "resume.yaml"), "language": "en", **form})
+
+    def test_pdf_etag_revalidation(self):
+        resume = RESUME.read_bytes() + b"\n# etag test\n"
+        first = self.generate(resume, response_format="pdf")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+
+        revalidated = self.generate(resume, headers={"If-None-Match": etag}, response_format="pdf")
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["ETag"], etag)
+        self.assertEqual(len(self.pipeline_calls), 1)
+
+        # no-cache always regenerates, even when the client copy is current
+        forced = self.generate(resume, headers={"If-None-Match": etag, "Cache-Control": "no-cache"},
+                               response_format="pdf")
+        self.assertEqual(forced.status_code, 200)
+        self.assertEqual(len(self.pipeline_calls), 2)
+
+    def test_json_and_pdf_never_share_a_validator(self):
+        resume = RESUME.read_bytes() + b"\n# validator test\n"
+        as_json = self.generate(resume)
+        self.assertEqual(as_json.status_code, 200)
+        self.assertNotIn("ETag", as_json.headers)
+        as_pdf = self.generate(resume, response_format="pdf")
+        etag = as_pdf.headers["ETag"]
+
+        # A validator of the PDF never turns a JSON request into a 304
+        again = self.generate(resume, headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()["status"], "success")
+        self.assertNotIn("ETag", again.headers)
+
+    def test_cached_result_keeps_the_file_name_of_its_job(self):
+        resume = RESUME.read_bytes() + b"\n# job id test\n"
+
+        def generate_for(job_id):
+            job_data = json.dumps({"job_id": job_id, "job_title": "Engineer", "job_description": "Python developer",
+                                   "company_name": "Acme"})
+            response = self.generate(resume, job_data=job_data)
+            self.assertEqual(response.status_code, 200)
+            return response.get_json()
+
+        first = generate_for("job-1")
+        other_job = generate_for("job-2")
+        self.assertEqual(len(self.pipeline_calls), 2)
+        self.assertNotEqual(other_job["pdf_path"], first["pdf_path"])
+
+        again = generate_for("job-1")
+        self.assertTrue(again["cached"])
+        self.assertEqual(again["pdf_path"], first["pdf_path"])
+
+    def test_cache_key_covers_output_settings(self):
+        resume = RESUME.read_bytes()
+        key = server.result_cache_key(resume, {}, "de")
+        for name, value in (("LLM_STREAMING", "true"), ("JOB_DESCRIPTION_STRIP", "false"),
+                            ("TRANSLATION_FILTER", "false")):
+            with mock.patch.dict(os.environ, {name: value}):
+                self.assertNotEqual(server.result_cache_key(resume, {}, "de"), key, name)
+
+        glossary = self.output_dir / "glossary.txt"
+        glossary.write_text("AcmeDB\n")
+        with mock.patch.dict(os.environ, {"TRANSLATION_GLOSSARY": str(glossary)}):
+            with_glossary = server.result_cache_key(resume, {}, "de")
+            glossary.write_text("AcmeDB\nWidgetFlow\n")
+            self.assertNotEqual(server.result_cache_key(resume, {}, "de"), with_glossary)
+        self.assertNotEqual(with_glossary, key)
+
+    def test_jobs_of_a_crashed_server_resume_after_restart(self):
+        # The previous server process died while running the job: nobody renews its lease
+        with server._worker_pool_lock:
+            server._worker_pool.stop()
+            server._worker_pool = None
+        queue = JobQueue(os.environ['JOB_QUEUE_PATH'], lease_seconds=0.3)
+        job_id = queue.submit({"resume_path": str(RESUME), "job_data": {}, "language": "en"})
+        self.assertEqual(queue.claim("crashed-host:1")[0], job_id)
+        queue.close()
+
+        # The restarted server starts its workers; they pick the job up once the lease expired
+        self.assertIs(server.start_job_workers(), server.get_worker_pool())
+        job = self.wait_for_job(job_id)
+        self.assertEqual(job["attempts"], 2)
+        self.assertEqual(job["owner"], server._worker_pool.owner)
+        self.assertEqual(self.client.get(f"/jobs/{job_id}/result").status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from stage_timing import (StageHistograms, stage, timed, track_timings, begin_timings, end_timings,
+                          current_timings, get_stage_metrics)
+from event_loop_service import EventLoopService
+from translation_memory import TranslationMemory
+from resume_pipeline import ResumePipeline
+from test_resume_generator import FakeBrowserPool
+
+EXAMPLE_DIR = Path(__file__).parent.parent / "example"
+
+
+class TestStageTiming(unittest.TestCase):
+
+    def test_spans_add_up_per_request(self):
+        @timed("render")
+        async def render():
+            await asyncio.sleep(0.01)
+
+        async def request():
+            with track_timings() as timings:
+                with stage("parse"):
+                    pass
+                await asyncio.gather(render(), render())
+                return timings
+
+        before = get_stage_metrics().count("render")
+        timings = asyncio.run(request()).as_dict()
+        self.assertEqual(set(timings), {"parse_s", "render_s", "total_s"})
+        self.assertGreaterEqual(timings["render_s"], 0.02)
+        self.assertEqual(get_stage_metrics().count("render"), before + 2)
+        self.assertIsNone(current_timings())
+
+    def test_timings_follow_work_onto_the_event_loop_service(self):
+        service = EventLoopService(name="TimingLoop")
+
+        async def translate():
+            with stage("translation"):
+                await asyncio.sleep(0)
+
+        token = begin_timings()
+        try:
+            service.run(translate())
+            self.assertIn("translation_s", current_timings().as_dict())
+        finally:
+            end_timings(token)
+            service.shutdown()
+
+    def test_pipeline_reports_stage_breakdown(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pipeline = ResumePipeline(tmp, EXAMPLE_DIR, model=object(), browser_pool=FakeBrowserPool(),
+                                      translation_memory=TranslationMemory(":memory:"))
+            result = asyncio.run(pipeline.run_async(EXAMPLE_DIR / "resume.yaml", language="en"))
+        self.assertTrue({"parse_s", "html_render_s", "pdf_render_s", "pipeline_s", "total_s"} <= set(result.timings))
+
+    def test_prometheus_histogram_format(self):
+        histograms = StageHistograms(buckets=(0.1, 1.0))
+        histograms.observe("compare", 0.05)
+        histograms.observe("compare", 0.5)
+        histograms.observe("compare", 3.0)
+        lines = histograms.render().splitlines()
+
+        self.assertIn("# TYPE resume_stage_duration_seconds histogram", lines)
+        self.assertIn('resume_stage_duration_seconds_bucket{stage="compare",le="0.1"} 1', lines)
+        self.assertIn('resume_stage_duration_seconds_bucket{stage="compare",le="1.0"} 2', lines)
+        self.assertIn('resume_stage_duration_seconds_bucket{stage="compare",le="+Inf"} 3', lines)
+        self.assertIn('resume_stage_duration_seconds_sum{stage="compare"} 3.55', lines)
+        self.assertIn('resume_stage_duration_seconds_count{stage="compare"} 3', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from streaming_json import IncrementalJSONParser, SchemaMismatchError, parse_stream
+from resume_analyzer import ATSResult
+
+
+def chunked(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIncrementalJSONParser(unittest.TestCase):
+
+    def test_fields_reported_before_stream_ends(self):
+        text = '```json\n{"ats_score": 72, "missing_skills": [{"name": "Docker"}], ' \
+               '"suggested_improvements": "Mention \\"Docker\\""}\n```'
+        seen = []
+        result = parse_stream(iter(chunked(text)), ATSResult, on_field=lambda k, v: seen.append(k))
+        self.assertEqual(result.ats_score, 72)
+        self.assertEqual(result.missing_skills, [{"name": "Docker"}])
+        self.assertEqual(result.suggested_improvements, 'Mention "Docker"')
+        self.assertEqual(seen, ["ats_score", "missing_skills", "suggested_improvements"])
+
+    def test_rejects_wrong_shape_without_consuming_rest(self):
+        consumed = []
+
+        def chunks():
+            for chunk in ['{"ats_score": 80, "missing_skills": ["Python"', ', "Go"]', ', "suggested_improvements": ""}']:
+                consumed.append(chunk)
+                yield chunk
+
+        with self.assertRaises(SchemaMismatchError):
+            parse_stream(chunks(), ATSResult)
+        self.assertEqual(len(consumed), 1)
+
+    def test_rejects_non_object_and_incomplete_output(self):
+        with self.assertRaises(SchemaMismatchError):
+            IncrementalJSONParser(ATSResult).feed("Sure! Here is")
+        parser = IncrementalJSONParser(ATSResult)
+        parser.feed('{"ats_score": 50, "missing_skills": []')
+        with self.assertRaises(SchemaMismatchError):
+            parser.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import unittest
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from translation_engine import TranslationEngine
+
+
+class FakeTranslator:
+    """Upper-cases text line by line and records every request."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def translate(self, text, target_lang):
+        self.requests.append(text)
+        return "\n".join(line.upper() for line in text.split("\n"))
+
+
+class TestTranslationEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.translator = FakeTranslator()
+        self.engine = TranslationEngine(self.translator.translate, batch_size=10)
+        self.resume_data = {
+            "summary": "Engineer",
+            "experiences": [
+                {"location": "Berlin", "employment_period": "2019-Present",
+                 "key_responsibilities": [{"description": "Led a team"}, {"description": "Shipped code"}],
+                 "skills_acquired": ["Python", "Docker"]},
+                {"location": "Berlin", "key_responsibilities": []},
+            ],
+            "interests": ["Hiking", "Python"],
+            "education": [{"graduation_year": 2018}],
+        }
+
+    def test_collect_finds_nested_fields(self):
+        slots = self.engine.collect(self.resume_data)
+        texts = sorted(slot.text for slot in slots)
+        self.assertEqual(texts, sorted(["Engineer", "Berlin", "Berlin", "2019-Present", "Led a team",
+                                        "Shipped code", "Python", "Docker", "Hiking", "Python"]))
+
+    def test_translate_resume_dedupes_and_batches(self):
+        labels = {"summary": "Summary", "skills": "Technical Skills", "lang": "de"}
+        labels = asyncio.run(self.engine.translate_resume(self.resume_data, labels, "de"))
+
+        self.assertEqual(labels, {"summary": "SUMMARY", "skills": "TECHNICAL SKILLS", "lang": "de"})
+        self.assertEqual(self.resume_data["experiences"][1]["location"], "BERLIN")
+        self.assertEqual(self.resume_data["interests"], ["HIKING", "PYTHON"])
+        self.assertEqual(self.resume_data["education"][0]["graduation_year"], 2018)
+        # 12 fields, 10 unique strings, batch_size=10 -> a single round trip
+        self.assertEqual(len(self.translator.requests), 1)
+        self.assertEqual(self.engine.stats["unique"], 10)
+
+    def test_translate_resume_many_shares_one_string_set(self):
+        labels = {"summary": "Summary", "lang": "en"}
+        translated = asyncio.run(self.engine.translate_resume_many(self.resume_data, labels, ["de", "fr"]))
+
+        self.assertEqual(set(translated), {"de", "fr"})
+        data, de_labels = translated["de"]
+        self.assertEqual(de_labels, {"summary": "SUMMARY", "lang": "de"})
+        self.assertEqual(translated["fr"][1]["lang"], "fr")
+        self.assertEqual(data["interests"], ["HIKING", "PYTHON"])
+        # The source stays untouched and each language has its own copy
+        self.assertEqual(self.resume_data["interests"], ["Hiking", "Python"])
+        self.assertIsNot(data, translated["fr"][0])
+        # 9 unique strings per language, one batch request each
+        self.assertEqual(len(self.translator.requests), 2)
+        self.assertEqual(self.engine.stats["unique"], 18)
+
+    def test_falls_back_to_single_requests_on_line_mismatch(self):
+        async def merging_translate(text, target_lang):
+            return text.replace("\n", " ")
+
+        engine = TranslationEngine(merging_translate)
+        translations = asyncio.run(engine.translate_strings(["a", "b", "c"], "de"))
+        self.assertEqual(translations, {"a": "a", "b": "b", "c": "c"})
+        self.assertEqual(engine.stats["requests"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
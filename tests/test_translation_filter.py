@@ -0,0 +1,99 @@
+import sys
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from translation_filter import TranslationFilter, detect_language, load_glossary
+from translation_engine import TranslationEngine
+from translation_memory import TranslationMemory
+from resume_parser import ResumeParser
+from resume_generator import LABEL_KEYS
+
+RESUME = Path(__file__).parent.parent / "example" / "resume.yaml"
+
+
+class CountingTranslator:
+    def __init__(self):
+        self.strings = []
+
+    async def translate(self, text, target_lang):
+        self.strings.extend(text.split("\n"))
+        return text.upper()
+
+
+class TestTranslationFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.filter = TranslationFilter()
+
+    def test_patterns_and_glossary(self):
+        self.assertEqual(self.filter.resolve("2018", "de"), ("pattern", "2018"))
+        self.assertEqual(self.filter.resolve("05/2020 - 40%", "fr"), ("pattern", "05/2020 - 40%"))
+        self.assertEqual(self.filter.resolve("2019-Present", "de"), ("pattern", "2019-heute"))
+        self.assertEqual(self.filter.resolve("2019 – present", "fr"), ("pattern", "2019 – présent"))
+        self.assertIsNone(self.filter.resolve("2019-Present", "ja"))
+        self.assertEqual(self.filter.resolve("Kubernetes", "de"), ("glossary", "Kubernetes"))
+        self.assertEqual(self.filter.resolve("Python, Docker / AWS", "de")[0], "glossary")
+        self.assertIsNone(self.filter.resolve("Python developer", "de"))
+        self.assertIsNone(self.filter.resolve("Computer Science", "de"))
+
+    def test_ambiguous_terms_need_a_technical_context(self):
+        # A one-word field such as an interest is an ordinary word and gets translated
+        for word in ("Go", "Swift", "Spring", "Rest", "R"):
+            self.assertIsNone(self.filter.resolve(word, "de"), word)
+        self.assertIsNone(self.filter.resolve("Go, Rest", "de"))
+        self.assertEqual(self.filter.resolve("Python, Go", "de"), ("glossary", "Python, Go"))
+        self.assertEqual(self.filter.resolve("Go", "de", technical=True), ("glossary", "Go"))
+
+    def test_one_word_fields_outside_skills_are_translated(self):
+        translator = CountingTranslator()
+        engine = TranslationEngine(translator.translate, memory=TranslationMemory(":memory:"),
+                                   text_filter=self.filter)
+        resume = {"interests": ["Go", "Swift"], "experiences": [{"skills_acquired": ["Spring", "Swift"]}]}
+        asyncio.run(engine.translate_resume(resume, {}, "de"))
+
+        self.assertEqual(resume["interests"], ["GO", "SWIFT"])
+        # "Swift" also is an interest, so the skill list shares its translation
+        self.assertEqual(resume["experiences"][0]["skills_acquired"], ["Spring", "SWIFT"])
+        self.assertNotIn("Spring", translator.strings)
+
+    def test_language_check(self):
+        german = "Aufbau und Betrieb der Datenplattform für die Teams im Unternehmen"
+        self.assertEqual(detect_language(german), "de")
+        self.assertEqual(self.filter.resolve(german, "de"), ("language", german))
+        self.assertIsNone(self.filter.resolve(german, "fr"))
+        self.assertEqual(detect_language("Led a team of 5 developers in building the platform"), "en")
+        self.assertIsNone(detect_language("Senior Data Engineer"))
+
+    def test_custom_glossary_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "glossary.txt"
+            path.write_text("# product names\nAcmeDB\n\nWidgetFlow  # internal tool\n", encoding="utf-8")
+            terms = load_glossary(path)
+        self.assertEqual(terms, {"acmedb", "widgetflow"})
+        self.assertEqual(TranslationFilter(terms).resolve("WidgetFlow", "de"), ("glossary", "WidgetFlow"))
+
+    def test_fewer_strings_reach_the_translator(self):
+        def translate_example(text_filter):
+            translator = CountingTranslator()
+            engine = TranslationEngine(translator.translate, memory=TranslationMemory(":memory:"),
+                                       text_filter=text_filter)
+            asyncio.run(engine.translate_resume(ResumeParser(RESUME).data, dict(LABEL_KEYS), "de"))
+            return translator.strings, engine.stats
+
+        unfiltered, _ = translate_example(None)
+        filtered, stats = translate_example(self.filter)
+
+        self.assertLess(len(filtered), len(unfiltered) * 0.8)
+        self.assertEqual(stats["skipped"], len(unfiltered) - len(filtered))
+        self.assertGreater(stats["skipped_glossary"], 0)
+        self.assertGreater(stats["skipped_pattern"], 0)
+        self.assertNotIn("Python", filtered)
+        self.assertNotIn("2019-Present", filtered)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import unittest
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from translation_memory import TranslationMemory
+from translation_engine import TranslationEngine
+
+
+class TestTranslationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.memory = TranslationMemory(":memory:", max_entries=3)
+
+    def test_hits_and_misses(self):
+        self.memory.put("Summary", "Zusammenfassung", "de")
+        self.assertEqual(self.memory.get("Summary", "de"), "Zusammenfassung")
+        self.assertIsNone(self.memory.get("Summary", "fr"))
+        self.assertEqual(self.memory.stats, {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_evicts_least_recently_used(self):
+        self.memory.put_many({"a": "A", "b": "B", "c": "C"}, "de")
+        self.memory.get("a", "de")  # touch "a" so "b" becomes the oldest entry
+        self.memory.put("d", "D", "de")
+        self.assertEqual(len(self.memory), 3)
+        self.assertIsNone(self.memory.get("b", "de"))
+        self.assertEqual(self.memory.get("a", "de"), "A")
+
+    def test_second_render_needs_no_translator_calls(self):
+        calls = []
+
+        async def translate(text, target_lang):
+            calls.append(text)
+            return text.upper()
+
+        engine = TranslationEngine(translate, memory=TranslationMemory(":memory:"))
+        texts = ["Summary", "Experience", "Python"]
+        first = asyncio.run(engine.translate_strings(texts, "de"))
+        calls.clear()
+        second = asyncio.run(engine.translate_strings(texts, "de"))
+        self.assertEqual(first, second)
+        self.assertEqual(calls, [])
+
+    def test_failed_translations_are_not_stored(self):
+        async def failing_translate(text, target_lang):
+            raise ConnectionError("translator unavailable")
+
+        engine = TranslationEngine(failing_translate, memory=self.memory)
+        translations = asyncio.run(engine.translate_strings(["Summary"], "de"))
+        self.assertEqual(translations, {"Summary": "Summary"})
+        self.assertEqual(len(self.memory), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from translator_client import TranslatorClient
+from event_loop_service import EventLoopService
+from resume_generator import ResumeGenerator
+from translation_memory import TranslationMemory
+
+EXAMPLE_DIR = Path(__file__).parent.parent / "example"
+
+
+class FakeHTTPClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeTranslator:
+    """Stands in for googletrans.Translator and records the thread each request ran on."""
+
+    created = []
+
+    def __init__(self):
+        self.client = FakeHTTPClient()
+        self.threads = []
+        FakeTranslator.created.append(self)
+
+    async def translate(self, text, target_lang):
+        self.threads.append(threading.current_thread().name)
+        return SimpleNamespace(text=f"{text} ({target_lang})")
+
+
+class TestTranslatorClient(unittest.TestCase):
+
+    def setUp(self):
+        FakeTranslator.created = []
+        self.service = EventLoopService(name="TranslatorTestLoop")
+        self.addCleanup(self.service.shutdown)
+        self.client = TranslatorClient(loop_service=self.service, translator_factory=FakeTranslator)
+
+    def test_generators_share_one_translator_on_the_service_loop(self):
+        memory = TranslationMemory(":memory:")
+        generators = [ResumeGenerator(EXAMPLE_DIR / "resume.yaml", EXAMPLE_DIR, EXAMPLE_DIR, "de",
+                                      translation_memory=memory, translator=self.client) for _ in range(2)]
+
+        # Each request comes from its own short-lived loop, like separate pipeline runs
+        for generator in generators:
+            self.assertEqual(asyncio.run(generator._request_translation("Skills", "de")), "Skills (de)")
+
+        self.assertEqual(len(FakeTranslator.created), 1)
+        self.assertEqual(FakeTranslator.created[0].threads, ["TranslatorTestLoop-loop"] * 2)
+        self.assertEqual(self.client.stats["requests"], 2)
+
+    def test_shutdown_closes_the_http_client(self):
+        self.service.run(self.client.translate("Skills", "fr"))
+        translator = FakeTranslator.created[0]
+        self.client.shutdown()
+
+        self.assertTrue(translator.client.closed)
+        with self.assertRaises(RuntimeError):
+            self.service.run(self.client.translate("Skills", "fr"))
+
+
+if __name__ == '__main__':
+    unittest.main()